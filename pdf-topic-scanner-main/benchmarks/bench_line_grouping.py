@@ -0,0 +1,98 @@
+"""Benchmark line grouping + fragment merging: per-word loop vs NumPy.
+
+Usage:
+    python benchmarks/bench_line_grouping.py [--pdf <input.pdf>] [--lines 80] [--glyphs 400] [--repeat 5]
+
+Builds a character-fragmented page (one "word" per glyph, the way pdfplumber
+reports our sample PDF) and times three paths over it:
+
+- loop:           _words_to_blocks_loop on word dicts (the original implementation)
+- numpy (dicts):  _words_to_blocks on word dicts, including the column conversion
+                  (what the pdfplumber backend pays)
+- numpy (columns): _words_to_blocks on WordColumns (what the pdfium backend pays)
+
+Every path must produce identical blocks. With --pdf, the pages of a real
+document (extracted once with the pdfplumber backend) are benchmarked too.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Fix import paths to work from any directory
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.backends import pdfplumber_words, words_to_columns
+from src.core.pdf_parser import _words_to_blocks, _words_to_blocks_loop
+
+
+def fragmented_page(lines: int, glyphs: int, seed: int = 0):
+    """Word dicts for a page of `lines` lines with `glyphs` single-glyph words each."""
+    rng = random.Random(seed)
+    words = []
+    for line in range(lines):
+        top = 40 + line * 9.3
+        x = 30.0
+        for _ in range(glyphs):
+            width = rng.choice([1.2, 1.5, 2.0, 4.5])
+            words.append({
+                "text": rng.choice("abcdefgh.,"),
+                "fontname": "ABCDEF+ArialMT",
+                "size": 8.0,
+                "x0": x,
+                "x1": x + width,
+                "top": top + rng.choice([0.0, 0.0, 0.3]),  # baseline jitter within a line
+                "bottom": top + 8.0,
+            })
+            x += width + rng.choice([0.0, 0.0, 0.1, 3.0])
+    return words
+
+
+def _best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(label, pages, repeat):
+    """Times all three paths over `pages` (list of (page_num, word dicts))."""
+    columns = [(num, words_to_columns(words)) for num, words in pages]
+    for (num, words), (_, cols) in zip(pages, columns):
+        expected = _words_to_blocks_loop(words, num)
+        assert _words_to_blocks(words, num) == expected, f"dict path differs on page {num}"
+        assert _words_to_blocks(cols, num) == expected, f"column path differs on page {num}"
+
+    loop = _best_time(lambda: [_words_to_blocks_loop(w, n) for n, w in pages], repeat)
+    dicts = _best_time(lambda: [_words_to_blocks(w, n) for n, w in pages], repeat)
+    cols = _best_time(lambda: [_words_to_blocks(c, n) for n, c in columns], repeat)
+
+    n_words = sum(len(w) for _, w in pages)
+    print(f"{label}: {len(pages)} page(s), {n_words} words (identical output on all paths)")
+    print(f"  loop:            {loop * 1000:8.2f} ms")
+    print(f"  numpy (dicts):   {dicts * 1000:8.2f} ms  ({loop / dicts:.1f}x)")
+    print(f"  numpy (columns): {cols * 1000:8.2f} ms  ({loop / cols:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DocTree.AI line grouping")
+    parser.add_argument("--pdf", help="Also benchmark the pages of this PDF")
+    parser.add_argument("--lines", type=int, default=80, help="Lines on the synthetic page")
+    parser.add_argument("--glyphs", type=int, default=400, help="Glyphs per synthetic line")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; best time is reported")
+    args = parser.parse_args()
+
+    bench("synthetic fragmented page", [(1, fragmented_page(args.lines, args.glyphs))], args.repeat)
+    if args.pdf:
+        bench(args.pdf, list(pdfplumber_words(args.pdf)), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare extraction backends for parity and throughput.
+
+Usage:
+    python benchmarks/compare_backends.py <input.pdf> [--candidate pdfium] [--repeat 3]
+
+Parses the PDF with the reference backend (pdfplumber) and a candidate backend,
+then reports pages/sec, speedup, and how closely the candidate's blocks match
+the reference: identical line texts, font size drift and bbox drift on the
+lines whose text matches.
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+
+# Fix import paths to work from any directory
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.backends import BACKENDS, DEFAULT_BACKEND
+from src.core.pdf_parser import count_pages, parse_pdf
+
+
+def _timed_parse(pdf_path, backend, repeat):
+    """Returns (blocks, best wall time in seconds) over `repeat` runs."""
+    best = None
+    blocks = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        blocks = parse_pdf(pdf_path, backend=backend)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return blocks, best
+
+
+def _parity(reference, candidate):
+    """Summarizes how closely candidate blocks match the reference blocks."""
+    ref_keys = [(b["page"], b["text"]) for b in reference]
+    cand_keys = [(b["page"], b["text"]) for b in candidate]
+    matcher = difflib.SequenceMatcher(a=ref_keys, b=cand_keys, autojunk=False)
+
+    matched = 0
+    size_drift = 0.0
+    bbox_drift = 0.0
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            ref = reference[block.a + k]
+            cand = candidate[block.b + k]
+            matched += 1
+            size_drift = max(size_drift, abs(ref["font_size"] - cand["font_size"]))
+            bbox_drift = max(
+                bbox_drift,
+                max(abs(ref["bbox"][c] - cand["bbox"][c]) for c in ("x0", "y0", "x1", "y1")),
+            )
+
+    return {
+        "reference_blocks": len(reference),
+        "candidate_blocks": len(candidate),
+        "matching_lines": matched,
+        "line_parity": matched / max(len(reference), 1),
+        "max_font_size_drift": size_drift,
+        "max_bbox_drift": bbox_drift,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare DocTree.AI extraction backends")
+    parser.add_argument("pdf_path", help="Input PDF file path")
+    parser.add_argument("--candidate", default="pdfium", choices=sorted(BACKENDS), help="Backend to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; best time is reported")
+    args = parser.parse_args()
+
+    pages = count_pages(args.pdf_path)
+    reference, ref_time = _timed_parse(args.pdf_path, DEFAULT_BACKEND, args.repeat)
+    candidate, cand_time = _timed_parse(args.pdf_path, args.candidate, args.repeat)
+    parity = _parity(reference, candidate)
+
+    print(f"File:   {args.pdf_path} ({pages} pages)")
+    print(f"{DEFAULT_BACKEND:>12}: {ref_time:.3f}s  ({pages / ref_time:.1f} pages/sec)")
+    print(f"{args.candidate:>12}: {cand_time:.3f}s  ({pages / cand_time:.1f} pages/sec)")
+    print(f"Speedup: {ref_time / cand_time:.1f}x")
+    print(
+        f"Line parity: {parity['matching_lines']}/{parity['reference_blocks']} "
+        f"({parity['line_parity']:.1%}), candidate produced {parity['candidate_blocks']} blocks"
+    )
+    print(f"Max font size drift on matching lines: {parity['max_font_size_drift']:.3f} pt")
+    print(f"Max bbox drift on matching lines: {parity['max_bbox_drift']:.3f} pt")
+
+
+if __name__ == "__main__":
+    main()
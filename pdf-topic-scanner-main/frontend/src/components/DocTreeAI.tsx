@@ -29,16 +29,23 @@ interface Section {
 // ========== Backend integration ==========
 const API_BASE_URL = "http://localhost:8000"; // FastAPI
 
-async function uploadPdfAndGetHierarchy(file: File) {
+interface StreamHandlers {
+  onProgress: (pagesDone: number, pagesTotal: number) => void;
+  onSection: (section: any) => void;
+}
+
+// Uploads to /extract/stream and reads its Server-Sent Events as they arrive:
+// per-page progress, then each top-level section as soon as it is complete.
+async function uploadPdfAndStreamHierarchy(file: File, handlers: StreamHandlers) {
   const formData = new FormData();
   formData.append("file", file);
 
-  const res = await fetch(`${API_BASE_URL}/extract`, {
+  const res = await fetch(`${API_BASE_URL}/extract/stream`, {
     method: "POST",
     body: formData,
   });
 
-  if (!res.ok) {
+  if (!res.ok || !res.body) {
     let text = await res.text().catch(() => "");
     try {
       const json = JSON.parse(text);
@@ -48,13 +55,42 @@ async function uploadPdfAndGetHierarchy(file: File) {
     }
   }
 
-  const data = await res.json();
-
-  if (!data.ok || !data.hierarchy) {
-    throw new Error("Invalid response from backend");
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  const sections: any[] = [];
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      for (const line of message.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      const payload = data ? JSON.parse(data) : {};
+
+      if (event === "progress") {
+        handlers.onProgress(payload.pages_done, payload.pages_total);
+      } else if (event === "section") {
+        sections.push(payload.section);
+        handlers.onSection(payload.section);
+      } else if (event === "error") {
+        throw new Error(payload.detail || "Failed to process document");
+      } else if (event === "done") {
+        return { metadata: payload.metadata, sections };
+      }
+    }
   }
 
-  return data.hierarchy;
+  throw new Error("Connection closed before processing finished");
 }
 
 function mapBackendToSectionTree(hierarchy: any): Section {
@@ -129,9 +165,15 @@ export default function DocTreeAI() {
     setJsonOutput(null);
 
     try {
-      setProgress(10);
-      const backendHierarchy = await uploadPdfAndGetHierarchy(uploadedFile);
-      setProgress(70);
+      const partialSections: any[] = [];
+      const backendHierarchy = await uploadPdfAndStreamHierarchy(uploadedFile, {
+        // Parsing dominates the run time, so page progress drives the bar up to 95%
+        onProgress: (pagesDone, pagesTotal) => setProgress(Math.round((95 * pagesDone) / Math.max(pagesTotal, 1))),
+        onSection: (section) => {
+          partialSections.push(section);
+          setHierarchyData(mapBackendToSectionTree({ metadata: { source_file: uploadedFile.name }, sections: partialSections }));
+        },
+      });
       const sectionTree = mapBackendToSectionTree(backendHierarchy);
       setHierarchyData(sectionTree);
       setJsonOutput(JSON.stringify(backendHierarchy, null, 2));
@@ -1,13 +1,25 @@
 """CLI entry point for DocTree.AI PDF Hierarchy Extractor
 
 Usage:
-    python main.py <input.pdf> [--out <output.json>] [--stats]
+    python main.py <input.pdf> [--out <output.json>] [--stats] [--workers N] [--pages 1-20,45]
+                   [--backend pdfplumber|pdfium] [--outline | --toc-only] [--cache-dir DIR]
+                   [--profile] [--profile-json <report.json>] [--pstats <out.pstats>] [--compact] [--blocks]
+    python main.py <dir | glob | file>... [--out-dir DIR] [--manifest FILE] [--workers N]
+                   [--pages 1-20,45] [--backend pdfplumber|pdfium] [--cache-dir DIR] [--compact] [--blocks]
 
 Example:
     python main.py document.pdf --out output.json --stats
+    python main.py big_manual.pdf --workers 8
+    python main.py report.pdf --pages 1-20,45
+    python main.py report.pdf --backend pdfium
+    python main.py manual.pdf --toc-only
+    python main.py report.pdf --profile --profile-json timings.json --pstats report.pstats
+    python main.py report.pdf --blocks   # also writes outputs/json/report.blocks/ for analytics
+    python main.py archive/ "incoming/**/*.pdf" --workers 16   # batch; rerun to resume
 """
 
 import argparse
+import cProfile
 import os
 import json
 import time
@@ -19,10 +31,13 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from src.core.pdf_parser import parse_pdf
-from src.features.feature_engineer import enrich_blocks_with_features
-from src.hierarchy.heading_classifier import classify_headings
-from src.hierarchy.tree_builder import build_hierarchy
+# Only light modules at import time: the pipeline (numpy, and pdfplumber/pdfminer
+# once a PDF is actually parsed) is imported where it is used, so --help,
+# argument errors and fully cached runs start fast (guarded by tests/test_import_time.py)
+from src.config import PARSE_CACHE_DIR
+from src.core.backends import BACKENDS, DEFAULT_BACKEND
+from utils.profiling import StageProfiler, format_report
+from utils.validators import parse_page_spec
 
 DEFAULT_OUTPUT_DIR = "outputs/json"
 
@@ -34,14 +49,151 @@ def section_stats(sections):
     return len(sections), count_sections(sections)
 
 
+def is_batch(inputs) -> bool:
+    """True for several inputs, a directory or a glob pattern; a single path keeps the one-PDF mode."""
+    if len(inputs) != 1:
+        return True
+    return os.path.isdir(inputs[0]) or any(c in inputs[0] for c in "*?[")
+
+
+def main_batch(args, pages):
+    """Extracts every PDF matched by args.inputs across a process pool (see src/batch_runner.py)."""
+    from src.batch_runner import STATUS_OK, expand_inputs, run_batch
+
+    if args.out or args.outline or args.toc_only:
+        print("[ERROR] --out, --outline and --toc-only need a single input PDF; use --out-dir for batches")
+        return
+    try:
+        pdf_paths = expand_inputs(args.inputs)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}")
+        return
+    if not pdf_paths:
+        print("[ERROR] No PDF files found")
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"[INFO] {len(pdf_paths)} PDF(s), {workers} worker(s), outputs under {args.out_dir}")
+
+    def report(record):
+        if record["status"] == STATUS_OK:
+            print(f"[OK] {record['path']} ({record['pages']} pages, {record['seconds']:.2f}s)")
+        else:
+            print(f"[FAILED] {record['path']}: {record['error']}")
+
+    t0 = time.time()
+    try:
+        counts = run_batch(
+            pdf_paths,
+            args.out_dir,
+            manifest_path=args.manifest,
+            workers=workers,
+            pages=pages,
+            page_selection=args.pages if pages is not None else None,
+            backend=args.backend,
+            cache_dir=args.cache_dir,
+            pretty=not args.compact,
+            blocks=args.blocks,
+            on_record=report,
+        )
+    except KeyboardInterrupt:
+        print("\n[INFO] Interrupted; run the same command again to resume")
+        sys.exit(130)
+
+    print("\n[DONE] DocTree.AI Batch Extraction Complete")
+    print(f"Documents: {counts['total']} ({counts['skipped']} already done)")
+    print(f"Extracted: {counts['ok']}, failed: {counts['failed']}")
+    print(f"Time taken: {time.time() - t0:.2f} seconds\n")
+    if counts["failed"]:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description="DocTree.AI PDF Hierarchy Extractor")
-    parser.add_argument("pdf_path", help="Input PDF file path")
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Input PDF file, or several files, directories and glob patterns for batch mode",
+    )
     parser.add_argument("--out", help="Output JSON path")
     parser.add_argument("--stats", action="store_true", help="Show hierarchy stats")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes: page-parallel parsing for one PDF (default: 1 = serial), "
+             "documents in parallel in batch mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=DEFAULT_OUTPUT_DIR,
+        help=f"Batch mode: output folder, mirroring the input tree (default: {DEFAULT_OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="Batch mode: JSONL record per document, used to resume (default: <out-dir>/manifest.jsonl)",
+    )
+    parser.add_argument("--pages", help="Pages to process, e.g. 1-20,45 (default: all)")
+    parser.add_argument(
+        "--backend",
+        default=DEFAULT_BACKEND,
+        choices=sorted(BACKENDS),
+        help=f"Text extraction backend (default: {DEFAULT_BACKEND})",
+    )
+    parser.add_argument(
+        "--outline",
+        action="store_true",
+        help="Use the PDF's bookmark outline as headings when present (skips heading detection)",
+    )
+    parser.add_argument(
+        "--toc-only",
+        action="store_true",
+        help="Like --outline, but output only the section skeleton without body text",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=PARSE_CACHE_DIR,
+        help="Reuse parse results for identical PDFs from this directory "
+             "(default: $DOCTREE_PARSE_CACHE_DIR, unset = no cache)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report wall time, CPU time, peak memory and pages/s for every stage "
+             "(memory tracing slows the run down)",
+    )
+    parser.add_argument("--profile-json", help="Write the --profile report as JSON to this path (implies --profile)")
+    parser.add_argument("--pstats", help="Write a cProfile dump of the run to this path (implies --profile)")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write compact JSON instead of indenting by two spaces (smaller and faster for huge documents)",
+    )
+    parser.add_argument(
+        "--blocks",
+        action="store_true",
+        help="Also export every block with its features, heading score and bbox as memory-mappable "
+             "NumPy columns next to the JSON (<name>.blocks/, see src/core/block_export.py)",
+    )
     args = parser.parse_args()
+    args.profile = args.profile or bool(args.profile_json or args.pstats)
+
+    pages = None
+    if args.pages:
+        try:
+            pages = parse_page_spec(args.pages)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return
 
-    pdf_path = args.pdf_path
+    if is_batch(args.inputs):
+        if args.profile:
+            print("[ERROR] --profile needs a single input PDF; batch runs record per-stage timings in the manifest")
+            return
+        main_batch(args, pages)
+        return
+
+    pdf_path = args.inputs[0]
     out_path = args.out
 
     # Input validation
@@ -68,43 +220,105 @@ def main():
     except OSError:
         size_kb = None
 
+    from src.core.block_export import EXPORT_SUFFIX, export_blocks
+    from src.core.block_table import BlockTable
+    from src.core.cache import cached_count_pages, cached_parse_pdf_table, file_sha256, get_parse_cache
+    from src.features.feature_engineer import enrich_blocks_with_features
+    from src.hierarchy.heading_classifier import classify_headings
+    from src.hierarchy.tree_builder import build_hierarchy
+    from src.serialization import write_json
+
+    profiler = StageProfiler(enabled=args.profile)
+    cprofile = cProfile.Profile() if args.pstats else None
     t0 = time.time()
     try:
-        blocks = parse_pdf(pdf_path)
-        
-        if not blocks:
-            print(f"[ERROR] No text blocks extracted from PDF. PDF may be empty or image-only.")
-            return
-            
-        enriched = enrich_blocks_with_features(blocks)
-        classified = classify_headings(enriched)
+        profiler.start()
+        if cprofile is not None:
+            cprofile.enable()
+        cache = get_parse_cache(args.cache_dir)
+        content_hash = None
+        classified = None
+        if args.outline or args.toc_only:
+            from src.core.outline import is_plausible_outline, outline_blocks, read_outline
+
+            with profiler.stage("read_outline"):
+                entries = read_outline(pdf_path)
+                if is_plausible_outline(entries):
+                    classified = outline_blocks(
+                        pdf_path, entries, toc_only=args.toc_only, pages=pages, backend=args.backend
+                    )
+            if classified is None:
+                print("[INFO] No usable PDF outline found; falling back to heading detection")
+
+        if classified is None:
+            with profiler.stage("parse_pdf"):
+                if cache is not None:
+                    content_hash = file_sha256(pdf_path)  # once, for the block and page count lookups
+                blocks = cached_parse_pdf_table(
+                    pdf_path,
+                    cache,
+                    workers=args.workers or 1,
+                    pages=pages,
+                    backend=args.backend,
+                    content_hash=content_hash,
+                )
 
-        page_numbers = [b.get("page", 1) for b in classified]
-        total_pages = max(page_numbers) if page_numbers else 0
+            if not blocks:
+                print(f"[ERROR] No text blocks extracted from PDF. PDF may be empty or image-only.")
+                return
+
+            with profiler.stage("enrich_blocks_with_features"):
+                enriched = enrich_blocks_with_features(blocks)
+            with profiler.stage("classify_headings"):
+                classified = classify_headings(enriched)
+            hierarchy_source = "heuristic"
+        else:
+            hierarchy_source = "outline"
+
+        with profiler.stage("count_pages"):
+            total_pages = cached_count_pages(pdf_path, cache, content_hash)
         metadata = {
             "source_file": pdf_path,
             "total_blocks": len(classified),
             "total_pages": total_pages,
         }
+        if pages is not None:
+            metadata["page_selection"] = args.pages
+        if args.outline or args.toc_only:
+            metadata["hierarchy_source"] = hierarchy_source
 
-        tree = build_hierarchy(classified, metadata)
+        with profiler.stage("build_hierarchy"):
+            tree = build_hierarchy(classified, metadata)
 
         # Ensure output directory exists
         out_dir = os.path.dirname(out_path)
         if out_dir:
             os.makedirs(out_dir, exist_ok=True)
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(tree, f, ensure_ascii=False, indent=2)
+        with profiler.stage("write_json"):
+            write_json(tree, out_path, stream=("sections",), pretty=not args.compact)
+        blocks_out = None
+        if args.blocks:
+            blocks_out = os.path.splitext(out_path)[0] + EXPORT_SUFFIX
+            with profiler.stage("export_blocks"):
+                export_blocks(classified, blocks_out, source_file=pdf_path)
     except Exception as e:
         print(f"[ERROR] Pipeline failed: {e}")
         import traceback
         traceback.print_exc()
         return
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+        profiler.stop()
 
-    num_h1 = sum(1 for b in classified if b.get("classification") == "H1")
-    num_h2 = sum(1 for b in classified if b.get("classification") == "H2")
-    num_h3 = sum(1 for b in classified if b.get("classification") == "H3")
+    if isinstance(classified, BlockTable):
+        labels = classified.classifications()
+    else:
+        labels = [b.get("classification") for b in classified]
+    num_h1 = labels.count("H1")
+    num_h2 = labels.count("H2")
+    num_h3 = labels.count("H3")
     elapsed = time.time() - t0
 
     print("\n[DONE] DocTree.AI Extraction Complete")
@@ -115,6 +329,8 @@ def main():
     print(f"Pages: {total_pages}")
     print(f"Detected: {num_h1} H1, {num_h2} H2, {num_h3} H3 headings")
     print(f"JSON saved to: {out_path}")
+    if blocks_out:
+        print(f"Blocks exported to: {blocks_out}")
     print(f"Time taken: {elapsed:.2f} seconds\n")
 
     # Optional: show hierarchy stats
@@ -124,6 +340,27 @@ def main():
         print(f"Top-level sections: {top}")
         print(f"Total (nested) sections: {total}")
 
+    if args.profile:
+        processed_pages = len({p for p in pages if 1 <= p <= total_pages}) if pages is not None else total_pages
+        report = profiler.report(
+            pages=processed_pages,
+            file=pdf_path,
+            size_bytes=os.path.getsize(pdf_path),
+            blocks=len(classified),
+            backend=args.backend,
+            workers=args.workers or 1,
+            page_selection=args.pages,
+        )
+        print("[PROFILE] Per-stage timings (CPU time excludes --workers subprocesses)")
+        print(format_report(report) + "\n")
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"Timing report saved to: {args.profile_json}")
+        if cprofile is not None:
+            cprofile.dump_stats(args.pstats)
+            print(f"cProfile stats saved to: {args.pstats} (inspect with: python -m pstats {args.pstats})")
+
 
 if __name__ == "__main__":
     main()
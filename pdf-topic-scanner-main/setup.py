@@ -7,6 +7,7 @@ setup(
     install_requires=[
         "streamlit>=1.0",
         "pdfplumber>=0.5",
+        "numpy>=1.22",
     ],
     author="",
     description="Prototype project for scanning PDF topics and building hierarchies.",
@@ -0,0 +1,115 @@
+"""Cost-based admission control for pipeline work.
+
+A request-count limit treats a 2-page memo and a 3,000-page filing alike,
+so a few large uploads can hold every worker while small ones queue behind
+them. PageBudget admits work by estimated cost instead: a global budget of
+pages may be in flight at once, and a document that does not fit waits.
+
+Waiting is not strictly first-come-first-served. A document that fits in
+the remaining budget may pass larger ones that are waiting, which keeps
+small documents fast. To keep large documents from starving, a waiter that
+has been passed over for `max_bypass_sec` closes the queue: nobody may
+overtake it until it is admitted.
+
+Cost comes from a cheap preflight (estimate_cost): the number of pages to
+process, or the file size in "typical pages" if that is larger, since
+image-heavy pages cost more than their count suggests. Costs above the
+budget are capped at it, so such a document runs alone rather than never.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+
+class AdmissionRejected(Exception):
+    """Raised when too many documents are already waiting for page budget."""
+
+
+def estimate_cost(pages: int, size_bytes: int, bytes_per_page: int) -> int:
+    """Estimated cost of a document in pages: max(page count, size / bytes_per_page), at least 1."""
+    return max(1, pages, math.ceil(size_bytes / max(1, bytes_per_page)))
+
+
+class _Waiter:
+    __slots__ = ("cost", "since", "future")
+
+    def __init__(self, cost: int, future: "asyncio.Future"):
+        self.cost = cost
+        self.since = time.monotonic()
+        self.future = future
+
+
+class PageBudget:
+    """Limits the total estimated pages in flight; use from a single event loop."""
+
+    def __init__(self, budget_pages: int, max_waiting: int, max_bypass_sec: float):
+        self.budget = max(1, budget_pages)
+        self.max_waiting = max(0, max_waiting)
+        self.max_bypass_sec = max_bypass_sec
+        self.in_use = 0
+        self._waiters: List[_Waiter] = []  # oldest first
+
+    @property
+    def available(self) -> int:
+        return self.budget - self.in_use
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _queue_closed(self, now: float) -> bool:
+        """True while some waiter has been passed over for max_bypass_sec."""
+        return any(now - waiter.since >= self.max_bypass_sec for waiter in self._waiters)
+
+    async def acquire(self, cost: int) -> int:
+        """Waits until `cost` pages (capped at the budget) are free and takes them.
+
+        Returns:
+            int: The pages actually reserved; pass this to release().
+        Raises:
+            AdmissionRejected: if the document would have to wait and max_waiting are already waiting.
+        """
+        cost = min(max(1, cost), self.budget)
+        if cost <= self.available and not self._queue_closed(time.monotonic()):
+            self.in_use += cost
+            return cost
+        if len(self._waiters) >= self.max_waiting:
+            raise AdmissionRejected(f"{len(self._waiters)} documents already waiting for page budget")
+
+        waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                self.release(cost)  # admitted just as the caller gave up
+            raise
+        return cost
+
+    def release(self, cost: int) -> None:
+        """Returns pages taken by acquire() and admits waiters that now fit."""
+        self.in_use -= cost
+        now = time.monotonic()
+        for waiter in list(self._waiters):
+            if waiter.future.done():  # cancelled; its acquire() is about to drop it
+                self._waiters.remove(waiter)
+            elif waiter.cost <= self.available:
+                self._waiters.remove(waiter)
+                self.in_use += waiter.cost
+                waiter.future.set_result(None)
+            elif now - waiter.since >= self.max_bypass_sec:
+                break  # this one has been passed over long enough; hold the rest back
+
+    @asynccontextmanager
+    async def reserve(self, cost: int) -> AsyncIterator[int]:
+        """`async with budget.reserve(cost):` acquires on entry and releases on exit."""
+        reserved = await self.acquire(cost)
+        try:
+            yield reserved
+        finally:
+            self.release(reserved)
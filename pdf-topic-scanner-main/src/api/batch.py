@@ -0,0 +1,68 @@
+"""Document listing for batch extraction (/extract/batch).
+
+A batch is any number of uploaded PDFs, or zip archives of PDFs, or both.
+list_batch_documents flattens them into one list of BatchDocument entries
+without extracting anything: zip members are read straight from the
+uploaded archive, one at a time, when their turn to be processed comes.
+"""
+
+import zipfile
+from typing import BinaryIO, Callable, List, NamedTuple, Optional
+
+from fastapi import UploadFile
+
+
+class BatchDocument(NamedTuple):
+    """One document of a batch; open() returns a readable binary stream of its bytes."""
+
+    index: int
+    filename: str
+    open: Callable[[], BinaryIO]
+    size: Optional[int]  # uncompressed size when known up front (zip members)
+
+
+def _open_upload(upload: UploadFile) -> Callable[[], BinaryIO]:
+    def open_upload() -> BinaryIO:
+        upload.file.seek(0)
+        return upload.file
+    return open_upload
+
+
+def _open_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Callable[[], BinaryIO]:
+    return lambda: archive.open(info)
+
+
+def list_batch_documents(files: List[UploadFile], max_documents: int) -> List[BatchDocument]:
+    """Lists the documents in a batch upload; .zip uploads contribute their non-directory members.
+
+    Args:
+        files (List[UploadFile]): The uploaded files.
+        max_documents (int): Maximum number of documents in one batch.
+    Returns:
+        List[BatchDocument]: Documents in upload (and archive) order. Names are
+        not checked here, so that each bad entry can be reported on its own.
+    Raises:
+        ValueError: if an archive cannot be read, or there are no or too many documents.
+    """
+    documents: List[BatchDocument] = []
+    for upload in files:
+        filename = upload.filename or "unknown.pdf"
+        if not filename.lower().endswith(".zip"):
+            documents.append(BatchDocument(len(documents), filename, _open_upload(upload), None))
+            continue
+        try:
+            archive = zipfile.ZipFile(upload.file)
+        except zipfile.BadZipFile:
+            raise ValueError(f"{filename} is not a valid zip archive")
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            documents.append(BatchDocument(len(documents), info.filename, _open_member(archive, info), info.file_size))
+        if len(documents) > max_documents:
+            break
+
+    if not documents:
+        raise ValueError("The batch contains no documents")
+    if len(documents) > max_documents:
+        raise ValueError(f"Too many documents in one batch (max {max_documents})")
+    return documents
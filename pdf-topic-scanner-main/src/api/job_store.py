@@ -0,0 +1,191 @@
+"""SQLite-backed job table for asynchronous extractions.
+
+Each job row records the uploaded file, its status (queued → running →
+done / failed), parse progress and, once finished, the hierarchy JSON or the
+error message. Every call opens its own short-lived connection, so the API
+process, the dispatcher thread and the worker processes can all use the
+same database file; WAL mode keeps readers from blocking the writer.
+
+Rows outlive the server process. A running job records the runner that
+claimed it (`owner`) and a `heartbeat_at` that runner keeps fresh; jobs
+whose heartbeat has gone stale (their server stopped or died) are put back
+in the queue (see requeue_interrupted). Jobs of live runners sharing the
+database, e.g. sibling uvicorn workers, are left alone.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+from src.serialization import dumps, loads
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+BUSY_TIMEOUT_SEC = 30  # how long a connection waits for a concurrent writer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    pdf_path TEXT NOT NULL,
+    content_hash TEXT,
+    pages TEXT,
+    page_selection TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, for databases created before them
+_ADDED_COLUMNS = {"owner": "TEXT", "heartbeat_at": "REAL"}
+
+# Columns returned by JobStore.get (the result is fetched separately)
+_STATUS_COLUMNS = (
+    "id", "status", "filename", "pdf_path", "content_hash", "pages", "page_selection", "progress",
+    "error", "created_at", "started_at", "finished_at", "updated_at", "owner", "heartbeat_at",
+)
+
+
+class JobStore:
+    """Job table in the SQLite database at `db_path`."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._initialized = False  # database file and schema are created on first use
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            with closing(sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SEC)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+                for name, sql_type in _ADDED_COLUMNS.items():
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {sql_type}")
+            self._initialized = True
+        return sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SEC)
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def create(
+        self,
+        filename: str,
+        pdf_path: str,
+        pages: Optional[List[int]] = None,
+        page_selection: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> str:
+        """Adds a queued job and returns its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, filename, pdf_path, content_hash, pages, page_selection, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, STATUS_QUEUED, filename, pdf_path, content_hash,
+                    json.dumps(pages) if pages is not None else None, page_selection, now, now,
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Returns the job's status fields (no result), or None if unknown."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_STATUS_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_STATUS_COLUMNS, row))
+        job["pages"] = json.loads(job["pages"]) if job["pages"] else None
+        return job
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        """Returns the stored hierarchy of a finished job, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return loads(row[0])
+
+    def claim_next(self, owner: Optional[str] = None) -> Optional[Dict]:
+        """Marks the oldest queued job as running by `owner` and returns it, or None if the queue is empty."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")  # no other dispatcher can claim the same row
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (STATUS_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = 0, started_at = ?, updated_at = ?, owner = ?, "
+                "heartbeat_at = ? WHERE id = ?",
+                (STATUS_RUNNING, now, now, owner, now, row[0]),
+            )
+        return self.get(row[0])
+
+    def set_progress(self, job_id: str, progress: float) -> None:
+        self._update(job_id, progress=progress)
+
+    def finish(self, job_id: str, result: Dict) -> None:
+        """Stores the result and marks the job done."""
+        self._update(
+            job_id,
+            status=STATUS_DONE,
+            progress=1.0,
+            result=dumps(result).decode("utf-8"),
+            finished_at=time.time(),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._update(job_id, status=STATUS_FAILED, error=error, finished_at=time.time())
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Returns the number of jobs in each status (statuses without jobs are omitted)."""
+        with closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def heartbeat(self, owner: str) -> int:
+        """Marks `owner`'s running jobs as still alive; returns how many it has."""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND owner = ?",
+                (time.time(), STATUS_RUNNING, owner),
+            )
+            return cursor.rowcount
+
+    def requeue_interrupted(self, stale_after_sec: float) -> int:
+        """Puts running jobs without a heartbeat for `stale_after_sec` back in the queue; returns how many."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, progress = 0, started_at = NULL, owner = NULL, heartbeat_at = NULL, "
+                "updated_at = ? WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (STATUS_QUEUED, now, STATUS_RUNNING, now - stale_after_sec),
+            )
+            return cursor.rowcount
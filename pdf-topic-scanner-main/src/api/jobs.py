@@ -0,0 +1,160 @@
+"""Background execution of queued extraction jobs.
+
+JobRunner owns a small process pool and a dispatcher thread. The dispatcher
+claims queued jobs from the JobStore whenever a worker is free and runs
+run_job on them; workers write progress and results straight into the job
+table, so the API only ever reads from it.
+
+Several runners may share one database (one per uvicorn worker). Each
+claims jobs under its own owner id and refreshes their heartbeat every
+HEARTBEAT_INTERVAL_SEC; any runner re-queues running jobs whose heartbeat
+is older than HEARTBEAT_STALE_SEC, i.e. whose runner has stopped or died.
+"""
+
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from src.api.job_store import JobStore
+from src.pipeline import run_pipeline
+from utils.logger import get_logger
+
+POLL_INTERVAL_SEC = 1.0  # dispatcher re-checks the queue at least this often
+PROGRESS_INTERVAL_SEC = 0.5  # min time between progress writes from a worker
+PARSE_PROGRESS_SHARE = 0.9  # share of the progress bar covered by page parsing
+HEARTBEAT_INTERVAL_SEC = 5.0  # how often a runner marks its running jobs as alive
+HEARTBEAT_STALE_SEC = 30.0  # running jobs without a heartbeat this long are re-queued
+
+logger = get_logger(__name__)
+
+
+def run_job(job_id: str, db_path: str, cache_dir: Optional[str] = None) -> None:
+    """Worker entry point: runs the pipeline for one claimed job and records the outcome."""
+    store = JobStore(db_path)
+    job = store.get(job_id)
+    if job is None:
+        return
+
+    last_write = 0.0
+
+    def progress(done: int, total: int) -> None:
+        nonlocal last_write
+        now = time.time()
+        if done == total or now - last_write >= PROGRESS_INTERVAL_SEC:
+            last_write = now
+            store.set_progress(job_id, round(PARSE_PROGRESS_SHARE * done / max(total, 1), 3))
+
+    try:
+        tree = run_pipeline(
+            job["pdf_path"],
+            source_file=job["filename"],
+            pages=job["pages"],
+            page_selection=job["page_selection"],
+            cache_dir=cache_dir,
+            content_hash=job["content_hash"],
+            progress=progress,
+        )
+        store.finish(job_id, tree)
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        store.fail(job_id, str(e))
+    finally:
+        try:
+            os.remove(job["pdf_path"])
+        except OSError:
+            pass
+
+
+class JobRunner:
+    """Runs queued jobs from `store` on `workers` processes."""
+
+    def __init__(self, store: JobStore, workers: int, cache_dir: Optional[str] = None):
+        self.store = store
+        self.workers = max(1, workers)
+        self.cache_dir = cache_dir
+        self._free = threading.Semaphore(self.workers)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._last_heartbeat = 0.0
+
+    def start(self) -> None:
+        """Starts dispatching (and re-queueing jobs of runners that are gone)."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def notify(self) -> None:
+        """Wakes the dispatcher, e.g. right after a job was queued."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stops dispatching; running jobs are re-queued once their heartbeat goes stale."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a threaded server process is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _keep_alive(self) -> None:
+        """Refreshes this runner's heartbeats and re-queues jobs of runners that stopped sending theirs."""
+        now = time.time()
+        if now - self._last_heartbeat < HEARTBEAT_INTERVAL_SEC:
+            return
+        self._last_heartbeat = now
+        self.store.heartbeat(self.owner)
+        requeued = self.store.requeue_interrupted(HEARTBEAT_STALE_SEC)
+        if requeued:
+            logger.info(f"Re-queued {requeued} interrupted job(s)")
+
+    def _dispatch(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._keep_alive()
+            except Exception as e:  # e.g. database locked for longer than the busy timeout
+                logger.warning(f"Job heartbeat failed: {e}")
+            while not self._stopping.is_set() and self._free.acquire(blocking=False):
+                job = self.store.claim_next(self.owner)
+                if job is None:
+                    self._free.release()
+                    break
+                try:
+                    future = self._get_executor().submit(run_job, job["id"], self.store.db_path, self.cache_dir)
+                except Exception as e:
+                    self._free.release()
+                    self._executor = None  # broken pool; start a fresh one for the next job
+                    self.store.fail(job["id"], f"Could not start job: {e}")
+                    continue
+                future.add_done_callback(lambda f, job_id=job["id"]: self._job_done(job_id, f))
+            self._wake.wait(POLL_INTERVAL_SEC)
+            self._wake.clear()
+
+    def _job_done(self, job_id: str, future: Future) -> None:
+        self._free.release()
+        if not future.cancelled() and future.exception() is not None:
+            # run_job records its own failures; this is the worker process itself dying
+            logger.error(f"Worker for job {job_id} died: {future.exception()}")
+            self._executor = None
+            self.store.fail(job_id, "Worker process died")
+        self._wake.set()
@@ -0,0 +1,143 @@
+"""Per-client token buckets shared by every API process on a node.
+
+An in-memory limiter counts per process, so N uvicorn workers allow N times
+the intended rate, and it counts requests where the real cost is pages.
+PageRateLimiter keeps one token bucket per client in a small SQLite
+database instead: every process on the node reads and updates the same
+rows (BEGIN IMMEDIATE makes each update atomic), and no external service
+is needed.
+
+Tokens are pages. A bucket holds at most `capacity` and refills at
+`refill_per_sec`. Each request must find at least `request_cost` tokens
+(allow) and pays that much up front; once the document's size is known it
+is charged its estimated pages (charge). A charge may take the bucket
+below zero, so a document larger than the whole bucket can still be
+processed; the client then waits until the debt is refilled.
+"""
+
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import NamedTuple, Optional
+
+BUSY_TIMEOUT_SEC = 30  # how long a connection waits for a concurrent writer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    client TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class Quota(NamedTuple):
+    """A client's bucket after an operation, as reported in X-RateLimit-* headers."""
+
+    limit: int
+    remaining: int
+    reset_sec: int  # until the bucket is full again
+    retry_after_sec: int  # until the next request would be allowed (0 if now)
+
+    def headers(self) -> dict:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_sec),
+        }
+
+
+class RateLimited(Exception):
+    """Raised when a client's bucket cannot pay for another request."""
+
+    def __init__(self, quota: Quota):
+        super().__init__(f"Rate limited; retry in {quota.retry_after_sec}s")
+        self.quota = quota
+
+
+class PageRateLimiter:
+    """Token buckets of pages per client in the SQLite database at `db_path`."""
+
+    def __init__(self, db_path: str, capacity: float, refill_per_sec: float, request_cost: float = 1):
+        self.db_path = db_path
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.request_cost = request_cost
+        self.enabled = True
+        self._initialized = False  # database file and schema are created on first use
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            with closing(sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SEC)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+            self._initialized = True
+        # isolation_level=None: transactions are managed explicitly (BEGIN IMMEDIATE)
+        return sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SEC, isolation_level=None)
+
+    def _quota(self, tokens: float) -> Quota:
+        rate = max(self.refill_per_sec, 1e-9)
+        return Quota(
+            limit=int(self.capacity),
+            remaining=max(0, math.floor(tokens)),
+            reset_sec=math.ceil(max(0.0, self.capacity - tokens) / rate),
+            retry_after_sec=math.ceil(max(0.0, self.request_cost - tokens) / rate),
+        )
+
+    def _refilled(self, row: Optional[tuple], now: float) -> float:
+        """Tokens in a bucket row (tokens, updated_at) at time `now`; a new client starts full."""
+        if row is None:
+            return self.capacity
+        return min(self.capacity, row[0] + max(0.0, now - row[1]) * self.refill_per_sec)
+
+    def _take(self, client: str, cost: float, require: float) -> Quota:
+        """Refills `client`'s bucket, then takes `cost` if at least `require` tokens are there."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE client = ?", (client,)).fetchone()
+                tokens = self._refilled(row, now)
+                if tokens < require:
+                    conn.execute("ROLLBACK")
+                    raise RateLimited(self._quota(tokens))
+                tokens -= cost
+                conn.execute(
+                    "INSERT INTO buckets (client, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(client) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (client, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        return self._quota(tokens)
+
+    def allow(self, client: str) -> Quota:
+        """Takes request_cost tokens for a new request.
+
+        Raises:
+            RateLimited: if the bucket holds fewer than request_cost tokens.
+        """
+        if not self.enabled:
+            return self._quota(self.capacity)
+        return self._take(client, self.request_cost, require=self.request_cost)
+
+    def charge(self, client: str, pages: float) -> Quota:
+        """Takes `pages` tokens for work already admitted; the bucket may go negative."""
+        if not self.enabled:
+            return self._quota(self.capacity)
+        return self._take(client, pages, require=-math.inf)
+
+    def peek(self, client: str) -> Quota:
+        """Returns the client's current quota without taking anything."""
+        if not self.enabled:
+            return self._quota(self.capacity)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE client = ?", (client,)).fetchone()
+        return self._quota(self._refilled(row, time.time()))
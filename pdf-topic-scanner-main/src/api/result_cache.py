@@ -0,0 +1,145 @@
+"""Cache of finished hierarchies, keyed by PDF content and pipeline version.
+
+The same PDF tends to be uploaded again and again, often by different users
+under different names. ResultCache keeps the pipeline output per content
+hash (plus the page selection, backend, PARSER_VERSION and PIPELINE_VERSION)
+so repeat uploads skip the pipeline entirely.
+
+Two tiers:
+
+- memory: an LRU of compact JSON bytes in the API process, bounded by size
+- disk (optional): gzip entries in a ParseCache directory, shared between
+  processes and kept across restarts; disk hits are promoted to memory
+
+Per-upload metadata (source_file, page_selection) is not part of the key;
+cached hierarchies get the current upload's values via with_upload_metadata.
+result_etag turns the same inputs into a strong ETag, so a client that
+already holds a result can be answered with 304 without running anything.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from src.config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MEMORY_BYTES
+from src.core.backends import DEFAULT_BACKEND
+from src.core.cache import ParseCache
+from src.core.pdf_parser import PARSER_VERSION
+from src.pipeline import PIPELINE_VERSION
+from src.serialization import dumps, loads
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def result_cache_key(
+    content_hash: str,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> str:
+    """Builds the cache key for the hierarchy of the file with the given content hash."""
+    page_part = ",".join(str(p) for p in sorted(set(pages))) if pages is not None else "all"
+    raw = f"{content_hash}|p{PARSER_VERSION}|v{PIPELINE_VERSION}|{backend}|{page_part}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def result_etag(key: str, source_file: str, page_selection: Optional[str] = None) -> str:
+    """Strong ETag for the hierarchy served for `key` under this upload's metadata.
+
+    The pipeline is deterministic, so the ETag depends only on its inputs and
+    can be compared before (or instead of) running it.
+    """
+    raw = f"{key}|{source_file}|{page_selection if page_selection is not None else ''}"
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches `etag` (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def with_upload_metadata(tree: Dict, source_file: str, page_selection: Optional[str] = None) -> Dict:
+    """Returns `tree` with source_file/page_selection of the current upload (shallow copy)."""
+    metadata = {k: v for k, v in tree["metadata"].items() if k != "page_selection"}
+    metadata["source_file"] = source_file
+    if page_selection is not None:
+        metadata["page_selection"] = page_selection
+    return {**tree, "metadata": metadata}
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional disk) cache of pipeline hierarchies."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = RESULT_CACHE_DIR,
+        memory_bytes: int = RESULT_CACHE_MEMORY_BYTES,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    ):
+        self.memory_bytes = memory_bytes
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: Optional[ParseCache] = None
+        self._lock = threading.Lock()
+
+    def _get_disk(self) -> Optional[ParseCache]:
+        if self._disk is None and self.cache_dir:
+            self._disk = ParseCache(self.cache_dir, self.max_bytes)
+        return self._disk
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Returns the cached hierarchy for `key`, or None (counted as a hit or miss)."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return loads(data)
+
+        disk = self._get_disk()
+        tree = disk.get(key) if disk is not None else None
+        with self._lock:
+            if tree is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, tree)
+        return tree
+
+    def put(self, key: str, tree: Dict) -> None:
+        """Stores a hierarchy in memory and, if configured, on disk."""
+        self._remember(key, tree)
+        disk = self._get_disk()
+        if disk is not None:
+            try:
+                disk.put(key, tree)
+            except OSError as e:
+                logger.warning(f"Could not write result cache entry {key}: {e}")
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _remember(self, key: str, tree: Dict) -> None:
+        data = dumps(tree)
+        if len(data) > self.memory_bytes:
+            return  # would evict everything else; the disk tier still has it
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_size -= len(old)
+            self._memory[key] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
@@ -1,14 +1,15 @@
 """Small FastAPI server to expose the DocTree.AI pipeline as an HTTP API."""
+import asyncio
+import functools
 import logging
+import re
 import time
 import os
-import tempfile
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.requests import Request
 
 # Configure structured logging
@@ -21,24 +22,197 @@ logger = logging.getLogger(__name__)
 # Set max file size to 500MB (default is 25MB)
 max_file_size = 500 * 1024 * 1024  # 500MB
 
-from src.core.pdf_parser import parse_pdf
-from src.features.feature_engineer import enrich_blocks_with_features
-from src.hierarchy.heading_classifier import classify_headings
-from src.hierarchy.tree_builder import build_hierarchy
+from src.api.admission import AdmissionRejected, PageBudget, estimate_cost
+from src.api.batch import list_batch_documents
+from src.api.job_store import STATUS_DONE, JobStore
+from src.api.jobs import JobRunner
+from src.api.metrics import (
+    BLOCK_BUCKETS,
+    BYTE_BUCKETS,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    LATENCY_BUCKETS,
+    PAGE_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    process_rss_bytes,
+)
+from src.api.rate_limit import PageRateLimiter, RateLimited
+from src.api.result_cache import (
+    ResultCache,
+    etag_matches,
+    result_cache_key,
+    result_etag,
+    with_upload_metadata,
+)
+from src.api.streaming import NO_ITEM, format_sse, poll_queue, stream_pipeline_to_queue
+from src.api.uploads import MaxBodySizeMiddleware, UploadTooLarge, spool_file, spool_upload
+from src.api.warmup import warm_up_worker
+from src.api.worker_pool import PipelinePool, PoolSaturated
+from src.config import (
+    API_BYTES_PER_PAGE,
+    API_MAX_BYPASS_SEC,
+    API_MAX_QUEUE,
+    API_MAX_WAITING,
+    API_PAGE_BUDGET,
+    API_RETRY_AFTER_SEC,
+    API_WORKER_MAX_DOCUMENTS,
+    API_WORKER_MAX_RSS_MB,
+    API_WORKERS,
+    BATCH_MAX_DOCUMENTS,
+    JOB_DIR,
+    JOB_WORKERS,
+    PARSE_CACHE_DIR,
+    RATE_LIMIT_BURST_PAGES,
+    RATE_LIMIT_DB,
+    RATE_LIMIT_PAGES_PER_MIN,
+    RATE_LIMIT_REQUEST_COST,
+)
+from src.core.pdf_parser import count_pages
+from src.pipeline import PipelineCancelled, run_pipeline_timed
+from src.serialization import dumps, iter_json
+from utils.validators import parse_page_spec
+
+# CPU-bound pipeline runs here, off the event loop (sized by DOCTREE_API_WORKERS / DOCTREE_API_MAX_QUEUE).
+# Workers warm up on a tiny PDF before their first call and are recycled by document count and memory.
+pipeline_pool = PipelinePool(
+    API_WORKERS,
+    API_MAX_QUEUE,
+    initializer=warm_up_worker,
+    max_calls_per_worker=API_WORKER_MAX_DOCUMENTS,
+    max_worker_rss_bytes=API_WORKER_MAX_RSS_MB * 1024 * 1024,
+)
+
+DISCONNECT_POLL_SEC = 0.5  # how often a waiting /extract checks whether its client is still there
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")  # hex digest as sent to /results/{content_hash}
+STREAM_JSON_MIN_BLOCKS = 20_000  # hierarchies this large are sent section by section
+
+# Admission by estimated pages in flight, so large documents cannot crowd out small ones
+page_budget = PageBudget(API_PAGE_BUDGET, API_MAX_WAITING, API_MAX_BYPASS_SEC)
+
+# Per-client page quotas, shared with the other API processes on this node
+limiter = PageRateLimiter(
+    RATE_LIMIT_DB, RATE_LIMIT_BURST_PAGES, RATE_LIMIT_PAGES_PER_MIN / 60, RATE_LIMIT_REQUEST_COST
+)
+
+# Finished hierarchies by content hash (memory LRU, plus disk under DOCTREE_RESULT_CACHE_DIR)
+result_cache = ResultCache()
+
+# Asynchronous jobs: persistent job table plus uploads under DOCTREE_JOB_DIR (unset: /jobs disabled)
+job_store = JobStore(os.path.join(JOB_DIR, "jobs.sqlite3")) if JOB_DIR else None
+job_runner = JobRunner(job_store, JOB_WORKERS, cache_dir=PARSE_CACHE_DIR) if job_store is not None else None
+
+# Prometheus metrics for /metrics (per API process)
+metrics = Registry()
+stage_seconds = metrics.register(Histogram(
+    "doctree_stage_duration_seconds", "Time spent per pipeline stage.", LATENCY_BUCKETS, ["stage"],
+))
+request_seconds = metrics.register(Histogram(
+    "doctree_request_duration_seconds", "End-to-end time per extracted document.", LATENCY_BUCKETS, ["endpoint"],
+))
+document_pages = metrics.register(Histogram(
+    "doctree_document_pages", "Pages per processed document.", PAGE_BUCKETS,
+))
+document_blocks = metrics.register(Histogram(
+    "doctree_document_blocks", "Text blocks per processed document.", BLOCK_BUCKETS,
+))
+upload_bytes = metrics.register(Histogram(
+    "doctree_upload_bytes", "Size of uploaded documents.", BYTE_BUCKETS,
+))
+cancelled_total = metrics.register(Counter(
+    "doctree_cancelled_total", "Pipeline calls stopped because their client went away.", ["endpoint"],
+))
+cancelled_cpu_seconds = metrics.register(Counter(
+    "doctree_cancelled_cpu_seconds_total", "Worker CPU time spent on calls that were then cancelled.", ["endpoint"],
+))
+documents_total = metrics.register(Counter(
+    "doctree_documents_total", "Documents handled, by outcome.", ["endpoint", "outcome"],
+))
+metrics.register(Gauge(
+    "doctree_pipeline_in_flight", "Pipeline calls running or queued in the worker pool.",
+    lambda: pipeline_pool.in_flight,
+))
+metrics.register(Gauge(
+    "doctree_pipeline_queue_depth", "Pipeline calls waiting for a free worker.",
+    lambda: pipeline_pool.queued,
+))
+admission_wait_seconds = metrics.register(Histogram(
+    "doctree_admission_wait_seconds", "Time documents waited for page budget.", LATENCY_BUCKETS,
+))
+admission_cost_pages = metrics.register(Histogram(
+    "doctree_admission_cost_pages", "Estimated cost of admitted documents, in pages.", PAGE_BUCKETS,
+))
+metrics.register(Gauge(
+    "doctree_admission_pages_in_use", "Estimated pages currently admitted.",
+    lambda: page_budget.in_use,
+))
+metrics.register(Gauge(
+    "doctree_admission_waiting", "Documents waiting for page budget.",
+    lambda: page_budget.waiting,
+))
+metrics.register(Gauge(
+    "doctree_jobs", "Asynchronous jobs by status.",
+    lambda: {(status,): count for status, count in (job_store.count_by_status() if job_store else {}).items()},
+    ["status"],
+))
+metrics.register(Gauge(
+    "doctree_result_cache_lookups_total", "Result cache lookups by result.",
+    lambda: {("hit",): result_cache.hits, ("miss",): result_cache.misses}, ["result"], kind="counter",
+))
+metrics.register(Gauge(
+    "doctree_result_cache_hit_ratio", "Share of result cache lookups that were hits.",
+    lambda: result_cache.hit_ratio,
+))
+metrics.register(Gauge(
+    "doctree_worker_rss_bytes", "Resident memory of each pipeline worker process.",
+    lambda: {(str(pid),): rss for pid in pipeline_pool.worker_pids() if (rss := process_rss_bytes(pid)) is not None},
+    ["pid"],
+))
+metrics.register(Gauge(
+    "doctree_pipeline_ready", "1 once the pipeline workers have warmed up.",
+    lambda: int(pipeline_pool.ready),
+))
+metrics.register(Gauge(
+    "doctree_worker_recycles_total",
+    "Pipeline workers replaced, by reason (calls: reached the per-worker call limit; memory: retired with "
+    "a worker set that exceeded the memory limit).",
+    lambda: {(reason,): count for reason, count in pipeline_pool.recycled.items()}, ["reason"], kind="counter",
+))
+metrics.register(Gauge(
+    "process_resident_memory_bytes", "Resident memory of the API process.",
+    lambda: process_rss_bytes(os.getpid()) or 0,
+))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if job_runner is not None:
+        job_runner.start()
+    warm_up = asyncio.create_task(pipeline_pool.warm_up())  # /ready answers 503 until this is done
+    yield
+    warm_up.cancel()
+    await asyncio.gather(warm_up, return_exceptions=True)
+    if job_runner is not None:
+        job_runner.stop()
+    pipeline_pool.shutdown()
+
 
 app = FastAPI(
     title="DocTree.AI API",
     version="0.1.0",
     description="PDF topic scanning and document hierarchy extraction",
+    lifespan=lifespan,
 )
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, lambda request, exc: JSONResponse(
-    status_code=429,
-    content={"detail": "Too many requests. Please try again later."},
-))
+# Limit upload size while the body streams in (also covers chunked uploads without Content-Length).
+# Added first, so it is the innermost middleware: its 413s still get CORS and security headers.
+# A batch body holds up to BATCH_MAX_DOCUMENTS files; the handler checks each against max_file_size.
+app.add_middleware(
+    MaxBodySizeMiddleware,
+    max_bytes=max_file_size,
+    path_limits={"/extract/batch": max_file_size * BATCH_MAX_DOCUMENTS},
+)
 
 # In development allow all origins. Restrict in production via environment variable.
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
@@ -60,24 +234,292 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
     return response
 
-# Configure middleware to limit upload size
+
+# Quota headers for rate-limited endpoints (the bucket as it stands once the response is ready)
 @app.middleware("http")
-async def limit_upload_size(request: Request, call_next):
-    if request.method == "POST":
-        if "content-length" in request.headers:
-            try:
-                content_length = int(request.headers["content-length"])
-                if content_length > max_file_size:
-                    logger.warning(
-                        f"Upload rejected: file size {content_length / (1024*1024):.1f}MB exceeds limit {max_file_size / (1024*1024):.0f}MB"
-                    )
-                    return JSONResponse(
-                        status_code=413,
-                        content={"detail": f"File too large. Max size is {max_file_size / (1024*1024):.0f}MB"},
-                    )
-            except (ValueError, TypeError):
-                logger.error("Invalid Content-Length header")
-    return await call_next(request)
+async def add_rate_limit_headers(request: Request, call_next):
+    response = await call_next(request)
+    client = getattr(request.state, "rate_limit_client", None)
+    if client is not None:
+        quota = await asyncio.get_running_loop().run_in_executor(None, limiter.peek, client)
+        response.headers.update(quota.headers())
+    return response
+
+
+async def _rate_limit(request: Request) -> str:
+    """Takes the request fee from the client's page quota; returns the client key for later charges.
+
+    Raises:
+        HTTPException: 429 with Retry-After and X-RateLimit-* headers if the quota is used up.
+    """
+    client = request.client.host if request.client else "unknown"
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, limiter.allow, client)
+    except RateLimited as e:
+        logger.warning(f"[{request.headers.get('X-Request-ID', 'unknown')}] Rate limit exceeded for {client}")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(max(1, e.quota.retry_after_sec)), **e.quota.headers()},
+        )
+    request.state.rate_limit_client = client
+    return client
+
+
+async def _charge(client: Optional[str], cost: int) -> None:
+    """Debits `cost` pages from the client's quota (no-op without a client)."""
+    if client is not None:
+        await asyncio.get_running_loop().run_in_executor(None, limiter.charge, client, cost)
+
+
+async def _wait_for_quota(client: str) -> None:
+    """Sleeps until the client's quota could pay for another request (used between batch documents)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        quota = await loop.run_in_executor(None, limiter.peek, client)
+        if quota.retry_after_sec <= 0:
+            return
+        await asyncio.sleep(quota.retry_after_sec)
+
+
+def _saturated() -> bool:
+    """True if new work would be refused anyway (worker queue or page budget wait list full)."""
+    return pipeline_pool.in_flight >= pipeline_pool.capacity or page_budget.waiting >= page_budget.max_waiting
+
+
+def _server_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy processing other documents. Please retry later.",
+        headers={"Retry-After": str(API_RETRY_AFTER_SEC)},
+    )
+
+
+def _validate_upload(file: UploadFile, pages: Optional[str], request_id: str):
+    """Checks the upload's filename and page selection; returns (filename, page_numbers)."""
+    filename = file.filename or "unknown.pdf"
+    if not filename.lower().endswith(".pdf"):
+        logger.warning(f"[{request_id}] Invalid file type: {filename}")
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are accepted",
+        )
+    return filename, _validate_pages(pages, request_id)
+
+
+def _validate_pages(pages: Optional[str], request_id: str) -> Optional[List[int]]:
+    """Parses the optional `pages` query parameter (400 if malformed)."""
+    if not pages:
+        return None
+    try:
+        return parse_page_spec(pages)
+    except ValueError as e:
+        logger.warning(f"[{request_id}] Invalid page selection: {pages}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _save_upload(file: UploadFile, request_id: str, directory: Optional[str] = None) -> Tuple[str, str]:
+    """Streams the upload to a new .pdf file (in `directory`, default: system temp).
+
+    Returns (path, sha256); the hash doubles as the parse cache key.
+    """
+    try:
+        path, content_hash, size = await spool_upload(file, max_file_size, directory=directory)
+    except UploadTooLarge as e:
+        logger.warning(f"[{request_id}] Upload rejected: {e}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error(f"[{request_id}] Error reading file: {str(e)}")
+        raise HTTPException(
+            status_code=400,
+            detail="Failed to read uploaded file",
+        )
+    upload_bytes.observe(size)
+    logger.debug(f"[{request_id}] Spooled {size} bytes (sha256 {content_hash[:12]})")
+    return path, content_hash
+
+
+def _spool_document(open_document) -> Tuple[str, str, int]:
+    """Copies one batch document to a spool file (blocking; see spool_file)."""
+    with open_document() as source:
+        return spool_file(source, max_file_size)
+
+
+async def _document_cost(pdf_path: str, page_numbers: Optional[List[int]]) -> int:
+    """Estimated cost in pages from a cheap preflight (page count and file size; see estimate_cost)."""
+    size = os.path.getsize(pdf_path)
+    try:
+        total = await asyncio.get_running_loop().run_in_executor(None, count_pages, pdf_path)
+    except Exception:
+        return estimate_cost(0, size, API_BYTES_PER_PAGE)  # unreadable; the pipeline will report it
+    if page_numbers is None:
+        return estimate_cost(total, size, API_BYTES_PER_PAGE)
+    pages = len({p for p in page_numbers if 1 <= p <= total})
+    return estimate_cost(pages, size * pages // max(total, 1), API_BYTES_PER_PAGE)
+
+
+async def _admit(pdf_path: str, page_numbers: Optional[List[int]]) -> Tuple[int, int]:
+    """Waits for page budget for this document; returns (reserved pages, estimated cost).
+
+    Release the reserved pages when done. Charge the cost to the client's
+    rate limit quota only once the work is actually submitted, so a
+    rejected request (503) costs no pages.
+
+    Raises:
+        AdmissionRejected: if too many documents are already waiting.
+    """
+    cost = await _document_cost(pdf_path, page_numbers)
+    t0 = time.perf_counter()
+    reserved = await page_budget.acquire(cost)
+    admission_wait_seconds.observe(time.perf_counter() - t0)
+    admission_cost_pages.observe(cost)
+    return reserved, cost
+
+
+class ClientDisconnected(Exception):
+    """Raised while waiting for pipeline work whose client has gone away."""
+
+
+# Tasks reaping abandoned pipeline calls (kept referenced until done)
+_reapers: Set["asyncio.Task"] = set()
+
+
+async def _await_work(work: "asyncio.Future", request: Optional[Request] = None) -> Any:
+    """Awaits a pool call without ever cancelling it.
+
+    With `request`, raises ClientDisconnected as soon as that client goes away.
+    Cancelling the caller leaves `work` running; hand it to _abandon.
+    """
+    timeout = DISCONNECT_POLL_SEC if request is not None else None
+    while True:
+        done, _ = await asyncio.wait({work}, timeout=timeout)
+        if done:
+            return work.result()
+        if await request.is_disconnected():
+            raise ClientDisconnected()
+
+
+def _abandon(work: "asyncio.Future", cancel: Any, reserved: int, endpoint: str) -> None:
+    """Stops an unwanted pool call at its next page; its page budget is released once the worker is free."""
+    loop = asyncio.get_running_loop()
+
+    async def reap() -> None:
+        try:
+            await loop.run_in_executor(None, cancel.set)
+            await work
+        except PipelineCancelled as e:
+            cancelled_total.inc(endpoint=endpoint)
+            cancelled_cpu_seconds.inc(e.cpu_seconds, endpoint=endpoint)
+            logger.info(f"Cancelled abandoned {endpoint} pipeline call after {e.cpu_seconds:.2f} CPU-seconds")
+        except Exception:
+            pass  # failed or finished before seeing the flag; nobody is waiting for it
+        finally:
+            page_budget.release(reserved)
+
+    task = loop.create_task(reap())
+    _reapers.add(task)
+    task.add_done_callback(_reapers.discard)
+
+
+async def _cached_pipeline(
+    pdf_path: str,
+    content_hash: str,
+    filename: str,
+    page_numbers: Optional[List[int]],
+    page_selection: Optional[str],
+    endpoint: str,
+    request: Optional[Request] = None,
+    client: Optional[str] = None,
+) -> Tuple[Dict, str]:
+    """Returns (hierarchy, "HIT" or "MISS"), running the pipeline in the pool only on a result cache miss.
+
+    On a miss the document first waits for page budget (see _admit) and is
+    charged to `client`'s rate limit quota once it is handed to a worker;
+    rejections and hits cost nothing more. If the
+    caller is cancelled, or `request`'s client disconnects, the worker is
+    told to stop at its next page (see _abandon).
+
+    Raises:
+        AdmissionRejected: on a miss when too many documents wait for page budget.
+        PoolSaturated: on a miss when the pool cannot take more work.
+        ClientDisconnected: if `request`'s client went away meanwhile.
+        Exception: whatever the pipeline raised.
+    """
+    loop = asyncio.get_running_loop()
+    cache_key = result_cache_key(content_hash, page_numbers)
+    tree = await loop.run_in_executor(None, result_cache.get, cache_key)
+    if tree is not None:
+        return with_upload_metadata(tree, filename, page_selection), "HIT"
+
+    reserved, cost = await _admit(pdf_path, page_numbers)
+    abandoned = False
+    try:
+        cancel = await loop.run_in_executor(None, pipeline_pool.make_event)
+        work = pipeline_pool.submit(
+            run_pipeline_timed,
+            pdf_path,
+            source_file=filename,
+            pages=page_numbers,
+            page_selection=page_selection,
+            cache_dir=PARSE_CACHE_DIR,
+            content_hash=content_hash,
+            cancel=cancel,
+        )
+        try:
+            await _charge(client, cost)
+            tree, timings = await _await_work(work, request)
+        except (ClientDisconnected, asyncio.CancelledError):
+            abandoned = True
+            _abandon(work, cancel, reserved, endpoint)
+            raise
+    finally:
+        if not abandoned:
+            page_budget.release(reserved)
+    for stage, seconds in timings.items():
+        stage_seconds.observe(seconds, stage=stage)
+    document_pages.observe(tree["metadata"]["total_pages"])
+    document_blocks.observe(tree["metadata"]["total_blocks"])
+    await loop.run_in_executor(None, result_cache.put, cache_key, tree)
+    return tree, "MISS"
+
+
+def _server_timing(seconds: float) -> str:
+    """Server-Timing header value for a response that took `seconds` (kept out of ETag-validated bodies)."""
+    return f"total;dur={seconds * 1000:.1f}"
+
+
+def _json_response(content: Dict, headers: Dict[str, str]) -> Response:
+    """JSON response for {..., "hierarchy": tree}, recording encoding time as the "serialization" stage.
+
+    Hierarchies of STREAM_JSON_MIN_BLOCKS blocks or more are encoded and sent
+    one top-level section at a time (see iter_json) instead of as one body.
+    """
+    if content["hierarchy"]["metadata"]["total_blocks"] < STREAM_JSON_MIN_BLOCKS:
+        t0 = time.perf_counter()
+        body = dumps(content)
+        stage_seconds.observe(time.perf_counter() - t0, stage="serialization")
+        return Response(body, media_type="application/json", headers=headers)
+
+    def pieces():
+        encoded = iter_json(content, stream=("hierarchy", "sections"))
+        elapsed = 0.0
+        while True:
+            t0 = time.perf_counter()
+            piece = next(encoded, None)
+            elapsed += time.perf_counter() - t0
+            if piece is None:
+                break
+            yield piece
+        stage_seconds.observe(elapsed, stage="serialization")
+
+    # A sync iterator: Starlette pulls each piece in a thread, off the event loop
+    return StreamingResponse(pieces(), media_type="application/json", headers=headers)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus metrics: per-stage latencies, document sizes, queue depth, cache and memory."""
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/health")
@@ -87,75 +529,96 @@ async def health_check():
     return {"status": "ok", "version": "0.1.0"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the pipeline workers have warmed up, 503 before."""
+    if not pipeline_pool.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "workers": pipeline_pool.workers}
+
+
 @app.post("/extract")
-@limiter.limit("10/minute")  # Rate limit: 10 requests per minute per IP
-async def extract_hierarchy(request: Request, file: UploadFile = File(...)):
+async def extract_hierarchy(
+    request: Request,
+    file: UploadFile = File(...),
+    pages: Optional[str] = None,
+):
     """
     Accepts a PDF upload, runs the DocTree pipeline, and returns the hierarchy JSON.
+
+    The optional `pages` query parameter (e.g. `?pages=1-20,45`) restricts
+    extraction to those pages; unselected pages are never parsed.
+
+    The pipeline runs in a worker process, so other requests keep being served
+    meanwhile. Admission is by estimated cost (pages, or file size for
+    image-heavy files): at most DOCTREE_API_PAGE_BUDGET pages are in flight,
+    and a document that does not fit waits while smaller ones may go ahead.
+    When all workers are busy and the wait queue is full, or too many
+    documents wait for budget, the request is refused with 503 and a
+    Retry-After header.
+
+    Results are cached by file content, so re-uploads of a known PDF return
+    at once (`X-Cache: HIT`, else `MISS`). Responses carry a strong `ETag`;
+    a request whose `If-None-Match` matches it gets 304 with no body. The
+    body is therefore the same for every response with that ETag; the time
+    taken is reported in the `Server-Timing` header (`total;dur=<ms>`).
     
-    Rate limited to 10 requests per minute per client IP to prevent abuse.
+    Rate limited per client IP by pages: each request costs
+    DOCTREE_RATE_LIMIT_REQUEST_COST, and a processed (uncached) document
+    its estimated pages. Responses carry X-RateLimit-Limit/-Remaining/-Reset;
+    an exhausted quota gets 429 with Retry-After.
     """
     t0 = time.time()
     request_id = request.headers.get("X-Request-ID", "unknown")
     
-    # Validate filename
-    filename = file.filename or "unknown.pdf"
-    if not filename.lower().endswith(".pdf"):
-        logger.warning(f"[{request_id}] Invalid file type: {filename}")
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF files are accepted",
-        )
-    
+    filename, page_numbers = _validate_upload(file, pages, request_id)
+    client = await _rate_limit(request)
+
+    # Refuse before reading the upload if it could not be admitted anyway
+    if _saturated():
+        logger.warning(f"[{request_id}] Rejected: pipeline pool saturated")
+        raise _server_busy()
+
     logger.info(f"[{request_id}] Upload started: {filename}")
-    
-    suffix = ".pdf"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        try:
-            content = await file.read()
-            tmp.write(content)
-            temp_path = tmp.name
-        except Exception as e:
-            logger.error(f"[{request_id}] Error reading file: {str(e)}")
-            raise HTTPException(
-                status_code=400,
-                detail="Failed to read uploaded file",
-            )
+    temp_path, content_hash = await _save_upload(file, request_id)
+
+    page_selection = pages if page_numbers is not None else None
+    etag = result_etag(result_cache_key(content_hash, page_numbers), filename, page_selection)
 
     try:
-        logger.info(f"[{request_id}] Processing PDF: {filename}")
-        blocks = parse_pdf(temp_path)
-        logger.debug(f"[{request_id}] Parsed {len(blocks)} blocks")
-        
-        enriched = enrich_blocks_with_features(blocks)
-        logger.debug(f"[{request_id}] Enriched blocks with features")
-        
-        classified = classify_headings(enriched)
-        logger.debug(f"[{request_id}] Classified headings")
-
-        page_numbers = [b.get("page", 1) for b in classified]
-        total_pages = max(page_numbers) if page_numbers else 0
-
-        metadata = {
-            "source_file": filename,
-            "total_blocks": len(classified),
-            "total_pages": total_pages,
-        }
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            logger.info(f"[{request_id}] Not modified: {filename}")
+            return Response(status_code=304, headers={"ETag": etag})
 
-        tree = build_hierarchy(classified, metadata)
+        logger.info(f"[{request_id}] Processing PDF: {filename} (queued: {pipeline_pool.queued})")
+        tree, cache_status = await _cached_pipeline(
+            temp_path, content_hash, filename, page_numbers, page_selection, "/extract", request, client
+        )
         elapsed = time.time() - t0
-        
+        metadata = tree["metadata"]
+
         logger.info(
-            f"[{request_id}] Successfully processed PDF in {elapsed:.2f}s. "
-            f"Pages: {total_pages}, Blocks: {len(classified)}"
+            f"[{request_id}] Successfully processed PDF in {elapsed:.2f}s (cache {cache_status}). "
+            f"Pages: {metadata['total_pages']}, Blocks: {metadata['total_blocks']}"
         )
 
-        return {
-            "ok": True,
-            "duration_sec": round(elapsed, 2),
-            "hierarchy": tree,
-        }
+        response = _json_response(
+            content={"ok": True, "hierarchy": tree},
+            headers={"ETag": etag, "X-Cache": cache_status, "Server-Timing": _server_timing(elapsed)},
+        )
+        request_seconds.observe(time.time() - t0, endpoint="/extract")
+        documents_total.inc(endpoint="/extract", outcome="ok")
+        return response
+    except (PoolSaturated, AdmissionRejected) as e:
+        logger.warning(f"[{request_id}] Rejected: {e}")
+        documents_total.inc(endpoint="/extract", outcome="rejected")
+        raise _server_busy()
+    except ClientDisconnected:
+        logger.info(f"[{request_id}] Client disconnected after {time.time() - t0:.2f}s; processing cancelled")
+        documents_total.inc(endpoint="/extract", outcome="cancelled")
+        return Response(status_code=499)  # nobody is listening; nginx's "client closed request"
     except Exception as e:
+        documents_total.inc(endpoint="/extract", outcome="error")
         elapsed = time.time() - t0
         logger.error(
             f"[{request_id}] Error processing PDF after {elapsed:.2f}s: {str(e)}",
@@ -174,6 +637,343 @@ async def extract_hierarchy(request: Request, file: UploadFile = File(...)):
             logger.warning(f"[{request_id}] Failed to clean up temp file: {str(e)}")
 
 
+@app.post("/extract/stream")
+async def extract_hierarchy_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    pages: Optional[str] = None,
+):
+    """
+    Like /extract, but streams the result as Server-Sent Events.
+
+    Events, in order:
+    - `progress` `{"page", "pages_done", "pages_total"}` after each parsed page
+    - `section` `{"index", "section"}` for each top-level section, as soon as
+      the next one starts (so the first chapters arrive long before the end)
+    - `done` `{"metadata", "duration_sec"}`, or `error` `{"detail"}` on failure
+
+    The `section` payloads, in order, are the `sections` of the /extract hierarchy.
+    Rate limited like /extract.
+    """
+    t0 = time.time()
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    filename, page_numbers = _validate_upload(file, pages, request_id)
+    client = await _rate_limit(request)
+
+    if _saturated():
+        logger.warning(f"[{request_id}] Rejected: pipeline pool saturated")
+        raise _server_busy()
+
+    logger.info(f"[{request_id}] Streaming upload started: {filename}")
+    temp_path, _ = await _save_upload(file, request_id)
+
+    loop = asyncio.get_running_loop()
+    reserved = 0
+    try:
+        reserved, cost = await _admit(temp_path, page_numbers)
+        queue = await loop.run_in_executor(None, pipeline_pool.make_queue)
+        cancel = await loop.run_in_executor(None, pipeline_pool.make_event)
+        work = pipeline_pool.submit(
+            stream_pipeline_to_queue,
+            queue,
+            temp_path,
+            source_file=filename,
+            pages=page_numbers,
+            page_selection=pages if page_numbers is not None else None,
+            cancel=cancel,
+        )
+    except (PoolSaturated, AdmissionRejected) as e:
+        page_budget.release(reserved)
+        os.remove(temp_path)
+        logger.warning(f"[{request_id}] Rejected: {e}")
+        raise _server_busy()
+    except BaseException:
+        page_budget.release(reserved)
+        os.remove(temp_path)
+        raise
+    await _charge(client, cost)
+
+    async def events():
+        try:
+            while True:
+                finished = work.done()  # checked before polling: every item it put is queued by now
+                item = await loop.run_in_executor(None, poll_queue, queue)
+                if item is NO_ITEM:
+                    if not finished:
+                        continue
+                    # The call ended without its end-of-stream marker: the worker process died
+                    logger.error(f"[{request_id}] Streaming worker failed: {work.exception()!r}")
+                    yield format_sse("error", {"detail": "Error processing PDF. Please try again."})
+                    return
+                if item is None:
+                    break
+                event, data = item
+                if event == "done":
+                    data = {**data, "duration_sec": round(time.time() - t0, 2)}
+                    logger.info(f"[{request_id}] Streamed PDF in {data['duration_sec']:.2f}s")
+                yield format_sse(event, data)
+            await work
+        finally:
+            if work.done():
+                page_budget.release(reserved)
+            else:
+                # The client went away mid-stream (the response task was cancelled)
+                logger.info(f"[{request_id}] Stream closed early; processing cancelled")
+                _abandon(work, cancel, reserved, "/extract/stream")
+            try:
+                os.remove(temp_path)
+            except OSError as e:
+                logger.warning(f"[{request_id}] Failed to clean up temp file: {str(e)}")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/extract/batch")
+async def extract_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    pages: Optional[str] = None,
+):
+    """
+    Extracts many PDFs in one request and streams the results as they complete.
+
+    `files` may hold any number of PDFs and/or zip archives of PDFs (up to
+    DOCTREE_BATCH_MAX_DOCUMENTS documents). Archive members are read one by
+    one straight from the upload, never unpacked all at once. Documents run
+    in parallel across the pipeline workers and share the /extract result cache.
+
+    The response is newline-delimited JSON, one line per document in
+    completion order:
+    `{"index", "filename", "ok": true, "cache", "duration_sec", "hierarchy"}` or
+    `{"index", "filename", "ok": false, "error"}`, so one bad document never
+    fails the batch. A last line `{"done": true, "documents", "failed", "duration_sec"}`
+    closes the stream.
+
+    The batch pays the request fee once and each processed document its
+    pages, like /extract. A document does not start while the client's
+    quota is overdrawn, so a large batch proceeds at the refill rate.
+    """
+    t0 = time.time()
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    page_numbers = _validate_pages(pages, request_id)
+    page_selection = pages if page_numbers is not None else None
+    try:
+        documents = list_batch_documents(files, BATCH_MAX_DOCUMENTS)
+    except ValueError as e:
+        logger.warning(f"[{request_id}] Invalid batch: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    client = await _rate_limit(request)
+
+    logger.info(f"[{request_id}] Batch started: {len(documents)} documents")
+    loop = asyncio.get_running_loop()
+    # Keep the batch's own share of the pool to one document per worker, so
+    # interactive /extract requests still find room in the queue
+    slots = asyncio.Semaphore(pipeline_pool.workers)
+
+    async def process(document) -> Dict:
+        record = {"index": document.index, "filename": document.filename}
+        if not document.filename.lower().endswith(".pdf"):
+            return {**record, "ok": False, "error": "Only PDF files are accepted"}
+        if document.size is not None and document.size > max_file_size:
+            return {**record, "ok": False, "error": f"File too large. Max size is {max_file_size / (1024*1024):.0f}MB"}
+
+        async with slots:
+            started = time.time()
+            try:
+                path, content_hash, size = await loop.run_in_executor(None, _spool_document, document.open)
+                upload_bytes.observe(size)
+            except UploadTooLarge as e:
+                return {**record, "ok": False, "error": str(e)}
+            except Exception as e:
+                logger.warning(f"[{request_id}] Could not read batch document {document.filename}: {e}")
+                return {**record, "ok": False, "error": "Failed to read document"}
+            try:
+                while True:
+                    try:
+                        await _wait_for_quota(client)
+                        tree, cache_status = await _cached_pipeline(
+                            path, content_hash, document.filename, page_numbers, page_selection, "/extract/batch",
+                            client=client,
+                        )
+                        break
+                    except (PoolSaturated, AdmissionRejected):
+                        await asyncio.sleep(1)  # other requests hold the queue; wait for a free slot
+            except Exception as e:
+                logger.warning(f"[{request_id}] Batch document {document.filename} failed: {e}")
+                documents_total.inc(endpoint="/extract/batch", outcome="error")
+                return {**record, "ok": False, "error": "Error processing PDF"}
+            finally:
+                os.remove(path)
+        request_seconds.observe(time.time() - started, endpoint="/extract/batch")
+        documents_total.inc(endpoint="/extract/batch", outcome="ok")
+        return {
+            **record,
+            "ok": True,
+            "cache": cache_status,
+            "duration_sec": round(time.time() - started, 2),
+            "hierarchy": tree,
+        }
+
+    async def results():
+        tasks = [asyncio.ensure_future(process(document)) for document in documents]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                failed += not result["ok"]
+                yield dumps(result) + b"\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+        elapsed = time.time() - t0
+        logger.info(f"[{request_id}] Batch finished in {elapsed:.2f}s: {len(documents)} documents, {failed} failed")
+        yield dumps({
+            "done": True,
+            "documents": len(documents),
+            "failed": failed,
+            "duration_sec": round(elapsed, 2),
+        }) + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/results/{content_hash}")
+async def get_result_by_hash(
+    request: Request,
+    content_hash: str,
+    pages: Optional[str] = None,
+    filename: Optional[str] = None,
+):
+    """
+    Looks up a stored hierarchy by the SHA-256 of the PDF, without uploading it.
+
+    Clients hash the file locally and ask here first; on 404 they upload it to
+    /extract as usual (which stores the result for the next lookup). `pages`
+    must match the selection of that upload; `filename` becomes the
+    hierarchy's `source_file` (default: the name it was first uploaded under).
+
+    The response has the same shape and `ETag` as /extract; a matching
+    `If-None-Match` gets 304.
+    """
+    t0 = time.time()
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    content_hash = content_hash.lower()
+    if not SHA256_PATTERN.match(content_hash):
+        raise HTTPException(status_code=400, detail="content_hash must be a hex SHA-256 digest")
+
+    page_numbers = _validate_pages(pages, request_id)
+    page_selection = pages if page_numbers is not None else None
+
+    cache_key = result_cache_key(content_hash, page_numbers)
+    tree = await asyncio.get_running_loop().run_in_executor(None, result_cache.get, cache_key)
+    if tree is None:
+        logger.info(f"[{request_id}] No stored result for {content_hash[:12]}")
+        raise HTTPException(status_code=404, detail="No stored result for this file. Upload it to /extract.")
+
+    source_file = filename or tree["metadata"]["source_file"]
+    etag = result_etag(cache_key, source_file, page_selection)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    logger.info(f"[{request_id}] Served stored result for {content_hash[:12]} without upload")
+    return _json_response(
+        content={"ok": True, "hierarchy": with_upload_metadata(tree, source_file, page_selection)},
+        headers={"ETag": etag, "X-Cache": "HIT", "Server-Timing": _server_timing(time.time() - t0)},
+    )
+
+
+def _job_store() -> JobStore:
+    """The job store, or 503 if asynchronous jobs are not configured."""
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Asynchronous jobs are not enabled (set DOCTREE_JOB_DIR)")
+    return job_store
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    request: Request,
+    file: UploadFile = File(...),
+    pages: Optional[str] = None,
+):
+    """
+    Queues a PDF for extraction and returns immediately with a job id.
+
+    Poll `GET /jobs/{job_id}` for status and progress, then fetch the
+    hierarchy from `GET /jobs/{job_id}/result`. Jobs are stored in SQLite
+    and survive server restarts. Rate limited like /extract; the job's
+    estimated pages are charged when it is queued.
+    """
+    store = _job_store()
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    filename, page_numbers = _validate_upload(file, pages, request_id)
+    client = await _rate_limit(request)
+
+    upload_dir = os.path.join(os.path.dirname(store.db_path), "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    pdf_path, content_hash = await _save_upload(file, request_id, directory=upload_dir)
+    await _charge(client, await _document_cost(pdf_path, page_numbers))
+
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(None, functools.partial(
+        store.create,
+        filename,
+        pdf_path,
+        pages=page_numbers,
+        page_selection=pages if page_numbers is not None else None,
+        content_hash=content_hash,
+    ))
+    job_runner.notify()
+    logger.info(f"[{request_id}] Queued job {job_id} for {filename}")
+    job = await loop.run_in_executor(None, store.get, job_id)
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "status_url": f"/jobs/{job_id}",
+        "result_url": f"/jobs/{job_id}/result",
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Returns a job's status ("queued", "running", "done", "failed") and progress (0-1)."""
+    store = _job_store()
+    job = await asyncio.get_running_loop().run_in_executor(None, store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "filename": job["filename"],
+        "page_selection": job["page_selection"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Returns a finished job's hierarchy in the same shape as /extract (409 until it is done)."""
+    store = _job_store()
+    loop = asyncio.get_running_loop()
+    job = await loop.run_in_executor(None, store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != STATUS_DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {
+        "ok": True,
+        "duration_sec": round(job["finished_at"] - job["started_at"], 2),
+        "hierarchy": await loop.run_in_executor(None, store.get_result, job_id),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
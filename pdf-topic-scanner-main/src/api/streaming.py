@@ -0,0 +1,54 @@
+"""Server-Sent Events plumbing for streaming extraction.
+
+The pipeline runs in a worker process (see worker_pool.PipelinePool) and
+pushes its events onto a manager queue via stream_pipeline_to_queue; the
+request handler drains that queue and forwards each event to the client
+as an SSE message.
+
+The handler polls the queue instead of blocking on it: if the worker
+process dies (OOM kill, segfault) its end-of-stream None never arrives,
+and the handler must notice from the failed call instead.
+"""
+
+from queue import Empty
+from typing import Any, Dict
+
+from src.pipeline import PipelineCancelled, stream_pipeline
+from src.serialization import dumps
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_POLL_SEC = 1.0  # how often a waiting stream checks whether its worker call has ended
+NO_ITEM = object()  # poll_queue result when nothing arrived in time
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Formats one Server-Sent Events message (compact JSON on a single data line)."""
+    payload = dumps(data).decode("utf-8")
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def stream_pipeline_to_queue(queue: Any, pdf_path: str, **kwargs: Any) -> None:
+    """Worker entry point: runs stream_pipeline, putting (event, data) tuples on `queue`.
+
+    Failures become a final ("error", {...}) event; None always marks the end.
+    PipelineCancelled is re-raised, so the caller learns the CPU time it cost.
+    """
+    try:
+        stream_pipeline(pdf_path, lambda event, data: queue.put((event, data)), **kwargs)
+    except PipelineCancelled:
+        raise
+    except Exception as e:
+        logger.error(f"Streaming extraction failed for {pdf_path}: {e}")
+        queue.put(("error", {"detail": "Error processing PDF. Please try again."}))
+    finally:
+        queue.put(None)
+
+
+def poll_queue(queue: Any, timeout: float = QUEUE_POLL_SEC) -> Any:
+    """Returns the next queue item, or NO_ITEM if none arrives within `timeout` seconds."""
+    try:
+        return queue.get(timeout=timeout)
+    except Empty:
+        return NO_ITEM
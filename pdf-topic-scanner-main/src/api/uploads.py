@@ -0,0 +1,172 @@
+"""Upload handling with constant memory per request.
+
+Two layers keep large uploads under control:
+
+- MaxBodySizeMiddleware counts request body bytes as they arrive and answers
+  413 as soon as the limit is crossed. Unlike a Content-Length check, this
+  also catches chunked uploads that send no length up front, and it stops
+  reading the body instead of waiting for all of it.
+- spool_upload copies an UploadFile to a spool file in fixed-size chunks,
+  hashing as it goes, so neither the upload nor a second copy of it is ever
+  held in memory. The SHA-256 it returns is the parse cache's content hash,
+  so the file does not need to be read again to look up cached results.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from fastapi import UploadFile
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.cache import HASH_CHUNK_SIZE
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured byte limit."""
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"File too large. Max size is {max_bytes / (1024*1024):.0f}MB"
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int,
+    directory: Optional[str] = None,
+    chunk_size: int = HASH_CHUNK_SIZE,
+) -> Tuple[str, str, int]:
+    """Streams an upload to a new .pdf spool file.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        max_bytes (int): Size limit; enforced while copying.
+        directory (str, optional): Where to create the spool file (default: system temp).
+        chunk_size (int): Bytes read and written at a time.
+    Returns:
+        Tuple[str, str, int]: (spool file path, hex SHA-256 of the content, size in bytes).
+    Raises:
+        UploadTooLarge: if the upload exceeds max_bytes (the partial file is removed).
+        OSError: if the upload cannot be read or written (the partial file is removed).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=directory) as spool:
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(_too_large_detail(max_bytes))
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            os.remove(spool.name)
+            raise
+    return spool.name, digest.hexdigest(), size
+
+
+def spool_file(
+    source: BinaryIO,
+    max_bytes: int,
+    directory: Optional[str] = None,
+    chunk_size: int = HASH_CHUNK_SIZE,
+) -> Tuple[str, str, int]:
+    """Blocking spool_upload for a readable binary file (e.g. a zip archive member).
+
+    Returns and raises as spool_upload; run it off the event loop.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=directory) as spool:
+        try:
+            for chunk in iter(lambda: source.read(chunk_size), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(_too_large_detail(max_bytes))
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            os.remove(spool.name)
+            raise
+    return spool.name, digest.hexdigest(), size
+
+
+class MaxBodySizeMiddleware:
+    """ASGI middleware that rejects POST bodies larger than `max_bytes` with 413.
+
+    `path_limits` overrides the limit for specific paths, e.g. a batch
+    endpoint whose body holds many documents, each checked by the handler.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = dict(path_limits or {})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                if int(content_length) > max_bytes:
+                    logger.warning(
+                        f"Upload rejected: file size {int(content_length) / (1024*1024):.1f}MB "
+                        f"exceeds limit {max_bytes / (1024*1024):.0f}MB"
+                    )
+                    await self._send_413(send, max_bytes)
+                    return
+            except ValueError:
+                logger.error("Invalid Content-Length header")
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge(_too_large_detail(max_bytes))
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                return  # the app's reaction to the aborted body is replaced by our 413
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            logger.warning(f"Upload rejected mid-stream after {received / (1024*1024):.1f}MB")
+            await self._send_413(send, max_bytes)
+
+    async def _send_413(self, send: Send, max_bytes: int) -> None:
+        body = ('{"detail":"' + _too_large_detail(max_bytes) + '"}').encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,70 @@
+"""Warm-up for pipeline worker processes.
+
+A freshly spawned worker pays for importing pdfplumber/pdfminer, numpy and
+the pipeline, and its first document also fills pdfminer's font and
+encoding caches. warm_up_worker runs as the pool's process initializer, so
+a worker does all of that on a tiny built-in PDF before it accepts its
+first real call.
+"""
+
+import os
+import tempfile
+import time
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# One page: a heading and a body line, so every pipeline stage has work to do
+_WARMUP_CONTENT = (
+    b"BT /F1 18 Tf 72 720 Td (1. Introduction) Tj ET\n"
+    b"BT /F1 11 Tf 72 690 Td (This page warms up a pipeline worker process.) Tj ET\n"
+    b"BT /F1 11 Tf 72 676 Td (It is parsed once when the worker starts.) Tj ET\n"
+)
+
+
+def warmup_pdf_bytes() -> bytes:
+    """Returns a minimal valid one-page PDF with standard-font text."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%sendstream" % (len(_WARMUP_CONTENT), _WARMUP_CONTENT),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        pdf += b"%010d 00000 n \n" % offset
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+def warm_up_worker() -> None:
+    """Imports the pipeline and runs it once on warmup_pdf_bytes() (process pool initializer).
+
+    Never raises: a worker whose warm-up failed still serves, just cold.
+    """
+    t0 = time.perf_counter()
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="doctree-warmup-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(warmup_pdf_bytes())
+        from src.pipeline import run_pipeline
+
+        run_pipeline(path, source_file="warmup.pdf", cache_dir=None)
+    except Exception as e:
+        logger.warning(f"Worker {os.getpid()} warm-up failed: {e}")
+        return
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    logger.debug(f"Worker {os.getpid()} warmed up in {time.perf_counter() - t0:.2f}s")
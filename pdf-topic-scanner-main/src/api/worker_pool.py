@@ -0,0 +1,258 @@
+"""Bounded process pool for running CPU-bound pipeline work from async handlers.
+
+Parsing a PDF holds the CPU for seconds; doing it on the uvicorn event loop
+stalls every other request, /health included. PipelinePool runs such calls
+in worker processes and lets the handler await the result.
+
+Admission is bounded: at most `workers` calls run and at most `max_queue`
+more wait for a free worker. Anything beyond that is refused immediately
+with PoolSaturated, which the API turns into 503 + Retry-After, instead of
+piling up uploads on disk and in memory.
+
+Workers are kept warm and healthy:
+- `initializer` (e.g. warm_up_worker) runs in every worker before its first
+  call, and warm_up() starts all workers at once and sets `ready` when they
+  have finished it, so the API can report readiness only after warm-up
+  (and not at all if warm-up failed).
+- A worker is replaced after `max_calls_per_worker` calls.
+- If a worker grows past `max_worker_rss_bytes`, the whole set of workers
+  is retired, because ProcessPoolExecutor cannot retire a single worker.
+  New calls go to a fresh set of warmed workers. The retired workers finish
+  every call already given to them and then exit, so no in-flight work is
+  dropped.
+`recycled` counts replaced workers by reason ("calls" or "memory").
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.managers import SyncManager
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional
+
+from src.api.metrics import process_rss_bytes
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WARMUP_TIMEOUT_SEC = 120  # how long warm_up() waits for the slowest worker
+
+
+def _worker_started(barrier: Any) -> int:
+    """Runs in a worker after its initializer; returns once every worker got this far."""
+    barrier.wait(WARMUP_TIMEOUT_SEC)
+    return os.getpid()
+
+
+def _noop() -> None:
+    """Submitted to start a worker process (and run its initializer) ahead of real calls."""
+
+
+def _init_worker(started: Any, initializer: Optional[Callable[[], None]]) -> None:
+    """Worker initializer: counts the worker in `started`, then runs the pool's own initializer."""
+    with started.get_lock():
+        started.value += 1
+    if initializer is not None:
+        initializer()
+
+
+def _executor_processes(executor: ProcessPoolExecutor) -> List[multiprocessing.Process]:
+    # ProcessPoolExecutor has no public list of its workers; without one only the PID-based features degrade
+    return list((getattr(executor, "_processes", None) or {}).values())
+
+
+class PoolSaturated(Exception):
+    """Raised when all workers are busy and the wait queue is full."""
+
+
+class PipelinePool:
+    """Process pool with a bounded number of running plus queued calls."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        initializer: Optional[Callable[[], None]] = None,
+        max_calls_per_worker: Optional[int] = None,
+        max_worker_rss_bytes: Optional[int] = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.initializer = initializer
+        self.max_calls_per_worker = max_calls_per_worker or None  # 0: never recycle
+        self.max_worker_rss_bytes = max_worker_rss_bytes or None
+        self.in_flight = 0  # running + queued; only touched from the event loop
+        self.ready = False  # set by warm_up()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._started: Any = None  # shared count of workers the current executor has started
+        self._recycled: Dict[str, int] = {"calls": 0, "memory": 0}  # by executors no longer in use
+        self._manager: Optional[SyncManager] = None
+        self._retiring: List[multiprocessing.Process] = []  # workers of retired sets, until they exit
+        self._lock = threading.Lock()  # guards the executor swap (calls come from the loop and from threads)
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    @property
+    def recycled(self) -> Dict[str, int]:
+        """Workers replaced so far, by reason ("calls" or "memory")."""
+        return {**self._recycled, "calls": self._recycled["calls"] + self._replaced_after_max_calls()}
+
+    def _replaced_after_max_calls(self) -> int:
+        # Workers only exit on their own after max_tasks_per_child calls (a crash
+        # breaks the whole executor instead), so every start beyond the first
+        # `workers` replaced a worker that reached its call limit
+        started = self._started
+        return max(0, started.value - self.workers) if started is not None else 0
+
+    def _drop_executor(self) -> None:
+        """Forgets the current executor, keeping its replacement count. Call with the lock held."""
+        self._recycled["calls"] += self._replaced_after_max_calls()
+        self._executor = None
+        self._started = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is unsafe
+                context = multiprocessing.get_context("spawn")
+                self._started = context.Value("i", 0)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._started, self.initializer),
+                    max_tasks_per_child=self.max_calls_per_worker,
+                )
+            return self._executor
+
+    def _processes(self) -> List[multiprocessing.Process]:
+        executor = self._executor
+        processes = _executor_processes(executor) if executor is not None else []
+        self._retiring = [process for process in self._retiring if process.is_alive()]
+        return processes + self._retiring
+
+    def worker_pids(self) -> List[int]:
+        """PIDs of the live worker processes, including retired ones still finishing calls (none before the first call)."""
+        return [process.pid for process in self._processes() if process.is_alive()]
+
+    async def warm_up(self) -> None:
+        """Starts all workers now, waits until each has run `initializer`, and sets `ready`."""
+        loop = asyncio.get_running_loop()
+        barrier = await loop.run_in_executor(None, lambda: self._get_manager().Barrier(self.workers))
+        executor = self._get_executor()
+        try:
+            # Each call blocks at the barrier, so every worker takes exactly one
+            await asyncio.gather(*[
+                loop.run_in_executor(executor, _worker_started, barrier) for _ in range(self.workers)
+            ])
+        except asyncio.CancelledError:
+            await loop.run_in_executor(None, barrier.abort)
+            raise
+        except Exception as e:
+            logger.error(f"Worker warm-up failed; pool stays not ready: {e}")
+            return
+        self.ready = True
+        logger.info(f"Pipeline pool ready: {self.workers} warm worker(s)")
+
+    def _retire_if_bloated(self) -> None:
+        """Swaps in a fresh set of workers if one has grown past max_worker_rss_bytes."""
+        executor = self._executor
+        if self.max_worker_rss_bytes is None or executor is None:
+            return
+        for process in _executor_processes(executor):
+            rss = process_rss_bytes(process.pid)
+            if rss is not None and rss > self.max_worker_rss_bytes:
+                break
+        else:
+            return
+        logger.info(
+            f"Pipeline worker {process.pid} uses {rss / (1024 * 1024):.0f}MB "
+            f"(limit {self.max_worker_rss_bytes / (1024 * 1024):.0f}MB); recycling workers"
+        )
+        with self._lock:
+            if self._executor is not executor:
+                return
+            retired = _executor_processes(executor)
+            self._retiring.extend(retired)
+            self._drop_executor()
+            self._recycled["memory"] += len(retired)
+        # Without cancel_futures, calls already queued on the old set still run there
+        executor.shutdown(wait=False)
+        fresh = self._get_executor()
+        for _ in range(self.workers):
+            fresh.submit(_noop)  # start and warm the new workers before real calls arrive
+
+    def _get_manager(self) -> SyncManager:
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    def make_queue(self) -> Queue:
+        """Returns a queue that worker calls can put results on while they run (e.g. progress events)."""
+        return self._get_manager().Queue()
+
+    def make_event(self) -> Any:
+        """Returns an Event shared with the workers (e.g. a cancel flag for a running call)."""
+        return self._get_manager().Event()
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> "asyncio.Future":
+        """Admits fn(*args, **kwargs) right away and returns a future for its result.
+
+        Admission happens synchronously, so a caller can still answer 503
+        before it starts responding (e.g. before opening an event stream).
+
+        Raises:
+            PoolSaturated: if `capacity` calls are already running or queued.
+        """
+        if self.in_flight >= self.capacity:
+            raise PoolSaturated(f"{self.in_flight} pipeline calls in flight (capacity {self.capacity})")
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        try:
+            future = loop.run_in_executor(self._get_executor(), call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed) since the last call; start a fresh pool
+            logger.error("Pipeline worker process died; restarting pool")
+            self.shutdown(wait=False)
+            future = loop.run_in_executor(self._get_executor(), call)
+        self.in_flight += 1
+        future.add_done_callback(self._call_done)
+        return future
+
+    def _call_done(self, future: "asyncio.Future") -> None:
+        self.in_flight -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            logger.error("Pipeline worker process died; restarting pool")
+            self.shutdown(wait=False)
+            return
+        self._retire_if_bloated()
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Runs fn(*args, **kwargs) in a worker process and returns its result.
+
+        Raises:
+            PoolSaturated: if `capacity` calls are already running or queued.
+            Exception: whatever fn raised in the worker.
+        """
+        return await self.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor = self._executor
+            self._drop_executor()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if wait and self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
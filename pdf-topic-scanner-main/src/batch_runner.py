@@ -0,0 +1,288 @@
+"""Batch extraction of many PDFs from the CLI, with a resumable manifest.
+
+`python main.py DIR_OR_GLOB ...` expands its inputs to PDF files and runs
+the pipeline on them across a process pool. Each worker imports the
+pipeline once and then takes document after document. Outputs mirror the
+input tree under the output directory (a/b/c.pdf -> OUT/a/b/c.json), so
+equal file names in different folders never collide.
+
+With `blocks=True` each document's classified blocks are also exported as
+memory-mappable columns next to its JSON (OUT/a/b/c.blocks, see
+src.core.block_export).
+
+Every finished document appends one JSON line to the manifest (default
+OUT/manifest.jsonl): path, size, mtime, sha256, status ("ok" or "failed"),
+pages, blocks, seconds, per-stage timings, output path(s), the options that
+shape the outputs (page selection, backend, pretty, blocks) and error. A
+rerun of the same command reads the manifest and skips documents whose last
+record is "ok" for the same size, mtime and options and whose output still
+exists, so an interrupted backfill resumes where it stopped. Failed
+documents, and documents extracted with other options, are redone.
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from src.config import PARSE_CACHE_DIR
+from src.core.backends import DEFAULT_BACKEND
+from src.core.block_export import EXPORT_SUFFIX
+from src.serialization import write_json
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+MANIFEST_NAME = "manifest.jsonl"
+SUBMIT_AHEAD = 2  # documents queued per worker; keeps memory flat on huge runs
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Expands files, directories (searched recursively) and glob patterns to sorted, unique PDF paths.
+
+    Raises:
+        FileNotFoundError: if an input is neither an existing path nor a glob with matches.
+    """
+    found: Set[str] = set()
+    for spec in inputs:
+        if os.path.isdir(spec):
+            for root, _, files in os.walk(spec):
+                found.update(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+        elif os.path.isfile(spec):
+            found.add(spec)
+        else:
+            matches = glob.glob(spec, recursive=True)
+            if not matches:
+                raise FileNotFoundError(f"No files match {spec}")
+            for match in matches:
+                if os.path.isdir(match):
+                    found.update(expand_inputs([match]))
+                elif match.lower().endswith(".pdf"):
+                    found.add(match)
+    return sorted(os.path.normpath(path) for path in found)
+
+
+def output_paths(pdf_paths: List[str], out_dir: str) -> Dict[str, str]:
+    """Maps each PDF to OUT_DIR/<path relative to the inputs' common folder>.json."""
+    if not pdf_paths:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in pdf_paths])
+    return {
+        path: os.path.join(out_dir, os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0] + ".json")
+        for path in pdf_paths
+    }
+
+
+def read_manifest(manifest_path: str) -> Dict[str, Dict]:
+    """Returns the last record per path; a truncated last line (interrupted write) is ignored."""
+    records: Dict[str, Dict] = {}
+    if not os.path.exists(manifest_path):
+        return records
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["path"]] = record
+    return records
+
+
+def blocks_path(out_path: str) -> str:
+    """Block export directory for a JSON output path (OUT/a/b/c.json -> OUT/a/b/c.blocks)."""
+    return os.path.splitext(out_path)[0] + EXPORT_SUFFIX
+
+
+def _page_ranges(pages: List[int]) -> str:
+    """Compact form of a page list for the manifest ([1, 2, 3, 7] -> "1-3,7")."""
+    ranges: List[List[int]] = []
+    for page in sorted(set(pages)):
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def run_options(
+    pages: Optional[List[int]] = None,
+    page_selection: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    pretty: bool = True,
+    blocks: bool = False,
+) -> Dict:
+    """The settings that shape a document's outputs, as stored in its manifest record."""
+    return {
+        "pages": _page_ranges(pages) if pages is not None else None,
+        "page_selection": page_selection,
+        "backend": backend,
+        "pretty": pretty,
+        "blocks": blocks,
+    }
+
+
+def is_done(record: Optional[Dict], pdf_path: str, options: Dict) -> bool:
+    """True if `record` shows `pdf_path`, unchanged since, was extracted with `options` and its output(s) still exist."""
+    if record is None or record.get("status") != STATUS_OK or record.get("options") != options:
+        return False
+    try:
+        stat = os.stat(pdf_path)
+    except OSError:
+        return False
+    return (
+        record.get("size") == stat.st_size
+        and record.get("mtime_ns") == stat.st_mtime_ns
+        and os.path.exists(record.get("output", ""))
+        and (not options["blocks"] or os.path.exists(record.get("blocks_output", "")))
+    )
+
+
+def process_document(
+    pdf_path: str,
+    out_path: str,
+    pages: Optional[List[int]] = None,
+    page_selection: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    cache_dir: Optional[str] = PARSE_CACHE_DIR,
+    pretty: bool = True,
+    blocks: bool = False,
+) -> Dict:
+    """Runs the pipeline on one PDF and writes its JSON (runs in a worker); returns its manifest record.
+
+    Never raises for a bad document: failures come back as a "failed" record.
+    """
+    from src.core.cache import file_sha256
+    from src.pipeline import run_pipeline_timed
+
+    t0 = time.perf_counter()
+    record = {
+        "path": pdf_path,
+        "size": None,
+        "mtime_ns": None,
+        "output": out_path,
+        "options": run_options(pages, page_selection, backend, pretty, blocks),
+    }
+    if blocks:
+        record["blocks_output"] = blocks_path(out_path)
+    try:
+        stat = os.stat(pdf_path)  # the file may have gone away since expand_inputs
+        record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        content_hash = file_sha256(pdf_path)
+        record["sha256"] = content_hash
+        tree, timings = run_pipeline_timed(
+            pdf_path,
+            source_file=pdf_path,
+            pages=pages,
+            page_selection=page_selection,
+            backend=backend,
+            cache_dir=cache_dir,
+            content_hash=content_hash,
+            blocks_out=record.get("blocks_output"),
+        )
+        out_dir = os.path.dirname(out_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        # Write-then-rename, so an interrupted run never leaves a truncated output behind
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        write_json(tree, tmp_path, stream=("sections",), pretty=pretty)
+        os.replace(tmp_path, out_path)
+    except Exception as e:
+        record.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}")
+    else:
+        record.update(
+            status=STATUS_OK,
+            pages=tree["metadata"]["total_pages"],
+            blocks=tree["metadata"]["total_blocks"],
+            timings={stage: round(seconds, 4) for stage, seconds in timings.items()},
+        )
+    record["seconds"] = round(time.perf_counter() - t0, 3)
+    record["finished_at"] = time.time()
+    return record
+
+
+def _new_executor(workers: int) -> ProcessPoolExecutor:
+    # spawn: workers start clean and import the pipeline once each
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_batch(
+    pdf_paths: List[str],
+    out_dir: str,
+    manifest_path: Optional[str] = None,
+    workers: int = 1,
+    pages: Optional[List[int]] = None,
+    page_selection: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    cache_dir: Optional[str] = PARSE_CACHE_DIR,
+    pretty: bool = True,
+    blocks: bool = False,
+    on_record: Optional[Callable[[Dict], None]] = None,
+) -> Dict[str, int]:
+    """Extracts every PDF not already done according to the manifest, `workers` documents at a time.
+
+    Each finished document is appended to the manifest right away and passed
+    to `on_record`. A worker crash breaks the whole process pool: every
+    document submitted to it but not yet finished (at most SUBMIT_AHEAD per
+    worker) is recorded as failed and retried on the next run, and the
+    remaining documents continue on fresh workers.
+    Returns counts: {"total", "skipped", "ok", "failed"}.
+    """
+    manifest_path = manifest_path or os.path.join(out_dir, MANIFEST_NAME)
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+    previous = read_manifest(manifest_path)
+    outputs = output_paths(pdf_paths, out_dir)
+    options = run_options(pages, page_selection, backend, pretty, blocks)
+    todo = [path for path in pdf_paths if not is_done(previous.get(path), path, options)]
+    counts = {"total": len(pdf_paths), "skipped": len(pdf_paths) - len(todo), STATUS_OK: 0, STATUS_FAILED: 0}
+    if not todo:
+        return counts
+
+    workers = max(1, min(workers, len(todo)))
+    submitted: Dict[Future, str] = {}
+    remaining = iter(todo)
+    executor = _new_executor(workers)
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        try:
+            while True:
+                for path in remaining:
+                    args = (path, outputs[path], pages, page_selection, backend, cache_dir, pretty, blocks)
+                    try:
+                        future = executor.submit(process_document, *args)
+                    except BrokenProcessPool:
+                        # A worker died (e.g. OOM-killed); carry on with fresh workers
+                        executor.shutdown(wait=False)
+                        executor = _new_executor(workers)
+                        future = executor.submit(process_document, *args)
+                    submitted[future] = path
+                    if len(submitted) >= workers * SUBMIT_AHEAD:
+                        break
+                if not submitted:
+                    break
+                done, _ = wait(submitted, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = submitted.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        # A dead worker fails every document it broke the pool for; reruns retry them
+                        record = {
+                            "path": path,
+                            "status": STATUS_FAILED,
+                            "error": f"{type(e).__name__}: {e}",
+                            "finished_at": time.time(),
+                        }
+                    manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    manifest.flush()
+                    counts[record["status"]] += 1
+                    if on_record is not None:
+                        on_record(record)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    executor.shutdown()
+    return counts
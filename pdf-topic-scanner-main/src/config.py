@@ -1,5 +1,8 @@
 """Global configuration and constants for pdf-topic-scanner."""
 
+import os
+import tempfile
+
 # Heading score thresholds for classification (IMPROVED - lowered for better detection)
 HEADING_SCORE_THRESHOLDS = {
     "H1": 0.75,   # Slightly lowered from 0.8
@@ -12,6 +15,43 @@ HEADING_SCORE_THRESHOLDS = {
 Y_TOLERANCE = 5  # units for grouping words into lines
 PAGE_WIDTH = 612  # standard US Letter width in points
 
+# Parse cache (src/core/cache.py); caching is off unless a directory is configured
+PARSE_CACHE_DIR = os.getenv("DOCTREE_PARSE_CACHE_DIR") or None
+PARSE_CACHE_MAX_BYTES = int(os.getenv("DOCTREE_PARSE_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Result cache (src/api/result_cache.py): finished hierarchies in memory and, if a directory is set, on disk
+RESULT_CACHE_DIR = os.getenv("DOCTREE_RESULT_CACHE_DIR") or None
+RESULT_CACHE_MEMORY_BYTES = int(os.getenv("DOCTREE_RESULT_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+RESULT_CACHE_MAX_BYTES = int(os.getenv("DOCTREE_RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# API worker pool (src/api/worker_pool.py)
+API_WORKERS = int(os.getenv("DOCTREE_API_WORKERS", "2"))  # pipeline processes
+API_MAX_QUEUE = int(os.getenv("DOCTREE_API_MAX_QUEUE", "8"))  # extractions waiting for a worker before 503
+API_RETRY_AFTER_SEC = int(os.getenv("DOCTREE_API_RETRY_AFTER_SEC", "10"))  # Retry-After sent with 503
+API_WORKER_MAX_DOCUMENTS = int(os.getenv("DOCTREE_API_WORKER_MAX_DOCUMENTS", "200"))  # then a worker is replaced (0: never)
+API_WORKER_MAX_RSS_MB = int(os.getenv("DOCTREE_API_WORKER_MAX_RSS_MB", "1536"))  # workers are recycled above this (0: never)
+
+# Cost-based admission (src/api/admission.py): estimated pages in flight at once
+API_PAGE_BUDGET = int(os.getenv("DOCTREE_API_PAGE_BUDGET", "2000"))
+API_MAX_WAITING = int(os.getenv("DOCTREE_API_MAX_WAITING", "32"))  # documents waiting for budget before 503
+API_MAX_BYPASS_SEC = float(os.getenv("DOCTREE_API_MAX_BYPASS_SEC", "30"))  # then smaller documents stop overtaking
+API_BYTES_PER_PAGE = int(os.getenv("DOCTREE_API_BYTES_PER_PAGE", str(256 * 1024)))  # size of one "typical page"
+
+# Rate limiting (src/api/rate_limit.py): per-client token buckets of pages, shared by all API processes
+# on the node through one SQLite file. A request needs RATE_LIMIT_REQUEST_COST tokens and then pays its pages.
+RATE_LIMIT_DB = os.getenv("DOCTREE_RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "doctree-rate-limit.sqlite3"))
+RATE_LIMIT_PAGES_PER_MIN = float(os.getenv("DOCTREE_RATE_LIMIT_PAGES_PER_MIN", "600"))  # refill rate
+RATE_LIMIT_BURST_PAGES = float(os.getenv("DOCTREE_RATE_LIMIT_BURST_PAGES", "1000"))  # bucket size
+RATE_LIMIT_REQUEST_COST = float(os.getenv("DOCTREE_RATE_LIMIT_REQUEST_COST", "5"))  # also charged on cache hits
+
+# Batch extraction (/extract/batch): files or zip members per request
+BATCH_MAX_DOCUMENTS = int(os.getenv("DOCTREE_BATCH_MAX_DOCUMENTS", "1000"))
+
+# Asynchronous jobs (src/api/jobs.py): job table and uploads waiting to be processed;
+# /jobs is off (503) unless a directory is configured
+JOB_DIR = os.getenv("DOCTREE_JOB_DIR") or None
+JOB_WORKERS = int(os.getenv("DOCTREE_JOB_WORKERS", "1"))
+
 # Feature engineering parameters
 MIN_HEADING_LENGTH = 3  # Minimum characters for heading
 MAX_HEADING_WORDS = 15  # Maximum words for heading (increased from 10)
@@ -0,0 +1,190 @@
+"""Extraction backends: turn PDF pages into pdfplumber-style word dicts.
+
+parse_pdf does its own line grouping and fragment merging, so a backend only
+has to produce, for every page, the list of words it found. A backend is a
+generator function with the signature
+
+    backend(pdf_path: str, pages: Optional[Iterable[int]]) -> Iterator[Tuple[int, List[Dict]]]
+
+yielding (page_number, words) in page order, where each word dict has the keys
+'text', 'fontname', 'size', 'x0', 'x1', 'top' and 'bottom' (top-left origin,
+PDF points), exactly like pdfplumber's page.extract_words(extra_attrs=[...]).
+Backends that read glyphs themselves should instead yield WordColumns (the
+same fields as one list/array per key), which parse_pdf consumes without any
+per-word dict handling.
+
+Available backends:
+- "pdfplumber": the reference implementation (pure-Python pdfminer).
+- "pdfium": PDFium via pypdfium2, an order of magnitude faster. Font names
+  come from the font's BaseFont entry, so fonts that only name themselves in
+  their font descriptor report an empty font_family.
+
+Extraction libraries (and numpy) are imported by the functions that use
+them, so importing this module, e.g. for BACKENDS in a CLI's --help, stays cheap.
+"""
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_BACKEND = "pdfplumber"
+WORD_ATTRS = ["fontname", "size", "x0", "x1", "top", "bottom"]
+NUMERIC_WORD_KEYS = ("top", "x0", "x1", "bottom", "size")
+
+# Page words in columnar form: 'text' and 'fontname' are lists of str, the
+# NUMERIC_WORD_KEYS are float64 arrays, all of the same length.
+WordColumns = Dict[str, Union[List[str], "np.ndarray"]]
+
+
+def words_to_columns(words: List[Dict]) -> WordColumns:
+    """Converts a list of word dicts into WordColumns."""
+    import numpy as np
+
+    n = len(words)
+    cols: WordColumns = {
+        key: np.fromiter(map(itemgetter(key), words), dtype=np.float64, count=n)
+        for key in NUMERIC_WORD_KEYS
+    }
+    cols["text"] = list(map(itemgetter("text"), words))
+    cols["fontname"] = list(map(itemgetter("fontname"), words))
+    return cols
+
+
+def _iter_pages(pdf, pages: Optional[Iterable[int]] = None) -> Iterator:
+    """Yields pdfplumber pages one at a time, releasing each after use.
+
+    Pages are built lazily from the pdfminer page tree instead of through
+    `pdf.pages`, which would keep a Page object for every page alive until the
+    PDF is closed. Once the consumer is done with a page its cached layout
+    objects are flushed, and the document-level object cache is dropped so
+    decoded content streams do not accumulate across pages.
+
+    When `pages` is given, unselected pages are never laid out and iteration
+    stops after the last selected page.
+    """
+    from pdfminer.pdfpage import PDFPage
+    from pdfplumber.page import Page
+
+    selected = set(pages) if pages is not None else None
+    last_page = max(selected) if selected else None
+    if selected is not None and not selected:
+        return
+
+    for page_num, page_obj in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+        if last_page is not None and page_num > last_page:
+            break
+        if selected is not None and page_num not in selected:
+            continue
+        page = Page(pdf, page_obj, page_number=page_num)
+        try:
+            yield page
+        finally:
+            page.close()
+            for cache in ("_cached_objs", "_parsed_objs"):
+                getattr(pdf.doc, cache, {}).clear()
+
+
+def pdfplumber_words(pdf_path: str, pages: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, List[Dict]]]:
+    """Reference backend: pdfplumber's extract_words, one page at a time."""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in _iter_pages(pdf, pages):
+            yield page.page_number, page.extract_words(extra_attrs=WORD_ATTRS)
+
+
+def pdfium_words(pdf_path: str, pages: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, WordColumns]]:
+    """Fast backend: reads the character stream from PDFium's text page.
+
+    With WORD_ATTRS pdfplumber splits a word wherever x0/x1 change, i.e. it
+    returns one word per glyph; this backend does the same directly and
+    yields the glyphs as WordColumns. Glyph
+    boxes follow pdfminer's convention (advance width horizontally, font
+    descent to descent + size vertically) so line grouping behaves alike.
+    """
+    import ctypes
+
+    import numpy as np
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    doc = pdfium.PdfDocument(pdf_path)
+    try:
+        total_pages = len(doc)
+        if pages is None:
+            page_numbers = range(1, total_pages + 1)
+        else:
+            page_numbers = sorted(p for p in set(pages) if 1 <= p <= total_pages)
+
+        loose = pdfium_c.FS_RECTF()
+        matrix = pdfium_c.FS_MATRIX()
+        origin_x, origin_y = ctypes.c_double(), ctypes.c_double()
+        descent = ctypes.c_float()
+        name_buf = ctypes.create_string_buffer(256)
+
+        for page_num in page_numbers:
+            page = doc[page_num - 1]
+            textpage = page.get_textpage()
+            try:
+                height = page.get_height()
+                fonts: Dict[int, Tuple[str, float]] = {}
+                cols = {key: [] for key in ("text", "fontname") + NUMERIC_WORD_KEYS}
+                tp = textpage.raw
+                for i in range(textpage.count_chars()):
+                    if pdfium_c.FPDFText_IsGenerated(tp, i):
+                        continue
+                    text = chr(pdfium_c.FPDFText_GetUnicode(tp, i))
+                    if not text.strip():
+                        continue
+
+                    pdfium_c.FPDFText_GetMatrix(tp, i, matrix)
+                    size = pdfium_c.FPDFText_GetFontSize(tp, i) * (matrix.c ** 2 + matrix.d ** 2) ** 0.5
+
+                    font = pdfium_c.FPDFTextObj_GetFont(pdfium_c.FPDFText_GetTextObject(tp, i))
+                    font_key = ctypes.cast(font, ctypes.c_void_p).value or 0
+                    if font_key not in fonts:
+                        pdfium_c.FPDFFont_GetBaseFontName(font, name_buf, len(name_buf))
+                        pdfium_c.FPDFFont_GetDescent(font, ctypes.c_float(1.0), descent)
+                        fonts[font_key] = (name_buf.value.decode("utf-8", "replace"), descent.value)
+                    fontname, unit_descent = fonts[font_key]
+
+                    pdfium_c.FPDFText_GetLooseCharBox(tp, i, loose)
+                    pdfium_c.FPDFText_GetCharOrigin(tp, i, origin_x, origin_y)
+                    bottom = height - origin_y.value - unit_descent * size
+                    cols["text"].append(text)
+                    cols["fontname"].append(fontname)
+                    cols["size"].append(size)
+                    cols["x0"].append(loose.left)
+                    cols["x1"].append(loose.right)
+                    cols["top"].append(bottom - size)
+                    cols["bottom"].append(bottom)
+            finally:
+                textpage.close()
+                page.close()
+            for key in NUMERIC_WORD_KEYS:
+                cols[key] = np.array(cols[key], dtype=np.float64)
+            yield page_num, cols
+    finally:
+        doc.close()
+
+
+PageWords = Iterator[Tuple[int, Union[List[Dict], WordColumns]]]
+
+BACKENDS: Dict[str, Callable[..., PageWords]] = {
+    "pdfplumber": pdfplumber_words,
+    "pdfium": pdfium_words,
+}
+
+
+def get_backend(name: str) -> Callable[..., PageWords]:
+    """Returns the backend generator registered under `name`.
+
+    Raises:
+        ValueError: if no backend with that name exists.
+    """
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
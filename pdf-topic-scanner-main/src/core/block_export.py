@@ -0,0 +1,197 @@
+"""Columnar export of classified blocks for analytics.
+
+The hierarchy JSON keeps only headings and section text; the per-block
+features, heading scores and bboxes computed on the way are dropped. An
+export writes the classified BlockTable to a directory instead, one
+uncompressed .npy file per column, so readers can memory-map it and scan
+millions of blocks without parsing JSON or re-parsing the PDF:
+
+    doc.blocks/
+        schema.json          format, version, row count, column dtypes and
+                             the string tables (fonts, numbering patterns,
+                             classification labels)
+        page.npy, font_size.npy, font_id.npy, is_bold.npy, is_italic.npy,
+        x0.npy, y0.npy, x1.npy, y1.npy
+        feat_<name>.npy      one per FEATURE_COLUMNS entry (font_family is
+                             font_id lowercased via the font table)
+        heading_score.npy, classification.npy
+        text_utf8.npy        all texts as one UTF-8 byte buffer (uint8)
+        text_offsets.npy     int64 byte offsets, rows + 1 entries
+
+String columns are stored as small integer codes into the tables in
+schema.json. Only NumPy is needed to read an export (np.load(..., mmap_mode="r"));
+open_blocks() does that and decodes texts and labels on demand.
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from src.core.block_table import BLOCK_COLUMNS, CLASSIFICATION_LABELS, NUMBERING_PATTERNS, BlockTable
+
+EXPORT_FORMAT = "doctree-blocks"
+EXPORT_VERSION = 1  # bump when the directory layout or a column's meaning changes
+SCHEMA_FILE = "schema.json"
+EXPORT_SUFFIX = ".blocks"
+
+
+# Outline headings come from bookmarks, not laid-out text, so they carry no font fields
+_NO_FONT = {"font_family": "", "font_size": 0.0, "is_bold": False, "is_italic": False}
+
+
+def as_block_table(blocks: Union[BlockTable, List[Dict]]) -> BlockTable:
+    """Returns `blocks` as a BlockTable; block dicts (e.g. outline blocks) keep their classification.
+
+    Blocks without font fields get an empty font name, size 0 and no bold/italic.
+    """
+    if isinstance(blocks, BlockTable):
+        return blocks
+    table = BlockTable.from_blocks(b if _NO_FONT.keys() <= b.keys() else {**_NO_FONT, **b} for b in blocks)
+    if blocks and all("classification" in b for b in blocks):
+        table.classification = np.array(
+            [CLASSIFICATION_LABELS.index(b["classification"]) for b in blocks], dtype=np.int8
+        )
+    if blocks and all("heading_score" in b for b in blocks):
+        table.heading_score = np.array([b["heading_score"] for b in blocks], dtype=np.float64)
+    return table
+
+
+def _utf8_texts(table: BlockTable):
+    encoded = [text.encode("utf-8") for text in table.texts()]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def export_blocks(
+    blocks: Union[BlockTable, List[Dict]],
+    out_dir: str,
+    source_file: Optional[str] = None,
+) -> str:
+    """Writes the (classified) blocks to `out_dir` as memory-mappable columns.
+
+    The directory is written next to its final location and renamed into
+    place, so readers never see a half-written export; an existing export
+    at `out_dir` is replaced.
+
+    Args:
+        blocks: Classified BlockTable, or block dicts as produced by the outline path.
+        out_dir (str): Export directory (conventionally "<name>.blocks").
+        source_file (str, optional): Recorded in schema.json.
+    Returns:
+        str: out_dir.
+    """
+    table = as_block_table(blocks)
+    arrays: Dict[str, np.ndarray] = dict(table.columns)
+    for name, col in table.features.items():
+        arrays[f"feat_{name}"] = col
+    if table.heading_score is not None:
+        arrays["heading_score"] = table.heading_score
+    if table.classification is not None:
+        arrays["classification"] = table.classification
+    arrays["text_utf8"], arrays["text_offsets"] = _utf8_texts(table)
+
+    schema = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "rows": len(table),
+        "source_file": source_file,
+        "columns": {name: col.dtype.str for name, col in arrays.items()},
+        "fonts": table.fonts,
+        "numbering_patterns": NUMBERING_PATTERNS,
+        "classification_labels": CLASSIFICATION_LABELS,
+    }
+
+    out_dir = os.path.normpath(out_dir)
+    parent = os.path.dirname(out_dir)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        for name, col in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(col), allow_pickle=False)
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+        if os.path.exists(out_dir):
+            shutil.rmtree(out_dir)
+        os.replace(tmp_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return out_dir
+
+
+class BlockColumns:
+    """Read-only view of an export; columns are memory-mapped, not loaded."""
+
+    def __init__(self, path: str, schema: Dict, columns: Dict[str, np.ndarray]):
+        self.path = path
+        self.schema = schema
+        self.columns = columns
+        self.fonts: List[str] = schema["fonts"]
+
+    def __len__(self) -> int:
+        return self.schema["rows"]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def text(self, i: int) -> str:
+        offsets = self.columns["text_offsets"]
+        return self.columns["text_utf8"][offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    def texts(self, rows=None) -> List[str]:
+        """Texts of the given row indices (default: all rows)."""
+        if rows is None:
+            rows = range(len(self))
+        return [self.text(i) for i in np.asarray(rows).tolist()]
+
+    def labels(self) -> List[str]:
+        """Classification label per row ("BODY" for all if the export was not classified)."""
+        if "classification" not in self.columns:
+            return ["BODY"] * len(self)
+        labels = self.schema["classification_labels"]
+        return [labels[c] for c in self.columns["classification"].tolist()]
+
+    def to_table(self) -> BlockTable:
+        """Loads the export into memory as a BlockTable (to_dicts() then gives the pipeline's block dicts)."""
+        texts = self.texts()
+        # BlockTable addresses its text buffer by character, not byte, offsets
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), out=offsets[1:])
+        table = BlockTable(
+            {name: np.array(self.columns[name]) for name in BLOCK_COLUMNS}, list(self.fonts), "".join(texts), offsets
+        )
+        table.features = {
+            name[len("feat_"):]: np.array(col) for name, col in self.columns.items() if name.startswith("feat_")
+        }
+        if "heading_score" in self.columns:
+            table.heading_score = np.array(self.columns["heading_score"])
+        if "classification" in self.columns:
+            table.classification = np.array(self.columns["classification"])
+        return table
+
+
+def open_blocks(path: str, mmap: bool = True) -> BlockColumns:
+    """Opens an export written by export_blocks().
+
+    Args:
+        path (str): Export directory.
+        mmap (bool): Memory-map the columns (default) instead of reading them.
+    Raises:
+        ValueError: if `path` is not an export of a version this code understands.
+    """
+    with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+        schema = json.load(f)
+    if schema.get("format") != EXPORT_FORMAT or schema.get("version") != EXPORT_VERSION:
+        raise ValueError(f"{path} is not a {EXPORT_FORMAT} v{EXPORT_VERSION} export")
+    mmap_mode = "r" if mmap else None
+    columns = {}
+    for name in schema["columns"]:
+        columns[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+    return BlockColumns(path, schema, columns)
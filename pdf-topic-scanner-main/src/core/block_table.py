@@ -0,0 +1,280 @@
+"""Columnar block storage.
+
+A document's line-level blocks are normally a list of dicts, each with a
+nested 'bbox' dict and, after feature engineering, a ~20-key 'features'
+dict. For large documents that per-block dict overhead dominates memory.
+
+BlockTable keeps the same information as a struct of arrays:
+- numeric fields (page, font_size, bbox, flags) as NumPy columns,
+- font_family as an index into an interned table of font names,
+- all texts in one string buffer addressed by offsets,
+- features, heading_score and classification as further columns, filled in
+  by feature_engineer.enrich_blocks_with_features, heading_classifier.
+  classify_headings and consumed by tree_builder.build_hierarchy.
+
+to_dicts() (or plain iteration) yields the familiar block dicts, identical to
+what the list-based pipeline produces, for code that still wants them.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+BLOCK_COLUMNS = {
+    "page": np.int32,
+    "font_size": np.float64,
+    "font_id": np.int32,
+    "is_bold": np.bool_,
+    "is_italic": np.bool_,
+    "x0": np.float64,
+    "y0": np.float64,
+    "x1": np.float64,
+    "y1": np.float64,
+}
+
+# Feature columns in the order enrich_blocks_with_features puts them in each
+# block's 'features' dict. font_family is not stored; it is derived from the
+# font table (lowercased).
+FEATURE_COLUMNS = {
+    "font_rank": np.int32,
+    "relative_size": np.float64,
+    "is_bold": np.bool_,
+    "is_italic": np.bool_,
+    "font_family": None,
+    "word_count": np.int32,
+    "char_count": np.int32,
+    "is_short": np.bool_,
+    "is_very_short": np.bool_,
+    "is_all_caps": np.bool_,
+    "is_title_case": np.bool_,
+    "uppercase_ratio": np.float64,
+    "has_numbering": np.bool_,
+    "numbering_pattern": np.int8,
+    "text_width_ratio": np.float64,
+    "is_left_aligned": np.bool_,
+    "is_centered": np.bool_,
+    "is_indented": np.bool_,
+    "indent_level": np.int32,
+    "left_margin": np.float64,
+}
+
+NUMBERING_PATTERNS = ["none", "multi_level", "numbered", "roman", "lettered"]
+CLASSIFICATION_LABELS = ["H1", "H2", "H3", "BODY"]
+
+
+class BlockTable:
+    """Struct-of-arrays store for line-level blocks (see module docstring)."""
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        fonts: List[str],
+        text_buffer: str,
+        text_offsets: np.ndarray,
+    ):
+        self.columns = columns
+        self.fonts = fonts
+        self.text_buffer = text_buffer
+        self.text_offsets = text_offsets
+        self.features: Dict[str, np.ndarray] = {}
+        self.heading_score: Optional[np.ndarray] = None
+        self.classification: Optional[np.ndarray] = None
+
+    # ---------- construction ----------
+
+    @classmethod
+    def from_page_lines(cls, pages: Iterable[Tuple[int, Dict]]) -> "BlockTable":
+        """Builds a table from (page_num, lines) pairs as produced by pdf_parser._page_lines."""
+        fonts: List[str] = []
+        font_index: Dict[str, int] = {}
+        texts: List[str] = []
+        chunks: Dict[str, List[np.ndarray]] = {name: [] for name in BLOCK_COLUMNS}
+
+        for page_num, lines in pages:
+            n = len(lines["text"])
+            if not n:
+                continue
+            font_ids = []
+            for name in lines["font_family"]:
+                if name not in font_index:
+                    font_index[name] = len(fonts)
+                    fonts.append(name)
+                font_ids.append(font_index[name])
+            lowered = [name.lower() for name in lines["font_family"]]
+
+            texts.extend(lines["text"])
+            chunks["page"].append(np.full(n, page_num, dtype=np.int32))
+            chunks["font_size"].append(np.asarray(lines["font_size"], dtype=np.float64))
+            chunks["font_id"].append(np.array(font_ids, dtype=np.int32))
+            chunks["is_bold"].append(np.array(["bold" in f for f in lowered], dtype=bool))
+            chunks["is_italic"].append(np.array(["italic" in f or "oblique" in f for f in lowered], dtype=bool))
+            for name in ("x0", "y0", "x1", "y1"):
+                chunks[name].append(np.asarray(lines[name], dtype=np.float64))
+
+        columns = {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+            for (name, dtype), parts in zip(BLOCK_COLUMNS.items(), chunks.values())
+        }
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(columns, fonts, "".join(texts), offsets)
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Dict]) -> "BlockTable":
+        """Builds a table from parser-style block dicts (text, page, font fields, bbox)."""
+        blocks = list(blocks)
+        fonts: List[str] = []
+        font_index: Dict[str, int] = {}
+        font_ids = []
+        for block in blocks:
+            name = block["font_family"]
+            if name not in font_index:
+                font_index[name] = len(fonts)
+                fonts.append(name)
+            font_ids.append(font_index[name])
+
+        columns = {
+            "page": np.array([b["page"] for b in blocks], dtype=np.int32),
+            "font_size": np.array([b["font_size"] for b in blocks], dtype=np.float64),
+            "font_id": np.array(font_ids, dtype=np.int32),
+            "is_bold": np.array([bool(b["is_bold"]) for b in blocks], dtype=bool),
+            "is_italic": np.array([bool(b["is_italic"]) for b in blocks], dtype=bool),
+        }
+        for name in ("x0", "y0", "x1", "y1"):
+            columns[name] = np.array([b["bbox"][name] for b in blocks], dtype=np.float64)
+
+        texts = [b["text"] for b in blocks]
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), out=offsets[1:])
+        return cls(columns, fonts, "".join(texts), offsets)
+
+    @classmethod
+    def concat(cls, tables: List["BlockTable"]) -> "BlockTable":
+        """Concatenates parser tables (e.g. from parallel workers) in the given order."""
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.from_page_lines([])
+
+        fonts: List[str] = []
+        font_index: Dict[str, int] = {}
+        font_ids = []
+        for table in tables:
+            remap = []
+            for name in table.fonts:
+                if name not in font_index:
+                    font_index[name] = len(fonts)
+                    fonts.append(name)
+                remap.append(font_index[name])
+            font_ids.append(np.array(remap, dtype=np.int32)[table.columns["font_id"]])
+
+        columns = {name: np.concatenate([t.columns[name] for t in tables]) for name in BLOCK_COLUMNS}
+        columns["font_id"] = np.concatenate(font_ids)
+        offsets = [tables[0].text_offsets]
+        for table in tables[1:]:
+            offsets.append(table.text_offsets[1:] + offsets[-1][-1])
+        return cls(columns, fonts, "".join(t.text_buffer for t in tables), np.concatenate(offsets))
+
+    # ---------- access ----------
+
+    def __len__(self) -> int:
+        return len(self.text_offsets) - 1
+
+    def text(self, i: int) -> str:
+        return self.text_buffer[self.text_offsets[i]:self.text_offsets[i + 1]]
+
+    def texts(self) -> List[str]:
+        offsets = self.text_offsets.tolist()
+        buf = self.text_buffer
+        return [buf[a:b] for a, b in zip(offsets, offsets[1:])]
+
+    def font_families(self) -> List[str]:
+        fonts = self.fonts
+        return [fonts[i] for i in self.columns["font_id"].tolist()]
+
+    def classifications(self) -> List[str]:
+        """Classification label per block ("BODY" for all if not classified yet)."""
+        if self.classification is None:
+            return ["BODY"] * len(self)
+        return [CLASSIFICATION_LABELS[c] for c in self.classification.tolist()]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_dicts())
+
+    def to_dicts(self) -> List[Dict]:
+        """Returns the blocks as dicts, exactly as the list-based pipeline would."""
+        n = len(self)
+        cols = {name: col.tolist() for name, col in self.columns.items()}
+        texts = self.texts()
+        families = self.font_families()
+
+        feature_lists = None
+        if self.features:
+            lowered_fonts = [f.lower() for f in self.fonts]
+            feature_lists = {}
+            for name in FEATURE_COLUMNS:
+                if name == "font_family":
+                    feature_lists[name] = [lowered_fonts[i] for i in cols["font_id"]]
+                elif name == "numbering_pattern":
+                    feature_lists[name] = [NUMBERING_PATTERNS[c] for c in self.features[name].tolist()]
+                else:
+                    feature_lists[name] = self.features[name].tolist()
+        scores = self.heading_score.tolist() if self.heading_score is not None else None
+        labels = self.classifications() if self.classification is not None else None
+
+        blocks = []
+        for i in range(n):
+            block = {
+                "text": texts[i],
+                "page": cols["page"][i],
+                "font_size": cols["font_size"][i],
+                "font_family": families[i],
+                "is_bold": cols["is_bold"][i],
+                "is_italic": cols["is_italic"][i],
+                "bbox": {"x0": cols["x0"][i], "y0": cols["y0"][i], "x1": cols["x1"][i], "y1": cols["y1"][i]},
+            }
+            if feature_lists is not None:
+                block["features"] = {name: values[i] for name, values in feature_lists.items()}
+            if scores is not None:
+                block["heading_score"] = scores[i]
+            if labels is not None:
+                block["classification"] = labels[i]
+            blocks.append(block)
+        return blocks
+
+    # ---------- persistence ----------
+
+    def save(self, file) -> None:
+        """Writes the table (including features/classification, if any) as a compressed .npz."""
+        arrays = {f"col_{name}": col for name, col in self.columns.items()}
+        arrays["fonts"] = np.array(self.fonts, dtype=object).astype(str) if self.fonts else np.empty(0, dtype=str)
+        arrays["text_utf8"] = np.frombuffer(self.text_buffer.encode("utf-8"), dtype=np.uint8)
+        arrays["text_offsets"] = self.text_offsets
+        for name, col in self.features.items():
+            arrays[f"feat_{name}"] = col
+        if self.heading_score is not None:
+            arrays["heading_score"] = self.heading_score
+        if self.classification is not None:
+            arrays["classification"] = self.classification
+        np.savez_compressed(file, **arrays)
+
+    @classmethod
+    def load(cls, file) -> "BlockTable":
+        """Reads a table written by save()."""
+        with np.load(file, allow_pickle=False) as data:
+            columns = {name: data[f"col_{name}"] for name in BLOCK_COLUMNS}
+            table = cls(
+                columns,
+                [str(f) for f in data["fonts"]],
+                data["text_utf8"].tobytes().decode("utf-8"),
+                data["text_offsets"],
+            )
+            table.features = {
+                key[len("feat_"):]: data[key] for key in data.files if key.startswith("feat_")
+            }
+            if "heading_score" in data.files:
+                table.heading_score = data["heading_score"]
+            if "classification" in data.files:
+                table.classification = data["classification"]
+        return table
+
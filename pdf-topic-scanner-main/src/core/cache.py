@@ -0,0 +1,226 @@
+"""Content-addressed on-disk cache for parse_pdf output.
+
+Entries are keyed by the SHA-256 of the PDF bytes together with everything
+that changes the parser's output (PARSER_VERSION, y_tolerance, backend and
+page selection), so renamed or re-uploaded copies of a file hit the same
+entry and a parser change never serves stale blocks.
+
+Each entry is one gzip-compressed compact JSON file. Reads refresh the file's
+mtime, and writes evict the least recently used entries once the directory
+grows beyond max_bytes. Writes go through a temp file and os.replace, so
+several processes (CLI runs, API workers) can share one cache directory.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.config import PARSE_CACHE_DIR, PARSE_CACHE_MAX_BYTES
+from src.core.backends import DEFAULT_BACKEND
+from src.core.block_table import BlockTable
+from src.core.pdf_parser import PARSER_VERSION, Y_TOLERANCE, count_pages, parse_pdf, parse_pdf_table
+from utils.logger import get_logger
+
+HASH_CHUNK_SIZE = 1024 * 1024  # bytes read at a time while hashing
+ENTRY_SUFFIX = ".json.gz"
+
+logger = get_logger(__name__)
+
+
+def file_sha256(path: str) -> str:
+    """Returns the hex SHA-256 of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_cache_key(
+    content_hash: str,
+    y_tolerance: int = Y_TOLERANCE,
+    backend: str = DEFAULT_BACKEND,
+    pages: Optional[Iterable[int]] = None,
+) -> str:
+    """Builds the cache key for a parse of the file with the given content hash."""
+    page_part = ",".join(str(p) for p in sorted(set(pages))) if pages is not None else "all"
+    raw = f"{content_hash}|v{PARSER_VERSION}|y{y_tolerance}|{backend}|{page_part}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def page_count_key(content_hash: str) -> str:
+    """Builds the cache key for the page count of the file with the given content hash."""
+    return hashlib.sha256(f"{content_hash}|page_count".encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parsed blocks stored under `cache_dir`."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Returns cached blocks for `key`, or None on a miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                blocks = json.load(f)
+            os.utime(path)  # mark as recently used
+            return blocks
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable parse cache entry {key}: {e}")
+            self._remove(path)
+            return None
+
+    def put(self, key: str, blocks: List[Dict]) -> None:
+        """Stores blocks under `key`, then evicts old entries if over budget."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(json.dumps(blocks, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_parse_cache(cache_dir: Optional[str] = PARSE_CACHE_DIR) -> Optional[ParseCache]:
+    """Returns a ParseCache for `cache_dir`, or None when caching is disabled (no directory)."""
+    if not cache_dir:
+        return None
+    return ParseCache(cache_dir)
+
+
+def cached_parse_pdf(
+    pdf_path: str,
+    cache: Optional[ParseCache],
+    y_tolerance: int = Y_TOLERANCE,
+    workers: int = 1,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+    content_hash: Optional[str] = None,
+) -> List[Dict]:
+    """parse_pdf with a content-hash cache in front of it.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        cache (ParseCache, optional): Cache to use; None parses directly.
+        y_tolerance, workers, pages, backend: As for parse_pdf.
+        content_hash (str, optional): Precomputed SHA-256 of the file, if known.
+    Returns:
+        List[Dict]: Line-level blocks, identical to parse_pdf's output.
+    """
+    if cache is None:
+        return parse_pdf(pdf_path, y_tolerance, workers=workers, pages=pages, backend=backend)
+
+    key = parse_cache_key(content_hash or file_sha256(pdf_path), y_tolerance, backend, pages)
+    blocks = cache.get(key)
+    if blocks is not None:
+        logger.debug(f"Parse cache hit for {pdf_path}")
+        return blocks
+
+    blocks = parse_pdf(pdf_path, y_tolerance, workers=workers, pages=pages, backend=backend)
+    try:
+        cache.put(key, blocks)
+    except OSError as e:
+        logger.warning(f"Could not write parse cache entry for {pdf_path}: {e}")
+    return blocks
+
+
+def cached_parse_pdf_table(
+    pdf_path: str,
+    cache: Optional[ParseCache],
+    y_tolerance: int = Y_TOLERANCE,
+    workers: int = 1,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+    content_hash: Optional[str] = None,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> BlockTable:
+    """parse_pdf_table with the same cache (and cache entries) as cached_parse_pdf.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        cache (ParseCache, optional): Cache to use; None parses directly.
+        y_tolerance, workers, pages, backend: As for parse_pdf.
+        content_hash (str, optional): Precomputed SHA-256 of the file, if known.
+        on_page (callable, optional): Passed to parse_pdf_table; not called on a cache hit.
+    Returns:
+        BlockTable: Line-level blocks; to_dicts() equals cached_parse_pdf's output.
+    """
+    if cache is None:
+        return parse_pdf_table(pdf_path, y_tolerance, workers=workers, pages=pages, backend=backend, on_page=on_page)
+
+    key = parse_cache_key(content_hash or file_sha256(pdf_path), y_tolerance, backend, pages)
+    blocks = cache.get(key)
+    if blocks is not None:
+        logger.debug(f"Parse cache hit for {pdf_path}")
+        return BlockTable.from_blocks(blocks)
+
+    table = parse_pdf_table(pdf_path, y_tolerance, workers=workers, pages=pages, backend=backend, on_page=on_page)
+    try:
+        cache.put(key, table.to_dicts())
+    except OSError as e:
+        logger.warning(f"Could not write parse cache entry for {pdf_path}: {e}")
+    return table
+
+
+def cached_count_pages(pdf_path: str, cache: Optional[ParseCache], content_hash: Optional[str] = None) -> int:
+    """count_pages with the parse cache in front of it.
+
+    On a fully cached run this keeps the PDF from being opened at all, so
+    pdfplumber is never even imported.
+    """
+    if cache is None:
+        return count_pages(pdf_path)
+
+    key = page_count_key(content_hash or file_sha256(pdf_path))
+    total = cache.get(key)
+    if isinstance(total, int):
+        return total
+
+    total = count_pages(pdf_path)
+    try:
+        cache.put(key, total)
+    except OSError as e:
+        logger.warning(f"Could not write page count cache entry for {pdf_path}: {e}")
+    return total
@@ -0,0 +1,213 @@
+"""Outline (bookmark) fast path for hierarchy extraction.
+
+Many PDFs already carry an /Outlines bookmark tree written by the authoring
+tool. When it is present and plausible, its entries are better headings than
+anything the font heuristics can rediscover, and reading it costs
+milliseconds instead of a full layout pass.
+
+outline_blocks() turns the outline into classified blocks ("H1"/"H2"/"H3"
+from bookmark depth) and, unless toc_only is set, merges in the document's
+text lines as "BODY" blocks, so the result can be fed straight into
+tree_builder.build_hierarchy without running feature engineering or
+heading classification.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from src.core.backends import DEFAULT_BACKEND
+from src.core.pdf_parser import Y_TOLERANCE, iter_blocks
+from utils.logger import get_logger
+
+MIN_OUTLINE_ENTRIES = 2  # fewer bookmarks than this is not a usable table of contents
+MIN_RESOLVED_RATIO = 0.8  # share of entries that must point at a real page
+MAX_HEADING_LEVEL = 3  # deeper bookmark levels are folded into H3
+
+logger = get_logger(__name__)
+
+
+def read_outline(pdf_path: str) -> List[Dict]:
+    """Reads the PDF bookmark tree without laying out any page.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+    Returns:
+        List[Dict]: Entries in document order, each with 'title', 'level'
+            (1 = top level), 'page' (1-based, or None if unresolvable) and
+            'top' (distance from the top of the page in points, or None).
+            Empty if the PDF has no outline.
+    """
+    import pdfplumber
+    from pdfminer.pdfdocument import PDFNoOutlines
+    from pdfminer.pdfpage import PDFPage
+
+    with pdfplumber.open(pdf_path) as pdf:
+        doc = pdf.doc
+        pages = {}
+        for page_num, page in enumerate(PDFPage.create_pages(doc), start=1):
+            pages[page.pageid] = (page_num, page.mediabox[3])
+
+        try:
+            raw_entries = list(doc.get_outlines())
+        except PDFNoOutlines:
+            return []
+
+        entries = []
+        for level, title, dest, action, _ in raw_entries:
+            page_num, top = _resolve_destination(doc, dest, action, pages)
+            entries.append({
+                "title": " ".join(str(title).split()),
+                "level": level,
+                "page": page_num,
+                "top": top,
+            })
+        return entries
+
+
+def _resolve_destination(doc, dest, action, pages: Dict) -> tuple:
+    """Resolves an outline destination to (page_number, top) or (None, None)."""
+    from pdfminer.psparser import PSLiteral
+    from pdfminer.pdftypes import PDFObjRef, resolve1
+
+    try:
+        if dest is None and action is not None:
+            action = resolve1(action)
+            if isinstance(action, dict) and _literal_name(action.get("S")) == "GoTo":
+                dest = action.get("D")
+        dest = resolve1(dest)
+        if isinstance(dest, (bytes, str, PSLiteral)):
+            name = dest.name if isinstance(dest, PSLiteral) else dest
+            dest = resolve1(doc.get_dest(name))
+        if isinstance(dest, dict):
+            dest = resolve1(dest.get("D"))
+        if not isinstance(dest, list) or not dest:
+            return None, None
+
+        page_ref = dest[0]
+        if not isinstance(page_ref, PDFObjRef) or page_ref.objid not in pages:
+            return None, None
+        page_num, page_height = pages[page_ref.objid]
+
+        # [page /XYZ left top zoom] and [page /FitH top] carry a vertical position
+        top = None
+        fit = _literal_name(dest[1]) if len(dest) > 1 else None
+        y = None
+        if fit == "XYZ" and len(dest) > 3:
+            y = resolve1(dest[3])
+        elif fit in ("FitH", "FitBH") and len(dest) > 2:
+            y = resolve1(dest[2])
+        if isinstance(y, (int, float)):
+            top = max(float(page_height) - float(y), 0.0)
+        return page_num, top
+    except Exception as e:
+        logger.debug(f"Unresolvable outline destination {dest!r}: {e}")
+        return None, None
+
+
+def _literal_name(value) -> Optional[str]:
+    from pdfminer.psparser import PSLiteral
+    from pdfminer.pdftypes import resolve1
+
+    value = resolve1(value)
+    if isinstance(value, PSLiteral):
+        name = value.name
+        return name.decode("latin-1") if isinstance(name, bytes) else name
+    return None
+
+
+def is_plausible_outline(entries: List[Dict]) -> bool:
+    """Checks whether an outline is usable as the document's section skeleton.
+
+    Requires a minimum number of titled entries, most of which must resolve to
+    a page, and resolved pages must never jump backwards between consecutive
+    top-level entries (a sign of a bookmark list unrelated to reading order).
+    """
+    titled = [e for e in entries if e["title"]]
+    if len(titled) < MIN_OUTLINE_ENTRIES:
+        return False
+
+    resolved = [e for e in titled if e["page"] is not None]
+    if len(resolved) / len(titled) < MIN_RESOLVED_RATIO:
+        return False
+
+    top_level_pages = [e["page"] for e in resolved if e["level"] == 1]
+    return all(a <= b for a, b in zip(top_level_pages, top_level_pages[1:]))
+
+
+def _normalize(text: str) -> str:
+    # The parser glues character fragments without spaces, so compare without whitespace
+    return re.sub(r"\s+", "", text).lower()
+
+
+def outline_blocks(
+    pdf_path: str,
+    entries: Optional[List[Dict]] = None,
+    toc_only: bool = False,
+    y_tolerance: int = Y_TOLERANCE,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> List[Dict]:
+    """Builds classified blocks from the outline, ready for build_hierarchy.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        entries (List[Dict], optional): Result of read_outline (read if omitted).
+        toc_only (bool): Only emit headings; no page is laid out at all.
+        y_tolerance (int): Passed to the parser for body text.
+        pages (Iterable[int], optional): Restrict headings and body to these pages.
+        backend (str): Extraction backend for body text.
+    Returns:
+        List[Dict]: Heading blocks ('classification' H1/H2/H3, 'source' "outline")
+            interleaved with BODY blocks in reading order. Body lines that just
+            repeat a heading's title on its page are dropped.
+    """
+    if entries is None:
+        entries = read_outline(pdf_path)
+    selected = set(pages) if pages is not None else None
+
+    headings: List[Dict] = []
+    for entry in entries:
+        if not entry["title"] or entry["page"] is None:
+            continue
+        if selected is not None and entry["page"] not in selected:
+            continue
+        level = min(entry["level"], MAX_HEADING_LEVEL)
+        top = entry["top"] if entry["top"] is not None else 0.0
+        headings.append({
+            "text": entry["title"],
+            "page": entry["page"],
+            "bbox": {"x0": 0.0, "y0": top, "x1": 0.0, "y1": top},
+            "heading_score": 1.0,
+            "classification": f"H{level}",
+            "source": "outline",
+        })
+
+    if toc_only:
+        return headings
+
+    titles_by_page: Dict[int, List[str]] = {}
+    for heading in headings:
+        titles_by_page.setdefault(heading["page"], []).append(_normalize(heading["text"]))
+
+    body: List[Dict] = []
+    for block in iter_blocks(pdf_path, y_tolerance, pages=pages, backend=backend):
+        page_titles = titles_by_page.get(block["page"], [])
+        normalized = _normalize(block["text"])
+        if normalized in page_titles:
+            page_titles.remove(normalized)
+            continue
+        block["heading_score"] = 0.0
+        block["classification"] = "BODY"
+        body.append(block)
+
+    # Merge, keeping outline order for headings and reading order for body text
+    merged: List[Dict] = []
+    i = 0
+    for heading in headings:
+        key = (heading["page"], heading["bbox"]["y0"])
+        while i < len(body) and (body[i]["page"], body[i]["bbox"]["y0"]) < key:
+            merged.append(body[i])
+            i += 1
+        merged.append(heading)
+    merged.extend(body[i:])
+    return merged
@@ -1,12 +1,20 @@
-"""PDF Parsing: Extracts text, layout, font info using pdfplumber."""
+"""PDF Parsing: Extracts text, layout, font info via a pluggable backend (pdfplumber by default)."""
 
-from typing import List, Dict
-import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
 
+from src.core.backends import DEFAULT_BACKEND, WordColumns, get_backend, words_to_columns
+from src.core.block_table import BlockTable
 from utils.logger import get_logger
 
+PARSER_VERSION = "1"  # bump whenever block output changes; part of the parse cache key
 Y_TOLERANCE = 5  # default units for grouping words into lines
 CHARACTER_FRAGMENT_THRESHOLD = 1.5  # max width (in points) to consider a word a character fragment
+CHUNKS_PER_WORKER = 4  # page ranges handed to each worker process in parallel mode
+
+_FRAGMENT_PUNCTUATION = ".,;:!?'\"()[]{}"
 
 logger = get_logger(__name__)
 
@@ -69,85 +77,374 @@ def _merge_character_fragments(words: List[Dict]) -> str:
     return "".join(result).strip()
 
 
-def parse_pdf(pdf_path: str, y_tolerance: int = Y_TOLERANCE) -> List[Dict]:
-    """Extracts per-line blocks from a PDF, merging words into lines based on y-coordinate proximity.
+def _words_to_blocks_loop(words: List[Dict], page_num: int, y_tolerance: int = Y_TOLERANCE) -> List[Dict]:
+    """Groups one page's words into line-level blocks, one word at a time.
 
-    Handles complex PDFs with multiple fonts, sizes, and layouts. Intelligently
-    merges character fragments and preserves document structure.
+    Reference implementation of _words_to_blocks; kept for parity tests and
+    benchmarks/bench_line_grouping.py.
 
     Args:
-        pdf_path (str): Path to PDF file.
+        words (List[Dict]): Word dicts from an extraction backend (see src.core.backends).
+        page_num (int): 1-based page number recorded on each block.
         y_tolerance (int): Max vertical distance for grouping words as a single line.
     Returns:
-        List[Dict]: List of line-level blocks with text and layout info.
-    Raises:
-        Exception: if pdfplumber cannot open or parse the file.
+        List[Dict]: Line-level blocks for this page, in line order.
     """
+    if not words:
+        return []
+
+    # Sort by vertical position, then horizontal
+    words = sorted(words, key=lambda w: (w["top"], w["x0"]))
+
+    # Line grouping
+    lines: List[List[Dict]] = []
+    current_line: List[Dict] = []
+    current_top = None
+
+    for word in words:
+        word_top = word["top"]
+
+        if current_line and abs(word_top - current_top) > y_tolerance:
+            lines.append(current_line)
+            current_line = []
+            current_top = None
+
+        if not current_line:
+            current_top = word_top
+
+        current_line.append(word)
+
+    if current_line:
+        lines.append(current_line)
+
+    # Convert each line to a block
     blocks: List[Dict] = []
+    for line_words in lines:
+        text = _merge_character_fragments(line_words).strip()
+        if not text:
+            continue
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
+        font_family = line_words[0]["fontname"]
+        font_size = float(line_words[0]["size"])
+
+        is_bold = "bold" in font_family.lower()
+        is_italic = "italic" in font_family.lower() or "oblique" in font_family.lower()
+
+        x0 = min(w["x0"] for w in line_words)
+        x1 = max(w["x1"] for w in line_words)
+        y0 = min(w["top"] for w in line_words)
+        y1 = max(w["bottom"] for w in line_words)
 
-                words = page.extract_words(
-                    extra_attrs=["fontname", "size", "x0", "x1", "top", "bottom"]
-                )
-                if not words:
-                    continue
+        block = {
+            "text": text,
+            "page": page_num,
+            "font_size": font_size,
+            "font_family": font_family,
+            "is_bold": is_bold,
+            "is_italic": is_italic,
+            "bbox": {"x0": x0, "y0": y0, "x1": x1, "y1": y1},
+        }
 
-                # Sort by vertical position, then horizontal
-                words = sorted(words, key=lambda w: (w["top"], w["x0"]))
+        blocks.append(block)
 
-                # Line grouping
-                lines: List[List[Dict]] = []
-                current_line: List[Dict] = []
-                current_top = None
+    return blocks
 
-                for word in words:
-                    word_top = word["top"]
 
-                    if current_line and abs(word_top - current_top) > y_tolerance:
-                        lines.append(current_line)
-                        current_line = []
-                        current_top = None
+def _make_block(text: str, page_num: int, font_family: str, font_size: float, bbox: Dict) -> Dict:
+    lowered = font_family.lower()
+    return {
+        "text": text,
+        "page": page_num,
+        "font_size": font_size,
+        "font_family": font_family,
+        "is_bold": "bold" in lowered,
+        "is_italic": "italic" in lowered or "oblique" in lowered,
+        "bbox": bbox,
+    }
 
-                    if not current_line:
-                        current_top = word_top
 
-                    current_line.append(word)
+def _reading_order(tops: np.ndarray, x0s: np.ndarray) -> np.ndarray:
+    """Indices that stably sort words by (top, x0), like sorted(key=lambda w: (w["top"], w["x0"])).
+
+    Backends emit words in content order, where words sharing a top are
+    almost always already left to right; a stable sort on top alone is then
+    enough and much cheaper than a two-key lexsort, which remains the fallback.
+    """
+    order = np.argsort(tops, kind="stable")
+    sorted_tops, sorted_x0s = tops[order], x0s[order]
+    if np.any((sorted_tops[1:] == sorted_tops[:-1]) & (sorted_x0s[1:] < sorted_x0s[:-1])):
+        order = np.lexsort((x0s, tops))
+    return order
+
+
+def _page_lines(words: Union[List[Dict], WordColumns], y_tolerance: int = Y_TOLERANCE) -> Optional[Dict]:
+    """Groups one page's words into lines using NumPy arrays.
+
+    Produces exactly the same blocks as _words_to_blocks_loop, but handles the
+    page's words as columns: sorting, line boundaries, spacing decisions and
+    line bboxes are computed with array operations, leaving only per-line
+    string joins in Python. This matters on character-fragmented PDFs, where
+    pdfplumber returns one "word" per glyph and a page holds tens of
+    thousands of them. Backends that already produce columns (pdfium) skip
+    the per-word dict handling entirely.
+
+    Args:
+        words: Word dicts or WordColumns from an extraction backend (see src.core.backends).
+        y_tolerance (int): Max vertical distance for grouping words as a single line.
+    Returns:
+        Dict or None: The page's non-empty lines in line order, as columns:
+            'text' and 'font_family' lists plus 'font_size', 'x0', 'y0', 'x1'
+            and 'y1' float arrays. None if the page has no words.
+    """
+    cols = words if isinstance(words, dict) else words_to_columns(words)
+    n = len(cols["text"])
+    if not n:
+        return None
+
+    order = _reading_order(cols["top"], cols["x0"])
+    tops, x0s, x1s = cols["top"][order], cols["x0"][order], cols["x1"][order]
+    bottoms, sizes = cols["bottom"][order], cols["size"][order]
+    order_list = order.tolist()
+    raw_texts = cols["text"]
+    # Backends rarely return padded words, so only pay for strip() when there is whitespace at all
+    if any(c.isspace() for c in set("".join(raw_texts))):
+        raw_texts = list(map(str.strip, raw_texts))
+    texts = [raw_texts[i] for i in order_list]
+
+    # Line boundaries: a line ends at the first word more than y_tolerance below its first word.
+    # bisect finds the candidate; the exact comparison settles float rounding at the edge.
+    top_list = tops.tolist()
+    starts = []
+    start = 0
+    while start < n:
+        anchor = top_list[start]
+        end = bisect_right(top_list, anchor + y_tolerance, start + 1)
+        while end < n and not (top_list[end] - anchor > y_tolerance):
+            end += 1
+        while end > start + 1 and top_list[end - 1] - anchor > y_tolerance:
+            end -= 1
+        starts.append(start)
+        start = end
+    starts_arr = np.array(starts)
+    ends = starts[1:] + [n]
+
+    # Spacing rules of _merge_character_fragments, evaluated for all words at once
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=n)
+    nonempty = lengths > 0
+    is_fragment = lengths <= 1
+    for i in np.flatnonzero(lengths > 1).tolist():
+        if texts[i] in _FRAGMENT_PUNCTUATION:
+            is_fragment[i] = True
+
+    line_id = np.repeat(np.arange(len(starts)), np.diff(np.append(starts_arr, n)))
+    line_start = starts_arr[line_id]
+    avg_char_width = sizes[line_start] * 0.55
+
+    seen = np.cumsum(nonempty)
+    seen_before_line = (seen - nonempty)[line_start]
+    has_prev_content = (seen - nonempty) > seen_before_line
+
+    gap = np.empty(n)
+    gap[0] = 0.0
+    gap[1:] = x0s[1:] - x1s[:-1]
+    prev_is_fragment = np.empty(n, dtype=bool)
+    prev_is_fragment[0] = True
+    prev_is_fragment[1:] = is_fragment[:-1]
+
+    add_space = (
+        nonempty
+        & has_prev_content
+        & (np.arange(n) != line_start)
+        & (gap > avg_char_width * 0.35)
+        & ~prev_is_fragment
+        & (~is_fragment | (gap > avg_char_width * 0.8))
+    )
+    for i in np.flatnonzero(add_space).tolist():
+        texts[i] = " " + texts[i]
+
+    line_texts = ["".join(texts[a:b]).strip() for a, b in zip(starts, ends)]
+    keep = np.array([bool(t) for t in line_texts], dtype=bool)
+    kept_starts = starts_arr[keep]
+    fontnames = cols["fontname"]
+
+    return {
+        "text": [t for t in line_texts if t],
+        "font_family": [fontnames[order_list[a]] for a in kept_starts.tolist()],
+        "font_size": sizes[kept_starts],
+        "x0": np.minimum.reduceat(x0s, starts_arr)[keep],
+        "y0": np.minimum.reduceat(tops, starts_arr)[keep],
+        "x1": np.maximum.reduceat(x1s, starts_arr)[keep],
+        "y1": np.maximum.reduceat(bottoms, starts_arr)[keep],
+    }
+
+
+def _lines_to_blocks(lines: Dict, page_num: int) -> List[Dict]:
+    """Turns the line columns of _page_lines into block dicts."""
+    x0, y0 = lines["x0"].tolist(), lines["y0"].tolist()
+    x1, y1 = lines["x1"].tolist(), lines["y1"].tolist()
+    return [
+        _make_block(text, page_num, font_family, font_size, {"x0": x0[k], "y0": y0[k], "x1": x1[k], "y1": y1[k]})
+        for k, (text, font_family, font_size) in enumerate(
+            zip(lines["text"], lines["font_family"], lines["font_size"].tolist())
+        )
+    ]
+
+
+def _words_to_blocks(
+    words: Union[List[Dict], WordColumns],
+    page_num: int,
+    y_tolerance: int = Y_TOLERANCE,
+) -> List[Dict]:
+    """Groups one page's words into line-level blocks (see _page_lines).
+
+    Args:
+        words: Word dicts or WordColumns from an extraction backend (see src.core.backends).
+        page_num (int): 1-based page number recorded on each block.
+        y_tolerance (int): Max vertical distance for grouping words as a single line.
+    Returns:
+        List[Dict]: Line-level blocks for this page, in line order.
+    """
+    lines = _page_lines(words, y_tolerance)
+    if lines is None:
+        return []
+    return _lines_to_blocks(lines, page_num)
+
+
+def _iter_page_lines(
+    pdf_path: str,
+    y_tolerance: int,
+    pages: Optional[Iterable[int]],
+    backend: str,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> Iterator[Tuple[int, Dict]]:
+    """Yields (page_num, line columns) per page, with lines sorted by (y0, x0).
+
+    on_page, if given, is called with each page number once that page's words are grouped.
+    """
+    page_words = get_backend(backend)
+    for page_num, words in page_words(pdf_path, pages):
+        lines = _page_lines(words, y_tolerance)
+        if on_page is not None:
+            on_page(page_num)
+        if lines is None:
+            continue
+        order = np.lexsort((lines["x0"], lines["y0"])).tolist()  # stable, like sorted()
+        yield page_num, {
+            name: [values[i] for i in order] if isinstance(values, list) else values[order]
+            for name, values in lines.items()
+        }
+
+
+def _parse_pages(pdf_path: str, pages: List[int], y_tolerance: int, backend: str) -> List[Dict]:
+    """Worker entry point: parses the given 1-based page numbers.
+
+    Each worker opens the PDF independently, so nothing pdfplumber-related is
+    shared or pickled between processes; only the resulting blocks are returned.
+    """
+    return list(iter_blocks(pdf_path, y_tolerance, pages=pages, backend=backend))
 
-                if current_line:
-                    lines.append(current_line)
 
-                # Convert each line to a block
-                for line_words in lines:
-                    text = _merge_character_fragments(line_words).strip()
-                    if not text:
-                        continue
+def _parse_pages_table(pdf_path: str, pages: List[int], y_tolerance: int, backend: str) -> BlockTable:
+    """Worker entry point for parse_pdf_table; like _parse_pages but returns a BlockTable."""
+    return BlockTable.from_page_lines(_iter_page_lines(pdf_path, y_tolerance, pages, backend))
 
-                    font_family = line_words[0]["fontname"]
-                    font_size = float(line_words[0]["size"])
 
-                    is_bold = "bold" in font_family.lower()
-                    is_italic = "italic" in font_family.lower() or "oblique" in font_family.lower()
+def count_pages(pdf_path: str) -> int:
+    """Returns the number of pages in a PDF by walking its page tree (no layout work)."""
+    import pdfplumber
+    from pdfminer.pdfpage import PDFPage
 
-                    x0 = min(w["x0"] for w in line_words)
-                    x1 = max(w["x1"] for w in line_words)
-                    y0 = min(w["top"] for w in line_words)
-                    y1 = max(w["bottom"] for w in line_words)
+    with pdfplumber.open(pdf_path) as pdf:
+        return sum(1 for _ in PDFPage.create_pages(pdf.doc))
 
-                    block = {
-                        "text": text,
-                        "page": page_num,
-                        "font_size": font_size,
-                        "font_family": font_family,
-                        "is_bold": is_bold,
-                        "is_italic": is_italic,
-                        "bbox": {"x0": x0, "y0": y0, "x1": x1, "y1": y1},
-                    }
 
-                    blocks.append(block)
+def iter_blocks(
+    pdf_path: str,
+    y_tolerance: int = Y_TOLERANCE,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> Iterator[Dict]:
+    """Lazily yields line-level blocks page by page, in the same order as parse_pdf.
 
+    Memory ceiling: only one page is ever laid out at a time, and its pdfplumber
+    layout objects are released before the next page is read. Peak memory is
+    therefore bounded by the largest single page plus the document's shared
+    resources (xref table, page tree, fonts), and does not grow with page count.
+    Blocks that the caller keeps are, of course, the caller's memory.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        y_tolerance (int): Max vertical distance for grouping words as a single line.
+        pages (Iterable[int], optional): 1-based page numbers to parse (default: all).
+            Page numbers on the yielded blocks stay absolute.
+        backend (str): Extraction backend name (see src.core.backends.BACKENDS).
+        on_page (callable, optional): Progress hook called with each page number
+            once the page is parsed, before its blocks are yielded.
+    Yields:
+        Dict: Line-level blocks, sorted page → y → x.
+    Raises:
+        Exception: if pdfplumber cannot open or parse the file.
+    """
+    get_backend(backend)  # fail on unknown backend names before the first page
+    try:
+        for page_num, lines in _iter_page_lines(pdf_path, y_tolerance, pages, backend, on_page):
+            yield from _lines_to_blocks(lines, page_num)
+    except Exception as e:
+        logger.error(f"Failed to parse PDF '{pdf_path}': {e}")
+        raise Exception(f"PDF parsing failed for {pdf_path}: {e}")
+
+
+def _split_pages(pages: List[int], chunks: int) -> List[List[int]]:
+    """Splits an ordered page list into at most `chunks` contiguous runs."""
+    chunks = max(1, min(chunks, len(pages)))
+    size, extra = divmod(len(pages), chunks)
+    runs = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        runs.append(pages[start:end])
+        start = end
+    return runs
+
+
+def parse_pdf(
+    pdf_path: str,
+    y_tolerance: int = Y_TOLERANCE,
+    workers: int = 1,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> List[Dict]:
+    """Extracts per-line blocks from a PDF, merging words into lines based on y-coordinate proximity.
+
+    Handles complex PDFs with multiple fonts, sizes, and layouts. Intelligently
+    merges character fragments and preserves document structure.
+
+    With workers > 1 the pages are sharded into contiguous ranges that are parsed
+    in separate processes and merged back in page/y/x order, so the output is
+    identical to the serial path. The serial path is simply list(iter_blocks(...)).
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        y_tolerance (int): Max vertical distance for grouping words as a single line.
+        workers (int): Number of worker processes (1 = parse serially in-process).
+        pages (Iterable[int], optional): 1-based page numbers to parse (default: all).
+            Unselected pages are never laid out; block page numbers stay absolute.
+        backend (str): Extraction backend name; "pdfplumber" is the reference,
+            "pdfium" is much faster (see src.core.backends).
+    Returns:
+        List[Dict]: List of line-level blocks with text and layout info.
+    Raises:
+        Exception: if pdfplumber cannot open or parse the file.
+    """
+    get_backend(backend)  # fail fast on unknown backend names
+    if workers <= 1:
+        return list(iter_blocks(pdf_path, y_tolerance, pages=pages, backend=backend))
+
+    blocks: List[Dict] = []
+    try:
+        for run_blocks in _map_page_runs(_parse_pages, pdf_path, y_tolerance, workers, pages, backend):
+            blocks.extend(run_blocks)
         # Sort final result: page → y → x
         blocks.sort(key=lambda b: (b["page"], b["bbox"]["y0"], b["bbox"]["x0"]))
         return blocks
@@ -157,6 +454,69 @@ def parse_pdf(pdf_path: str, y_tolerance: int = Y_TOLERANCE) -> List[Dict]:
         raise Exception(f"PDF parsing failed for {pdf_path}: {e}")
 
 
+def _map_page_runs(
+    worker: Callable,
+    pdf_path: str,
+    y_tolerance: int,
+    workers: int,
+    pages: Optional[Iterable[int]],
+    backend: str,
+) -> List:
+    """Runs `worker` over contiguous page runs in a process pool; results come back in page order."""
+    total_pages = count_pages(pdf_path)
+    if pages is None:
+        selected = list(range(1, total_pages + 1))
+    else:
+        selected = sorted(p for p in set(pages) if 1 <= p <= total_pages)
+    if not selected:
+        return []
+
+    # Several runs per worker so one slow run doesn't leave the others idle
+    runs = _split_pages(selected, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=min(workers, len(runs))) as executor:
+        futures = [
+            executor.submit(worker, pdf_path, run, y_tolerance, backend)
+            for run in runs
+        ]
+        return [future.result() for future in futures]
+
+
+def parse_pdf_table(
+    pdf_path: str,
+    y_tolerance: int = Y_TOLERANCE,
+    workers: int = 1,
+    pages: Optional[Iterable[int]] = None,
+    backend: str = DEFAULT_BACKEND,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> BlockTable:
+    """parse_pdf, but returns the blocks as a columnar BlockTable.
+
+    Lines go straight from the grouping arrays into the table's columns, so no
+    per-block dict is ever built. table.to_dicts() equals parse_pdf's output
+    for the same arguments.
+
+    Args:
+        pdf_path, y_tolerance, workers, pages, backend: As for parse_pdf.
+        on_page (callable, optional): Progress hook called with each page number
+            as it is parsed (serial mode only).
+    Returns:
+        BlockTable: Line-level blocks, sorted page → y → x.
+    Raises:
+        Exception: if pdfplumber cannot open or parse the file.
+    """
+    get_backend(backend)  # fail fast on unknown backend names
+    try:
+        if workers <= 1:
+            return BlockTable.from_page_lines(_iter_page_lines(pdf_path, y_tolerance, pages, backend, on_page))
+        # Runs are contiguous and in page order, so concatenating keeps the sort
+        return BlockTable.concat(
+            _map_page_runs(_parse_pages_table, pdf_path, y_tolerance, workers, pages, backend)
+        )
+    except Exception as e:
+        logger.error(f"Failed to parse PDF '{pdf_path}': {e}")
+        raise Exception(f"PDF parsing failed for {pdf_path}: {e}")
+
+
 # ---- TESTING SECTION ----
 if __name__ == "__main__":
     import sys
@@ -10,15 +10,20 @@ useful features for heading detection:
 - simple position features (left-aligned, centered, width ratio)
 """
 
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Union
 from collections import Counter
+from itertools import groupby
 import re
 
+import numpy as np
+
+from src.core.block_table import FEATURE_COLUMNS, NUMBERING_PATTERNS, BlockTable
+
 # Assume standard PDF width for now; can later infer from page if needed
 PAGE_WIDTH = 612  # points, typical US Letter width
 
 
-def enrich_blocks_with_features(blocks: List[Dict]) -> List[Dict]:
+def enrich_blocks_with_features(blocks: Union[List[Dict], BlockTable]) -> Union[List[Dict], BlockTable]:
     """Adds a 'features' dict to each block for heading detection.
 
     Computes font-based, text-based, and position-based features that help
@@ -26,13 +31,16 @@ def enrich_blocks_with_features(blocks: List[Dict]) -> List[Dict]:
     boldness, numbering patterns, casing, and indentation.
 
     Args:
-        blocks (List[Dict]): raw blocks from PDF parser.
+        blocks (List[Dict] or BlockTable): raw blocks from PDF parser.
     Returns:
         List[Dict]: enriched blocks with 'features' dict containing:
             - font_features: font_rank, relative_size, is_bold, is_italic
             - text_features: word_count, casing patterns, numbering, etc.
             - position_features: alignment, indentation, text width
+        A BlockTable is enriched in place (see enrich_block_table) and returned.
     """
+    if isinstance(blocks, BlockTable):
+        return enrich_block_table(blocks)
     if not blocks:
         return blocks
 
@@ -61,6 +69,95 @@ def enrich_blocks_with_features(blocks: List[Dict]) -> List[Dict]:
     return enriched
 
 
+def iter_enriched_blocks(blocks: Iterable[Dict]) -> Iterator[Dict]:
+    """Lazily enriches a page-ordered block stream, one page at a time.
+
+    All features are computed from per-page statistics, so a page can be
+    enriched as soon as its blocks have arrived. Pair with
+    pdf_parser.iter_blocks to keep only a single page of blocks buffered.
+
+    Args:
+        blocks (Iterable[Dict]): raw blocks grouped by page (e.g. from iter_blocks).
+    Yields:
+        Dict: blocks with the same 'features' dict as enrich_blocks_with_features.
+    """
+    for _, page_blocks in groupby(blocks, key=lambda b: b["page"]):
+        yield from enrich_blocks_with_features(list(page_blocks))
+
+
+def enrich_block_table(table: BlockTable) -> BlockTable:
+    """Columnar version of enrich_blocks_with_features.
+
+    Fills table.features with one column per feature. Font and position
+    features are computed with array operations per page; text features
+    still need per-line string work. table.to_dicts() then carries exactly
+    the 'features' dicts enrich_blocks_with_features would have added.
+
+    Args:
+        table (BlockTable): raw blocks from pdf_parser.parse_pdf_table.
+    Returns:
+        BlockTable: the same table, with features filled in.
+    """
+    n = len(table)
+    cols = table.columns
+    font_size = cols["font_size"]
+    x0, x1 = cols["x0"], cols["x1"]
+
+    # 1) Font features from per-page statistics
+    font_rank = np.zeros(n, dtype=np.int32)
+    relative_size = np.ones(n)
+    for page in np.unique(cols["page"]).tolist():
+        idx = np.flatnonzero(cols["page"] == page)
+        sizes = font_size[idx]
+        unique_sizes, first_seen, counts = np.unique(sizes, return_index=True, return_counts=True)
+        # most common size; ties go to the size seen first, like Counter.most_common
+        best = np.flatnonzero(counts == counts.max())
+        body_size = float(unique_sizes[best[np.argmin(first_seen[best])]])
+        # rank 1 = largest size on the page
+        font_rank[idx] = len(unique_sizes) - np.searchsorted(unique_sizes, sizes)
+        if body_size > 0:
+            relative_size[idx] = sizes / body_size
+
+    lowered_fonts = [f.lower() for f in table.fonts]
+    bold_fonts = np.array(
+        [("bold" in f or "heavy" in f or "black" in f) for f in lowered_fonts], dtype=bool
+    )
+    features = {
+        "font_rank": font_rank,
+        "relative_size": np.array([round(v, 2) for v in relative_size.tolist()]),
+        "is_bold": cols["is_bold"] | (bold_fonts[cols["font_id"]] if len(bold_fonts) else False),
+        "is_italic": cols["is_italic"].copy(),
+    }
+
+    # 2) Text features (string work, one line at a time)
+    text_names = [
+        "word_count", "char_count", "is_short", "is_very_short", "is_all_caps",
+        "is_title_case", "uppercase_ratio", "has_numbering", "numbering_pattern",
+    ]
+    rows = [_text_features({"text": text}) for text in table.texts()]
+    pattern_codes = {name: code for code, name in enumerate(NUMBERING_PATTERNS)}
+    for name in text_names:
+        values = [row[name] for row in rows]
+        if name == "numbering_pattern":
+            values = [pattern_codes[v] for v in values]
+        features[name] = np.array(values, dtype=FEATURE_COLUMNS[name]).reshape(n)
+
+    # 3) Position features
+    left_margin = 50
+    center_x = (x0 + x1) / 2.0
+    features.update({
+        "text_width_ratio": np.array([round(v, 3) for v in (np.maximum(x1 - x0, 1.0) / PAGE_WIDTH).tolist()]),
+        "is_left_aligned": x0 < left_margin + 20,
+        "is_centered": np.abs(center_x - PAGE_WIDTH / 2.0) < 75,
+        "is_indented": x0 > left_margin + 30,
+        "indent_level": np.maximum(0, np.trunc((x0 - left_margin) / 30)).astype(np.int32),
+        "left_margin": np.array([round(v, 2) for v in x0.tolist()]),
+    })
+
+    table.features = {name: features[name] for name in FEATURE_COLUMNS if name != "font_family"}
+    return table
+
+
 # ---------- internal helpers ----------
 
 def _compute_page_font_stats(blocks: List[Dict]) -> Dict[int, Dict]:
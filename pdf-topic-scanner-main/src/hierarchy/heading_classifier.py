@@ -4,26 +4,34 @@ Assigns each block a heading_score (float in [0, 1]) and a classification
 ("H1", "H2", "H3", "BODY") based on feature heuristics.
 """
 
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
 from src.config import HEADING_SCORE_THRESHOLDS
+from src.core.block_table import CLASSIFICATION_LABELS, BlockTable
 
 MAX_POSSIBLE_SCORE = 11.0
 
 
 def classify_headings(
-    blocks: List[Dict],
+    blocks: Union[Iterable[Dict], BlockTable],
     thresholds: Optional[Dict[str, float]] = None
-) -> List[Dict]:
+) -> Union[List[Dict], BlockTable]:
     """For feature-enriched blocks, computes heading_score and classification.
 
     Args:
-        blocks (List[Dict]): feature-enriched blocks.
+        blocks (Iterable[Dict] or BlockTable): feature-enriched blocks (a list,
+            a lazy stream, or a table from enrich_blocks_with_features).
         thresholds (dict, optional): override for score thresholds.
     Returns:
         List[Dict]: blocks, each with 'heading_score' and 'classification' added.
+        A BlockTable is classified in place (see classify_block_table) and returned.
     """
     if thresholds is None:
         thresholds = HEADING_SCORE_THRESHOLDS
+    if isinstance(blocks, BlockTable):
+        return classify_block_table(blocks, thresholds)
 
     classified = []
     max_block = None  # Track the highest-scoring non-BODY block on page 1
@@ -51,6 +59,99 @@ def classify_headings(
     return classified
 
 
+def iter_classified_blocks(
+    blocks: Iterable[Dict],
+    thresholds: Optional[Dict[str, float]] = None
+) -> Iterator[Dict]:
+    """Lazy classify_headings for a page-ordered block stream.
+
+    Scores are per block; only the H1 promotion needs to see all of page 1,
+    so page-1 blocks are held back until the first later page arrives and
+    every other block is classified and yielded as soon as it comes in.
+
+    Args:
+        blocks (Iterable[Dict]): feature-enriched blocks grouped by page
+            (e.g. from iter_enriched_blocks).
+        thresholds (dict, optional): override for score thresholds.
+    Yields:
+        Dict: blocks classified exactly as classify_headings would.
+    """
+    page_one: List[Dict] = []
+    for block in blocks:
+        if block["page"] == 1:
+            page_one.append(block)
+            continue
+        if page_one:
+            yield from classify_headings(page_one, thresholds)
+            page_one = []
+        yield from classify_headings([block], thresholds)
+    if page_one:
+        yield from classify_headings(page_one, thresholds)
+
+
+def classify_block_table(
+    table: BlockTable,
+    thresholds: Optional[Dict[str, float]] = None
+) -> BlockTable:
+    """Columnar version of classify_headings for an enriched BlockTable.
+
+    Applies the _compute_raw_score weights to whole feature columns, adding
+    the terms in the same order so scores match the per-block path exactly,
+    then fills table.heading_score and table.classification.
+
+    Args:
+        table (BlockTable): table enriched by enrich_blocks_with_features.
+        thresholds (dict, optional): override for score thresholds.
+    Returns:
+        BlockTable: the same table, classified.
+    """
+    if thresholds is None:
+        thresholds = HEADING_SCORE_THRESHOLDS
+    f = table.features
+    n = len(table)
+    score = np.zeros(n)
+
+    font_rank = f["font_rank"]
+    score += np.select(
+        [font_rank == 1, font_rank == 2, font_rank == 3, font_rank <= 5], [4.5, 3.5, 2.5, 1.5], 0.0
+    )
+    relative_size = f["relative_size"]
+    score += np.select(
+        [relative_size >= 1.8, relative_size >= 1.5, relative_size >= 1.3, relative_size >= 1.1],
+        [2.5, 2.0, 1.8, 1.2],
+        0.0,
+    )
+    score += np.where(f["is_bold"], 2.0, 0.0)
+    score += np.where(f["has_numbering"], 1.2, 0.0)
+    score += np.select([f["is_all_caps"], f["is_title_case"]], [1.2, 0.8], 0.0)
+    score += np.where(f["uppercase_ratio"] > 0.6, 0.6, 0.0)
+    score += np.select([f["is_very_short"], f["is_short"]], [1.2, 0.8], 0.0)
+    score -= np.where(f["indent_level"] > 2, 0.5, 0.0)
+
+    heading_score = np.array([_normalize_score(v) for v in score.tolist()])
+    h1 = thresholds.get("H1", 0.75)
+    h2 = thresholds.get("H2", 0.50)
+    h3 = thresholds.get("H3", 0.35)
+    classification = np.select(
+        [heading_score >= h1, heading_score >= h2, heading_score >= h3],
+        [CLASSIFICATION_LABELS.index(label) for label in ("H1", "H2", "H3")],
+        CLASSIFICATION_LABELS.index("BODY"),
+    ).astype(np.int8)
+
+    # Promote best heading on first page to H1 (see classify_headings)
+    candidates = np.flatnonzero(
+        (table.columns["page"] == 1) & (classification != CLASSIFICATION_LABELS.index("BODY"))
+    )
+    if len(candidates):
+        best = candidates[np.argmax(heading_score[candidates])]
+        if heading_score[best] > 0.4:
+            classification[best] = CLASSIFICATION_LABELS.index("H1")
+
+    table.heading_score = heading_score
+    table.classification = classification
+    return table
+
+
 def _compute_raw_score(f: Dict) -> float:
     """Compute raw heading score from features dict.
 
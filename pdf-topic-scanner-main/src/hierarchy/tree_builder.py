@@ -13,10 +13,12 @@ Implements build_hierarchy(blocks, metadata) that outputs:
 using a stack-based algorithm for heading nesting.
 """
 
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 
+from src.core.block_table import BlockTable
 
-def build_hierarchy(blocks: List[Dict], metadata: Dict) -> Dict:
+
+def build_hierarchy(blocks: Union[Iterable[Dict], BlockTable], metadata: Dict) -> Dict:
     """Build nested hierarchy and output JSON serializable dict.
 
     Uses a stack-based algorithm to construct a properly nested hierarchy from
@@ -28,28 +30,40 @@ def build_hierarchy(blocks: List[Dict], metadata: Dict) -> Dict:
         Output: {"sections": [{"title": H1, "children": [{"title": H2, ...}, ...]}, ...]}
 
     Args:
-        blocks (List[Dict]): classified blocks (must have 'classification' and 'text').
+        blocks (Iterable[Dict] or BlockTable): classified blocks (must have
+            'classification' and 'text'); a BlockTable is read column-wise.
         metadata (Dict): document-level metadata (source_file, total_blocks, total_pages, etc.).
 
     Returns:
         Dict: {"metadata": metadata, "sections": nested_sections_list}
     """
-    sections: List[Dict] = []
-    stack: List[Dict] = []
+    return {
+        "metadata": metadata,
+        "sections": list(iter_sections(blocks)),
+    }
+
+
+def iter_sections(blocks: Union[Iterable[Dict], BlockTable]) -> Iterator[Dict]:
+    """Yields build_hierarchy's top-level sections one at a time, as each is completed.
 
-    # Helper to create a section
-    def _new_section(title: str) -> Dict[str, Any]:
-        return {"title": title, "content": [], "children": []}
+    A top-level section cannot change any more once the next one starts, so
+    it is yielded right then (the implicit "Document" section, if any, first).
+    Fed a lazy block stream, this hands out the first chapters of a long
+    document while later pages are still being parsed.
 
+    Args:
+        blocks (Iterable[Dict] or BlockTable): classified blocks, as for build_hierarchy.
+    Yields:
+        Dict: top-level sections ({"title", "content", "children"}), in order.
+    """
+    stack: List[Dict] = []
     root_section = None
+    current = None  # open top-level section
 
-    for block in blocks:
-        cls = block.get("classification", "BODY")
-        text = block.get("text", "")
+    for cls, text in _labelled_texts(blocks):
+        top_level = None  # set when this block starts a new top-level section
         if cls == "H1":
-            section = _new_section(text)
-            sections.append(section)
-            stack = [section]  # always reset stack to this newest H1
+            top_level = _new_section(text)
         elif cls == "H2":
             # Attach to most recent H1 (stack[-1])
             if stack:
@@ -61,17 +75,10 @@ def build_hierarchy(blocks: List[Dict], metadata: Dict) -> Dict:
                     stack = stack[:1]
                 stack.append(child)
             else:
-                section = _new_section(text)
-                sections.append(section)
-                stack = [section]
+                top_level = _new_section(text)
         elif cls == "H3":
             # Attach to most recent H2 if it exists, otherwise to the latest H1
-            if len(stack) >= 2:
-                parent = stack[-1]
-            elif stack:
-                parent = stack[-1]
-            else:
-                parent = None
+            parent = stack[-1] if stack else None
 
             child = _new_section(text)
             if parent:
@@ -82,33 +89,42 @@ def build_hierarchy(blocks: List[Dict], metadata: Dict) -> Dict:
                 stack.append(child)
             else:
                 # No parent at all: treat as top-level
-                sections.append(child)
-                stack = [child]
-        elif cls == "BODY":
-            if stack:
-                stack[-1]["content"].append(text)
-            else:
-                # No heading seen yet: create an implicit "Document" section
-                if not root_section:
-                    root_section = _new_section("Document")
-                root_section["content"].append(text)
+                top_level = child
         else:
-            # Should never happen, but safeguard: treat as body
+            # BODY (and, as a safeguard, any unknown class)
             if stack:
                 stack[-1]["content"].append(text)
             else:
+                # No heading seen yet: create an implicit "Document" section
                 if not root_section:
                     root_section = _new_section("Document")
                 root_section["content"].append(text)
 
-    # If root_section used, insert it at index 0 so 'Document' is first
+        if top_level is not None:
+            # The stack is never empty again, so 'Document' is complete and comes first
+            if root_section and root_section["content"]:
+                yield root_section
+            root_section = None
+            if current is not None:
+                yield current
+            current = top_level
+            stack = [top_level]  # always reset stack to the newest top-level section
+
     if root_section and root_section["content"]:
-        sections.insert(0, root_section)
+        yield root_section
+    if current is not None:
+        yield current
 
-    return {
-        "metadata": metadata,
-        "sections": sections,
-    }
+
+def _new_section(title: str) -> Dict[str, Any]:
+    return {"title": title, "content": [], "children": []}
+
+
+def _labelled_texts(blocks: Union[Iterable[Dict], BlockTable]) -> Iterator[Tuple[str, str]]:
+    """Yields (classification, text) per block without building dicts for a BlockTable."""
+    if isinstance(blocks, BlockTable):
+        return zip(blocks.classifications(), blocks.texts())
+    return ((b.get("classification", "BODY"), b.get("text", "")) for b in blocks)
 
 
 # --- EXAMPLE USAGE ---
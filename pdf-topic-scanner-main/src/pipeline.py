@@ -0,0 +1,217 @@
+"""The DocTree pipeline (parse → features → classification → tree) as one call.
+
+run_pipeline is a plain module-level function taking and returning only
+picklable values, so servers can hand it to a worker process instead of
+running the CPU-bound chain on their event loop. stream_pipeline is its
+incremental twin, reporting pages and finished sections as it goes.
+
+Both take an optional `cancel` flag (anything with is_set(), e.g. a
+multiprocessing Event). It is checked before every page and between
+stages, so a caller whose client went away can free the worker within a page.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.config import PARSE_CACHE_DIR
+from src.core.backends import DEFAULT_BACKEND
+from src.core.block_export import export_blocks
+from src.core.cache import cached_count_pages, cached_parse_pdf_table, file_sha256, get_parse_cache
+from src.core.pdf_parser import count_pages, iter_blocks
+from src.features.feature_engineer import enrich_blocks_with_features, iter_enriched_blocks
+from src.hierarchy.heading_classifier import classify_headings, iter_classified_blocks
+from src.hierarchy.tree_builder import build_hierarchy, iter_sections
+
+PIPELINE_VERSION = "1"  # bump whenever features, classification or tree output change; part of the result cache key
+
+
+class PipelineCancelled(BaseException):
+    """Raised when the pipeline's cancel flag is set; carries the CPU time spent until then.
+
+    A BaseException, like asyncio.CancelledError, so that the stages' own
+    `except Exception` error handling lets it through unchanged.
+    """
+
+    def __init__(self, cpu_seconds: float):
+        super().__init__(cpu_seconds)  # args survive pickling back from a worker process
+        self.cpu_seconds = cpu_seconds
+
+
+def _cancel_check(cancel: Optional[Any]) -> Callable[[], None]:
+    """Returns a function raising PipelineCancelled once `cancel` is set (a no-op without one)."""
+    cpu0 = time.process_time()
+
+    def check() -> None:
+        if cancel is not None and cancel.is_set():
+            raise PipelineCancelled(time.process_time() - cpu0)
+    return check
+
+
+def run_pipeline(
+    pdf_path: str,
+    source_file: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    page_selection: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    cache_dir: Optional[str] = PARSE_CACHE_DIR,
+    progress: Optional[Callable[[int, int], None]] = None,
+    content_hash: Optional[str] = None,
+    timings: Optional[Dict[str, float]] = None,
+    cancel: Optional[Any] = None,
+    blocks_out: Optional[str] = None,
+) -> Dict:
+    """Runs the full pipeline on a PDF and returns the hierarchy.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        source_file (str, optional): Name recorded in the metadata (default: pdf_path).
+        pages (Iterable[int], optional): 1-based page numbers to process (default: all).
+        page_selection (str, optional): Original page spec, recorded in the metadata.
+        backend (str): Extraction backend name (see src.core.backends.BACKENDS).
+        cache_dir (str, optional): Parse cache directory; None disables caching.
+        progress (callable, optional): Called as progress(pages_done, pages_total)
+            while pages are parsed (not at all on a parse cache hit).
+        content_hash (str, optional): SHA-256 of the file if already known (e.g.
+            computed while the upload was received); saves re-reading it for the cache key.
+        timings (dict, optional): Filled with seconds spent per stage, keyed
+            parse_pdf, enrich_blocks_with_features, classify_headings, build_hierarchy.
+        cancel (optional): Flag with is_set(); checked before each page and stage.
+        blocks_out (str, optional): Also export the classified blocks (features,
+            scores, bboxes) to this directory (see src.core.block_export).
+    Returns:
+        Dict: build_hierarchy output ({"metadata": ..., "sections": [...]}).
+    Raises:
+        PipelineCancelled: if `cancel` was set.
+        Exception: if the PDF cannot be parsed.
+    """
+    check_cancelled = _cancel_check(cancel)
+    check_cancelled()
+    cache = get_parse_cache(cache_dir)
+    if cache is not None and content_hash is None:
+        content_hash = file_sha256(pdf_path)  # once, for both cache lookups
+    total_pages = cached_count_pages(pdf_path, cache, content_hash)
+    if pages is not None:
+        pages = sorted(p for p in set(pages) if 1 <= p <= total_pages)
+
+    on_page = None
+    if progress is not None or cancel is not None:
+        pages_total = total_pages if pages is None else len(pages)
+        done = []
+
+        def on_page(page_num: int) -> None:
+            done.append(page_num)
+            if progress is not None:
+                progress(len(done), pages_total)
+            check_cancelled()
+
+    if timings is None:
+        timings = {}
+    t0 = time.perf_counter()
+    table = cached_parse_pdf_table(
+        pdf_path,
+        cache,
+        pages=pages,
+        backend=backend,
+        content_hash=content_hash,
+        on_page=on_page,
+    )
+    check_cancelled()
+    t1 = time.perf_counter()
+    enriched = enrich_blocks_with_features(table)
+    t2 = time.perf_counter()
+    classified = classify_headings(enriched)
+    t3 = time.perf_counter()
+    timings.update(parse_pdf=t1 - t0, enrich_blocks_with_features=t2 - t1, classify_headings=t3 - t2)
+
+    metadata = {
+        "source_file": source_file or pdf_path,
+        "total_blocks": len(classified),
+        "total_pages": total_pages,
+    }
+    if page_selection is not None:
+        metadata["page_selection"] = page_selection
+    tree = build_hierarchy(classified, metadata)
+    timings["build_hierarchy"] = time.perf_counter() - t3
+    if blocks_out is not None:
+        t4 = time.perf_counter()
+        export_blocks(classified, blocks_out, source_file=metadata["source_file"])
+        timings["export_blocks"] = time.perf_counter() - t4
+    return tree
+
+
+def run_pipeline_timed(pdf_path: str, **kwargs) -> Tuple[Dict, Dict[str, float]]:
+    """run_pipeline for worker processes: returns (hierarchy, per-stage timings).
+
+    A timings dict passed to run_pipeline in a worker never makes it back to
+    the caller, so this returns it alongside the result instead.
+    """
+    timings: Dict[str, float] = {}
+    return run_pipeline(pdf_path, timings=timings, **kwargs), timings
+
+
+def stream_pipeline(
+    pdf_path: str,
+    emit: Callable[[str, Dict], None],
+    source_file: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    page_selection: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    cancel: Optional[Any] = None,
+) -> Dict:
+    """Runs the pipeline page by page, reporting progress and sections as they are ready.
+
+    Blocks flow lazily from the parser through feature engineering and
+    classification into tree_builder.iter_sections, so each top-level section
+    is emitted as soon as the next one starts rather than after the last page.
+    emit(event, data) is called with:
+        "progress": {"page", "pages_done", "pages_total"} after each parsed page,
+        "section": {"index", "section"} for each completed top-level section,
+        "done": {"metadata"} once the whole document is processed.
+    The emitted sections, in order, equal run_pipeline(...)["sections"]. The parse
+    cache is not consulted: the point of streaming is to report pages as they are parsed.
+
+    Args:
+        pdf_path (str): Path to PDF file.
+        emit (callable): Receives (event name, JSON-serializable data).
+        source_file, pages, page_selection, backend, cancel: As for run_pipeline.
+    Returns:
+        Dict: The document metadata (as also sent with "done").
+    Raises:
+        PipelineCancelled: if `cancel` was set.
+        Exception: if the PDF cannot be parsed.
+    """
+    check_cancelled = _cancel_check(cancel)
+    check_cancelled()
+    total_pages = count_pages(pdf_path)
+    if pages is not None:
+        pages = sorted(p for p in set(pages) if 1 <= p <= total_pages)
+    pages_total = total_pages if pages is None else len(pages)
+    pages_done = 0
+    total_blocks = 0
+
+    def on_page(page_num: int) -> None:
+        nonlocal pages_done
+        pages_done += 1
+        emit("progress", {"page": page_num, "pages_done": pages_done, "pages_total": pages_total})
+        check_cancelled()
+
+    def counted(blocks: Iterable[Dict]) -> Iterable[Dict]:
+        nonlocal total_blocks
+        for block in blocks:
+            total_blocks += 1
+            yield block
+
+    blocks = iter_blocks(pdf_path, pages=pages, backend=backend, on_page=on_page)
+    classified = counted(iter_classified_blocks(iter_enriched_blocks(blocks)))
+    for index, section in enumerate(iter_sections(classified)):
+        emit("section", {"index": index, "section": section})
+
+    metadata = {
+        "source_file": source_file or pdf_path,
+        "total_blocks": total_blocks,
+        "total_pages": total_pages,
+    }
+    if page_selection is not None:
+        metadata["page_selection"] = page_selection
+    emit("done", {"metadata": metadata})
+    return metadata
@@ -0,0 +1,119 @@
+"""JSON encoding of hierarchies: fast when orjson is installed, and streamable.
+
+dumps() and loads() use orjson when it is importable and fall back to the
+standard library otherwise. Both encoders produce equivalent JSON values:
+UTF-8 without ASCII escaping, either compact or indented by two spaces like
+json.dump(..., indent=2), and NaN/infinity written as null (JSON has no
+literal for them). Float spelling may differ (orjson writes 1e-05 as
+0.00001 and 1e16 as 1e16, the stdlib 1e-05 and 1e+16); the numbers read
+back the same.
+
+A 50 MB hierarchy is still 50 MB of text when encoded in one go. iter_json()
+yields the same bytes in pieces instead: the list at a given key path (the
+hierarchy's "sections") is encoded one item at a time, so a file or HTTP
+response can be written while only one top-level section is held in encoded
+form.
+"""
+
+import json
+import math
+from typing import Any, Iterator, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces equivalent JSON, just slower
+    orjson = None
+
+STREAM_CHUNK_BYTES = 64 * 1024  # small sections are joined into pieces of about this size
+INDENT = b"  "
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encodes `obj` as UTF-8 JSON, compact or indented by two spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass  # e.g. non-str keys or huge ints; the stdlib encoder handles or reports them
+    options = {"indent": 2} if pretty else {"separators": (",", ":")}
+    try:
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, **options).encode("utf-8")
+    except ValueError:  # NaN or infinity somewhere: write null, like orjson
+        return json.dumps(_finite(obj), ensure_ascii=False, **options).encode("utf-8")
+
+
+def _finite(value: Any) -> Any:
+    """Copy of `value` with NaN and infinite floats replaced by None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def loads(data: Any) -> Any:
+    """Decodes JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _nested(encoded: bytes, depth: int, pretty: bool) -> bytes:
+    """Re-indents a pretty encoding for a value nested `depth` levels deep (JSON strings never hold raw newlines)."""
+    if not pretty or depth == 0:
+        return encoded
+    return encoded.replace(b"\n", b"\n" + INDENT * depth)
+
+
+def _iter_value(value: Any, path: Tuple[str, ...], pretty: bool, depth: int) -> Iterator[bytes]:
+    if path and isinstance(value, dict) and path[0] in value:
+        items = value.items()
+        opening, closing = b"{", b"}"
+    elif not path and isinstance(value, list) and value:
+        items = ((None, item) for item in value)
+        opening, closing = b"[", b"]"
+    else:
+        yield _nested(dumps(value, pretty), depth, pretty)
+        return
+
+    yield opening
+    for i, (key, item) in enumerate(items):
+        separator = b"," if i else b""
+        if pretty:
+            separator += b"\n" + INDENT * (depth + 1)
+        if key is not None:
+            separator += dumps(key) + (b": " if pretty else b":")
+        yield separator
+        if key is not None and key == path[0]:
+            yield from _iter_value(item, path[1:], pretty, depth + 1)
+        else:
+            yield _nested(dumps(item, pretty), depth + 1, pretty)
+    yield (b"\n" + INDENT * depth if pretty else b"") + closing
+
+
+def iter_json(obj: Any, stream: Sequence[str] = (), pretty: bool = False) -> Iterator[bytes]:
+    """Yields the JSON encoding of `obj` in pieces; b"".join() of them equals dumps(obj, pretty).
+
+    Args:
+        obj: Value to encode.
+        stream: Key path to a list inside `obj` (e.g. ("hierarchy", "sections"))
+            whose items are encoded one at a time. Missing keys just mean no streaming.
+        pretty: Indent by two spaces instead of compact output.
+    """
+    buffer = bytearray()
+    for piece in _iter_value(obj, tuple(stream), pretty, 0):
+        buffer += piece
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def write_json(obj: Any, path: str, stream: Sequence[str] = (), pretty: bool = True) -> None:
+    """Writes `obj` to `path` as JSON piece by piece (see iter_json)."""
+    with open(path, "wb") as f:
+        for piece in iter_json(obj, stream, pretty):
+            f.write(piece)
@@ -3,7 +3,6 @@
 import streamlit as st
 import tempfile
 import os
-import json
 import time
 import sys
 
@@ -13,10 +12,11 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.core.pdf_parser import parse_pdf
+from src.core.cache import cached_parse_pdf, get_parse_cache
 from src.features.feature_engineer import enrich_blocks_with_features
 from src.hierarchy.heading_classifier import classify_headings
 from src.hierarchy.tree_builder import build_hierarchy
+from src.serialization import dumps
 
 st.set_page_config(page_title="DocTree.AI - PDF Hierarchy Extractor", page_icon="🌳", layout="wide")
 
@@ -118,7 +118,7 @@ if uploaded_file:
             t0 = time.time()
             # Show just one spinner for the whole pipeline, to reduce visual noise
             with st.spinner("Running full extraction pipeline..."):
-                blocks = parse_pdf(st.session_state.temp_file_path)
+                blocks = cached_parse_pdf(st.session_state.temp_file_path, get_parse_cache())
                 
                 # Validate PDF extraction
                 if not blocks:
@@ -187,7 +187,7 @@ if uploaded_file:
         with st.expander("Show Raw JSON", expanded=False):
             st.json(st.session_state.tree)
 
-        json_bytes = json.dumps(st.session_state.tree, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = dumps(st.session_state.tree, pretty=True)
         st.download_button(
             label="💾 Download JSON",
             data=json_bytes,
@@ -0,0 +1,6 @@
+"""Test session setup."""
+import os
+import tempfile
+
+# The API opens its job store at import time; keep it out of the checkout
+os.environ.setdefault("DOCTREE_JOB_DIR", tempfile.mkdtemp(prefix="doctree-test-jobs-"))
@@ -0,0 +1,81 @@
+"""Tests for cost-based admission control."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.admission import AdmissionRejected, PageBudget, estimate_cost
+from src.api.result_cache import ResultCache
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def test_estimate_cost_uses_pages_or_size():
+    assert estimate_cost(10, 1000, bytes_per_page=1000) == 10
+    assert estimate_cost(2, 50_000, bytes_per_page=1000) == 50
+    assert estimate_cost(0, 0, bytes_per_page=1000) == 1
+
+
+def test_small_documents_pass_a_waiting_large_one():
+    async def scenario():
+        budget = PageBudget(100, max_waiting=4, max_bypass_sec=60)
+        await budget.acquire(60)
+        large = asyncio.ensure_future(budget.acquire(80))
+        await asyncio.sleep(0)
+        assert budget.waiting == 1
+        assert await budget.acquire(30) == 30  # fits in what is left; does not wait
+        budget.release(30)
+        assert not large.done()
+        budget.release(60)
+        assert await large == 80
+        assert budget.in_use == 80
+
+    asyncio.run(scenario())
+
+
+def test_long_waiting_document_stops_overtaking():
+    async def scenario():
+        budget = PageBudget(100, max_waiting=4, max_bypass_sec=0)
+        await budget.acquire(60)
+        large = asyncio.ensure_future(budget.acquire(80))
+        await asyncio.sleep(0)
+        small = asyncio.ensure_future(budget.acquire(10))
+        await asyncio.sleep(0)
+        assert not small.done()  # the large document has waited long enough
+        budget.release(60)
+        assert await large == 80
+        assert await small == 10
+
+    asyncio.run(scenario())
+
+
+def test_wait_list_is_bounded_and_cancellation_frees_it():
+    async def scenario():
+        budget = PageBudget(10, max_waiting=1, max_bypass_sec=60)
+        assert await budget.acquire(500) == 10  # capped at the budget
+        waiter = asyncio.ensure_future(budget.acquire(5))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await budget.acquire(5)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert budget.waiting == 0
+        budget.release(10)
+        assert budget.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_extract_returns_503_when_budget_wait_list_is_full(monkeypatch):
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    monkeypatch.setattr(server, "page_budget", PageBudget(1, max_waiting=0, max_bypass_sec=60))
+    server.page_budget.in_use = 1  # something else holds the whole budget
+    with open(SAMPLE_PDF, "rb") as f:
+        response = TestClient(server.app).post(
+            "/extract", files={"file": ("simple_doc.pdf", f.read(), "application/pdf")}
+        )
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) > 0
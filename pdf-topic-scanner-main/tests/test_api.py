@@ -1,6 +1,10 @@
 """Comprehensive backend API tests for DocTree.AI."""
+import threading
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from src.api import server
 from src.api.server import app
 import io
 
@@ -92,9 +96,8 @@ class TestExtractEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert data["ok"] is True
-        assert "duration_sec" in data
         assert "hierarchy" in data
-        assert data["duration_sec"] > 0
+        assert float(response.headers["Server-Timing"].split("dur=")[1]) > 0
     
     def test_extract_response_structure(self):
         """Extract response should have correct structure."""
@@ -111,7 +114,7 @@ class TestExtractEndpoint:
         
         # Check response structure
         assert isinstance(data["ok"], bool)
-        assert isinstance(data["duration_sec"], (int, float))
+        assert set(data) == {"ok", "hierarchy"}  # timing is in Server-Timing, not the ETag-validated body
         assert isinstance(data["hierarchy"], dict)
         
         # Check hierarchy structure
@@ -126,6 +129,40 @@ class TestExtractEndpoint:
         assert "total_pages" in metadata
 
 
+    def test_extract_with_page_selection(self):
+        """Extract should only process the requested pages but report true page count."""
+        with open("tests/sample_pdfs/simple_doc.pdf", "rb") as f:
+            pdf_content = f.read()
+
+        response = client.post(
+            "/extract?pages=1-2",
+            files={"file": ("simple_doc.pdf", pdf_content, "application/pdf")}
+        )
+
+        assert response.status_code == 200
+        metadata = response.json()["hierarchy"]["metadata"]
+        assert metadata["total_pages"] == 17
+        assert metadata["page_selection"] == "1-2"
+
+    def test_extract_rejects_invalid_page_selection(self):
+        """Extract should reject malformed page selections."""
+        response = client.post(
+            "/extract?pages=5-2",
+            files={"file": ("test.pdf", b"%PDF-1.4", "application/pdf")}
+        )
+        assert response.status_code == 400
+
+    def test_extract_rejects_huge_page_range_quickly(self):
+        """A huge range is refused before it is expanded (it would take gigabytes)."""
+        t0 = time.perf_counter()
+        response = client.post(
+            "/extract?pages=1-2000000000",
+            files={"file": ("test.pdf", b"%PDF-1.4", "application/pdf")}
+        )
+        assert response.status_code == 400
+        assert time.perf_counter() - t0 < 1
+
+
 class TestFileSizeValidation:
     """Test file size validation."""
     
@@ -143,6 +180,59 @@ class TestFileSizeValidation:
         assert response.status_code in [400, 413]
 
 
+class TestBackpressure:
+    """Test that extraction runs off the event loop and is bounded."""
+
+    @pytest.fixture(autouse=True)
+    def no_rate_limit(self, monkeypatch, tmp_path):
+        # Keep these extra uploads out of the shared per-IP rate limit budget
+        monkeypatch.setattr(server.limiter, "enabled", False)
+        # Starting the app also starts the job runner; keep its database out of the repo
+        store = server.JobStore(str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setattr(server, "job_runner", server.JobRunner(store, workers=1))
+        # Earlier tests upload the same PDF; make sure the pipeline really runs
+        monkeypatch.setattr(server, "result_cache", server.ResultCache(cache_dir=None))
+
+    def test_health_stays_responsive_during_extraction(self):
+        """/health should answer promptly while a PDF is being processed."""
+        with open("tests/sample_pdfs/simple_doc.pdf", "rb") as f:
+            pdf_content = f.read()
+
+        # One client = one event loop shared by both requests
+        with TestClient(app) as shared_client:
+            result = {}
+
+            def extract():
+                result["response"] = shared_client.post(
+                    "/extract",
+                    files={"file": ("simple_doc.pdf", pdf_content, "application/pdf")},
+                )
+
+            worker = threading.Thread(target=extract)
+            worker.start()
+            latencies = []
+            while worker.is_alive():
+                t0 = time.perf_counter()
+                assert shared_client.get("/health").status_code == 200
+                latencies.append(time.perf_counter() - t0)
+                time.sleep(0.05)
+            worker.join()
+
+        assert result["response"].status_code == 200
+        assert len(latencies) > 5
+        assert max(latencies) < 1.0
+
+    def test_extract_returns_503_when_saturated(self, monkeypatch):
+        """A full queue should be refused with 503 and Retry-After."""
+        monkeypatch.setattr(server.pipeline_pool, "in_flight", server.pipeline_pool.capacity)
+        response = client.post(
+            "/extract",
+            files={"file": ("test.pdf", b"%PDF-1.4", "application/pdf")}
+        )
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) > 0
+
+
 class TestCORSHeaders:
     """Test CORS configuration."""
     
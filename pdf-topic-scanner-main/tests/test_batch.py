@@ -0,0 +1,79 @@
+"""Tests for the multi-document batch endpoint."""
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.result_cache import ResultCache
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+@pytest.fixture
+def batch_client(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    return TestClient(server.app)
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_isolates_per_document_errors(batch_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+    response = batch_client.post(
+        "/extract/batch?pages=1",
+        files=[
+            ("files", ("a.pdf", pdf_content, "application/pdf")),
+            ("files", ("broken.pdf", b"%PDF-1.4 not really", "application/pdf")),
+            ("files", ("notes.txt", b"hello", "text/plain")),
+            ("files", ("b.pdf", pdf_content, "application/pdf")),
+        ],
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = _lines(response)
+    assert lines[-1]["done"] is True
+    assert (lines[-1]["documents"], lines[-1]["failed"]) == (4, 2)
+    results = {line["filename"]: line for line in lines[:-1]}
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1, 2, 3]
+    assert results["a.pdf"]["ok"] and results["b.pdf"]["ok"]
+    assert results["b.pdf"]["hierarchy"]["metadata"]["source_file"] == "b.pdf"
+    assert results["a.pdf"]["hierarchy"]["sections"] == results["b.pdf"]["hierarchy"]["sections"]
+    assert not results["broken.pdf"]["ok"]
+    assert results["notes.txt"]["error"] == "Only PDF files are accepted"
+
+
+def test_batch_reads_zip_archives(batch_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("docs/", "")
+        zf.writestr("docs/one.pdf", pdf_content)
+        zf.writestr("docs/two.pdf", pdf_content)
+    response = batch_client.post(
+        "/extract/batch?pages=1", files={"files": ("docs.zip", archive.getvalue(), "application/zip")}
+    )
+    lines = _lines(response)
+    assert sorted(line["filename"] for line in lines[:-1]) == ["docs/one.pdf", "docs/two.pdf"]
+    assert all(line["ok"] for line in lines[:-1])
+    assert {line["cache"] for line in lines[:-1]} <= {"HIT", "MISS"}
+
+
+def test_batch_rejects_bad_archives_and_oversized_batches(batch_client, monkeypatch):
+    response = batch_client.post("/extract/batch", files={"files": ("docs.zip", b"not a zip", "application/zip")})
+    assert response.status_code == 400
+
+    monkeypatch.setattr(server, "BATCH_MAX_DOCUMENTS", 1)
+    response = batch_client.post(
+        "/extract/batch",
+        files=[("files", ("a.pdf", b"%PDF", "application/pdf")), ("files", ("b.pdf", b"%PDF", "application/pdf"))],
+    )
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+"""Tests for CLI batch extraction with a resumable manifest."""
+import json
+import os
+import shutil
+
+import pytest
+
+from src import batch_runner
+from src.batch_runner import expand_inputs, output_paths, process_document, read_manifest, run_batch
+from src.core.block_export import open_blocks
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def _crash_on_marked(pdf_path, *args):
+    if "crash" in os.path.basename(pdf_path):
+        os._exit(1)  # like an OOM kill of the worker
+    return process_document(pdf_path, *args)
+
+
+@pytest.fixture
+def input_tree(tmp_path):
+    root = tmp_path / "in"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    shutil.copy(SAMPLE_PDF, root / "a" / "doc.pdf")
+    shutil.copy(SAMPLE_PDF, root / "b" / "doc.pdf")
+    (root / "b" / "broken.pdf").write_bytes(b"%PDF-1.4 not really")
+    (root / "b" / "notes.txt").write_text("not a pdf")
+    return root
+
+
+def test_expand_inputs_handles_dirs_globs_and_files(input_tree):
+    a_doc = os.path.normpath(str(input_tree / "a" / "doc.pdf"))
+    assert expand_inputs([str(input_tree)]) == sorted([
+        a_doc,
+        os.path.normpath(str(input_tree / "b" / "broken.pdf")),
+        os.path.normpath(str(input_tree / "b" / "doc.pdf")),
+    ])
+    assert expand_inputs([str(input_tree / "*" / "doc.pdf"), a_doc]) == sorted([
+        a_doc, os.path.normpath(str(input_tree / "b" / "doc.pdf")),
+    ])
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([str(input_tree / "missing" / "*.pdf")])
+
+
+def test_output_paths_mirror_the_input_tree(input_tree, tmp_path):
+    paths = expand_inputs([str(input_tree)])
+    outputs = output_paths(paths, str(tmp_path / "out"))
+    assert outputs[str(input_tree / "a" / "doc.pdf")] == str(tmp_path / "out" / "a" / "doc.json")
+    assert outputs[str(input_tree / "b" / "doc.pdf")] == str(tmp_path / "out" / "b" / "doc.json")
+
+
+def test_run_batch_records_manifest_and_resumes(input_tree, tmp_path):
+    out_dir = str(tmp_path / "out")
+    paths = expand_inputs([str(input_tree)])
+
+    counts = run_batch(paths, out_dir, workers=2, pages=[1], page_selection="1", cache_dir=None)
+    assert counts == {"total": 3, "skipped": 0, "ok": 2, "failed": 1}
+
+    records = read_manifest(os.path.join(out_dir, "manifest.jsonl"))
+    good = records[str(input_tree / "a" / "doc.pdf")]
+    assert good["status"] == "ok"
+    assert len(good["sha256"]) == 64
+    assert good["pages"] > 0 and good["seconds"] >= 0
+    assert "parse_pdf" in good["timings"]
+    with open(good["output"], encoding="utf-8") as f:
+        assert json.load(f)["metadata"]["page_selection"] == "1"
+    bad = records[str(input_tree / "b" / "broken.pdf")]
+    assert bad["status"] == "failed" and bad["error"]
+
+    # A rerun only retries the failure; a changed file is redone
+    counts = run_batch(paths, out_dir, workers=2, pages=[1], page_selection="1", cache_dir=None)
+    assert counts == {"total": 3, "skipped": 2, "ok": 0, "failed": 1}
+    os.utime(input_tree / "b" / "doc.pdf", ns=(0, 0))
+    counts = run_batch(paths, out_dir, workers=2, pages=[1], page_selection="1", cache_dir=None)
+    assert counts == {"total": 3, "skipped": 1, "ok": 1, "failed": 1}
+
+
+def test_run_batch_redoes_documents_extracted_with_other_options(input_tree, tmp_path):
+    out_dir = str(tmp_path / "out")
+    paths = [str(input_tree / "a" / "doc.pdf")]
+    run_batch(paths, out_dir, pages=[1], page_selection="1", cache_dir=None)
+    record = read_manifest(os.path.join(out_dir, "manifest.jsonl"))[paths[0]]
+    assert record["options"] == {"pages": "1", "page_selection": "1", "backend": "pdfplumber", "pretty": True, "blocks": False}
+
+    assert run_batch(paths, out_dir, pages=[1], page_selection="1", cache_dir=None)["skipped"] == 1
+    assert run_batch(paths, out_dir, pages=[1, 2], page_selection="1-2", cache_dir=None)["ok"] == 1
+    assert run_batch(paths, out_dir, pages=[1, 2], page_selection="1-2", cache_dir=None, pretty=False)["ok"] == 1
+    assert run_batch(paths, out_dir, pages=[1, 2], page_selection="1-2", cache_dir=None, pretty=False)["skipped"] == 1
+    with open(os.path.join(out_dir, "doc.json"), encoding="utf-8") as f:
+        assert json.load(f)["metadata"]["page_selection"] == "1-2"
+
+
+def test_read_manifest_ignores_truncated_line(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text('{"path": "a.pdf", "status": "failed"}\n{"path": "a.pdf", "status": "ok"}\n{"path": "b.p')
+    assert read_manifest(str(manifest)) == {"a.pdf": {"path": "a.pdf", "status": "ok"}}
+
+
+def test_run_batch_exports_blocks(input_tree, tmp_path):
+    out_dir = str(tmp_path / "out")
+    paths = [str(input_tree / "a" / "doc.pdf")]
+    run_batch(paths, out_dir, pages=[1], page_selection="1", cache_dir=None)
+
+    # Asking for block exports redoes documents extracted without them
+    counts = run_batch(paths, out_dir, pages=[1], page_selection="1", cache_dir=None, blocks=True)
+    assert counts["ok"] == 1
+    record = read_manifest(os.path.join(out_dir, "manifest.jsonl"))[paths[0]]
+    assert record["blocks_output"] == str(tmp_path / "out" / "doc.blocks")
+    assert len(open_blocks(record["blocks_output"])) == record["blocks"]
+    assert run_batch(paths, out_dir, pages=[1], page_selection="1", cache_dir=None, blocks=True)["skipped"] == 1
+
+
+def test_process_document_reports_vanished_file(tmp_path):
+    record = process_document(str(tmp_path / "gone.pdf"), str(tmp_path / "gone.json"))
+    assert record["status"] == "failed"
+    assert record["error"].startswith("FileNotFoundError")
+    assert record["size"] is None and record["mtime_ns"] is None
+
+
+def test_run_batch_survives_a_worker_crash(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_runner, "process_document", _crash_on_marked)
+    root = tmp_path / "in"
+    root.mkdir()
+    for name in ["1.pdf", "2_crash.pdf", "3.pdf", "4.pdf", "5.pdf"]:
+        shutil.copy(SAMPLE_PDF, root / name)
+    out_dir = str(tmp_path / "out")
+
+    counts = run_batch(expand_inputs([str(root)]), out_dir, workers=1, pages=[1], page_selection="1", cache_dir=None)
+    assert counts["total"] == 5 and counts["ok"] + counts["failed"] == 5
+    records = read_manifest(os.path.join(out_dir, "manifest.jsonl"))
+    assert records[str(root / "2_crash.pdf")]["status"] == "failed"
+    assert "BrokenProcessPool" in records[str(root / "2_crash.pdf")]["error"]
+    # Documents after the crash run on fresh workers
+    assert records[str(root / "5.pdf")]["status"] == "ok"
@@ -0,0 +1,78 @@
+"""Tests for the memory-mappable columnar block export."""
+import json
+
+import numpy as np
+import pytest
+
+from src.core.block_export import export_blocks, open_blocks
+from src.core.block_table import BlockTable
+from src.core.pdf_parser import parse_pdf_table
+from src.features.feature_engineer import enrich_blocks_with_features
+from src.hierarchy.heading_classifier import classify_headings
+from src.pipeline import run_pipeline
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+@pytest.fixture(scope="module")
+def classified():
+    return classify_headings(enrich_blocks_with_features(parse_pdf_table(SAMPLE_PDF)))
+
+
+def test_export_round_trips_features_scores_and_bboxes(classified, tmp_path):
+    export = open_blocks(export_blocks(classified, str(tmp_path / "doc.blocks"), source_file=SAMPLE_PDF))
+
+    assert len(export) == len(classified)
+    assert isinstance(export["x0"], np.memmap)
+    assert isinstance(export["feat_font_rank"], np.memmap)
+    assert export.schema["source_file"] == SAMPLE_PDF
+    assert export.texts() == classified.texts()
+    assert export.labels() == classified.classifications()
+    np.testing.assert_array_equal(export["heading_score"], classified.heading_score)
+    assert export.to_table().to_dicts() == classified.to_dicts()
+
+
+def test_export_supports_column_scans_without_decoding(classified, tmp_path):
+    export = open_blocks(export_blocks(classified, str(tmp_path / "doc.blocks")))
+    h1 = export.schema["classification_labels"].index("H1")
+    rows = np.flatnonzero(np.asarray(export["classification"]) == h1)
+    assert export.texts(rows) == [b["text"] for b in classified.to_dicts() if b["classification"] == "H1"]
+
+
+def test_export_handles_block_dicts_and_non_ascii_text(tmp_path):
+    blocks = [
+        {"text": "Überblick", "page": 1, "font_size": 18.0, "font_family": "Arial-Bold", "is_bold": True,
+         "is_italic": False, "bbox": {"x0": 1.0, "y0": 2.0, "x1": 3.0, "y1": 4.0},
+         "heading_score": 1.0, "classification": "H1"},
+        {"text": "naïve café", "page": 2, "font_size": 10.0, "font_family": "Arial", "is_bold": False,
+         "is_italic": False, "bbox": {"x0": 5.0, "y0": 6.0, "x1": 7.0, "y1": 8.0},
+         "heading_score": 0.0, "classification": "BODY"},
+    ]
+    export = open_blocks(export_blocks(blocks, str(tmp_path / "outline.blocks")))
+    assert export.texts() == ["Überblick", "naïve café"]
+    assert export.labels() == ["H1", "BODY"]
+    assert export.to_table().to_dicts() == blocks
+
+    empty = open_blocks(export_blocks(BlockTable.from_blocks([]), str(tmp_path / "empty.blocks")))
+    assert len(empty) == 0 and empty.texts() == []
+
+
+def test_export_replaces_previous_and_rejects_foreign_dirs(classified, tmp_path):
+    path = str(tmp_path / "doc.blocks")
+    export_blocks(classified, path)
+    export_blocks(BlockTable.from_blocks([]), path)
+    assert len(open_blocks(path)) == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["doc.blocks"]
+
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "schema.json").write_text(json.dumps({"format": "something-else"}))
+    with pytest.raises(ValueError):
+        open_blocks(str(tmp_path / "other"))
+
+
+def test_run_pipeline_exports_blocks(tmp_path):
+    timings = {}
+    tree = run_pipeline(SAMPLE_PDF, cache_dir=None, blocks_out=str(tmp_path / "doc.blocks"), timings=timings)
+    export = open_blocks(str(tmp_path / "doc.blocks"))
+    assert len(export) == tree["metadata"]["total_blocks"]
+    assert "export_blocks" in timings
@@ -0,0 +1,47 @@
+"""Tests for the columnar BlockTable pipeline."""
+import copy
+
+import pytest
+
+from src.core.block_table import BlockTable
+from src.core.pdf_parser import parse_pdf, parse_pdf_table
+from src.features.feature_engineer import enrich_blocks_with_features
+from src.hierarchy.heading_classifier import classify_headings
+from src.hierarchy.tree_builder import build_hierarchy
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+@pytest.fixture(scope="module")
+def serial_blocks():
+    return parse_pdf(SAMPLE_PDF)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return parse_pdf_table(SAMPLE_PDF)
+
+
+def test_table_matches_parse_pdf(serial_blocks, table):
+    assert len(table) == len(serial_blocks)
+    assert table.to_dicts() == serial_blocks
+    assert len(table.fonts) < len(serial_blocks)  # font names are interned
+    assert BlockTable.from_blocks(serial_blocks).to_dicts() == serial_blocks
+
+
+def test_parallel_table_matches_serial(table):
+    assert parse_pdf_table(SAMPLE_PDF, workers=2).to_dicts() == table.to_dicts()
+
+
+def test_table_pipeline_matches_dict_pipeline(serial_blocks):
+    expected = classify_headings(enrich_blocks_with_features(copy.deepcopy(serial_blocks)))
+    classified = classify_headings(enrich_blocks_with_features(BlockTable.from_blocks(serial_blocks)))
+    assert classified.to_dicts() == expected
+    assert build_hierarchy(classified, {}) == build_hierarchy(expected, {})
+
+
+def test_save_load_round_trip(tmp_path):
+    classified = classify_headings(enrich_blocks_with_features(parse_pdf_table(SAMPLE_PDF, pages=[1, 2])))
+    path = tmp_path / "blocks.npz"
+    classified.save(str(path))
+    assert BlockTable.load(str(path)).to_dicts() == classified.to_dicts()
@@ -0,0 +1,77 @@
+"""Tests for cancelling pipeline work whose client went away."""
+import asyncio
+import time
+
+import pytest
+
+from src.api import server
+from src.api.admission import PageBudget
+from src.api.result_cache import ResultCache
+from src.api.worker_pool import PipelinePool
+from src.core.cache import file_sha256
+from src.pipeline import PipelineCancelled, run_pipeline, stream_pipeline
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+class CancelAfter:
+    """Cancel flag that becomes set after `checks` calls to is_set()."""
+
+    def __init__(self, checks):
+        self.checks = checks
+
+    def is_set(self):
+        self.checks -= 1
+        return self.checks < 0
+
+
+def test_run_pipeline_stops_at_page_granularity():
+    pages_parsed = []
+    with pytest.raises(PipelineCancelled) as info:
+        run_pipeline(
+            SAMPLE_PDF, cache_dir=None, cancel=CancelAfter(3),
+            progress=lambda done, total: pages_parsed.append(done),
+        )
+    assert pages_parsed == [1, 2, 3]  # checked once up front, then after every page
+    assert info.value.cpu_seconds >= 0
+
+
+def test_stream_pipeline_honours_cancel_flag():
+    events = []
+    with pytest.raises(PipelineCancelled):
+        stream_pipeline(SAMPLE_PDF, lambda event, data: events.append(event), cancel=CancelAfter(1))
+    assert events == ["progress"]
+
+
+class GoneRequest:
+    """Stands in for a Request whose client has already disconnected."""
+
+    async def is_disconnected(self):
+        return True
+
+
+def test_disconnect_frees_worker_and_budget(monkeypatch):
+    pool = PipelinePool(workers=1, max_queue=1)
+    monkeypatch.setattr(server, "pipeline_pool", pool)
+    monkeypatch.setattr(server, "page_budget", PageBudget(1000, max_waiting=4, max_bypass_sec=60))
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    before = server.cancelled_total.value(endpoint="/test")
+
+    async def scenario():
+        with pytest.raises(server.ClientDisconnected):
+            await server._cached_pipeline(
+                SAMPLE_PDF, file_sha256(SAMPLE_PDF), "a.pdf", None, None, "/test", GoneRequest()
+            )
+        assert server.page_budget.in_use > 0  # held until the worker has actually stopped
+        deadline = time.time() + 60
+        while server._reapers and time.time() < deadline:
+            await asyncio.sleep(0.1)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert server.page_budget.in_use == 0
+    assert pool.in_flight == 0
+    assert server.cancelled_total.value(endpoint="/test") == before + 1
+    assert server.cancelled_cpu_seconds.value(endpoint="/test") > 0
@@ -0,0 +1,51 @@
+"""Startup guard: the CLI must not import heavy dependencies before it has work to do.
+
+Measured with `python -X importtime` in a fresh interpreter, so modules
+already imported by the test run do not hide anything.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("numpy", "pdfplumber", "pdfminer", "PIL", "pypdfium2")
+MAIN_IMPORT_BUDGET_US = 150_000  # cumulative import time of main.py; about 30ms when this was written
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(statement: str) -> dict:
+    """Runs `statement` under -X importtime; returns {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def heavy_imports(times: dict) -> list:
+    return sorted(name for name in times if name.split(".")[0] in HEAVY_MODULES)
+
+
+def test_cli_imports_no_heavy_dependencies():
+    times = import_times("import main")
+    assert heavy_imports(times) == []
+    assert times["main"] < MAIN_IMPORT_BUDGET_US, f"main.py took {times['main'] / 1000:.0f}ms to import"
+
+
+@pytest.mark.parametrize(
+    "module", ["src.core.backends", "src.core.pdf_parser", "src.core.cache", "src.core.outline", "src.pipeline"]
+)
+def test_pipeline_modules_defer_pdf_libraries(module):
+    times = import_times(f"import {module}")
+    assert [name for name in heavy_imports(times) if not name.startswith("numpy")] == []
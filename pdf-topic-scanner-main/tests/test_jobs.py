@@ -0,0 +1,118 @@
+"""Tests for the asynchronous job API and its SQLite job store."""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.job_store import STATUS_QUEUED, STATUS_RUNNING, JobStore
+from src.api.jobs import JobRunner
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+@pytest.fixture
+def job_client(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(server, "job_store", store)
+    monkeypatch.setattr(server, "job_runner", JobRunner(store, workers=1))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    with TestClient(server.app) as client:
+        yield client
+
+
+def _wait_for(client, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_lifecycle(job_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        response = job_client.post(
+            "/jobs?pages=1-2",
+            files={"file": ("simple_doc.pdf", f.read(), "application/pdf")},
+        )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    job = _wait_for(job_client, job_id)
+    assert job["status"] == "done"
+    assert job["progress"] == 1.0
+
+    result = job_client.get(f"/jobs/{job_id}/result").json()
+    metadata = result["hierarchy"]["metadata"]
+    assert metadata["source_file"] == "simple_doc.pdf"
+    assert metadata["page_selection"] == "1-2"
+    assert metadata["total_pages"] == 17
+
+
+def test_unknown_and_unfinished_jobs(job_client):
+    assert job_client.get("/jobs/nope").status_code == 404
+    assert job_client.get("/jobs/nope/result").status_code == 404
+
+    job_id = server.job_store.create("queued.pdf", "/nonexistent.pdf")
+    server.job_store.claim_next()
+    assert job_client.get(f"/jobs/{job_id}/result").status_code == 409
+
+
+def test_jobs_are_disabled_without_a_job_dir(monkeypatch):
+    monkeypatch.setattr(server, "job_store", None)
+    monkeypatch.setattr(server, "job_runner", None)
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    with TestClient(server.app) as client:
+        response = client.post("/jobs", files={"file": ("a.pdf", b"%PDF-1.4", "application/pdf")})
+        assert response.status_code == 503
+        assert "DOCTREE_JOB_DIR" in response.json()["detail"]
+        assert client.get("/jobs/abc").status_code == 503
+
+
+def test_interrupted_jobs_are_requeued(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("src.api.job_store.time.time", lambda: clock[0])
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    first = store.create("a.pdf", "/tmp/a.pdf", pages=[1, 3], page_selection="1,3")
+    second = store.create("b.pdf", "/tmp/b.pdf")
+    third = store.create("c.pdf", "/tmp/c.pdf")
+    assert store.claim_next("dead-runner")["id"] == first
+    assert store.claim_next("live-runner")["id"] == second
+    assert store.get(first)["status"] == STATUS_RUNNING
+
+    # A sibling starting up leaves jobs with a fresh heartbeat alone
+    reopened = JobStore(store.db_path)
+    assert reopened.requeue_interrupted(stale_after_sec=30) == 0
+
+    # Only the runner that stopped sending heartbeats loses its job
+    clock[0] += 20
+    assert reopened.heartbeat("live-runner") == 1
+    clock[0] += 20
+    assert reopened.requeue_interrupted(stale_after_sec=30) == 1
+    job = reopened.get(first)
+    assert job["status"] == STATUS_QUEUED
+    assert job["owner"] is None
+    assert job["pages"] == [1, 3]
+    assert reopened.get(second)["status"] == STATUS_RUNNING
+    assert reopened.claim_next("live-runner")["id"] == first
+    assert reopened.claim_next("live-runner")["id"] == third
+    assert reopened.claim_next("live-runner") is None
+
+
+def test_old_databases_gain_the_heartbeat_columns(tmp_path):
+    import sqlite3
+
+    db_path = str(tmp_path / "jobs.sqlite3")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT NOT NULL, "
+            "pdf_path TEXT NOT NULL, content_hash TEXT, pages TEXT, page_selection TEXT, "
+            "progress REAL NOT NULL DEFAULT 0, error TEXT, result TEXT, created_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL, updated_at REAL NOT NULL)"
+        )
+    store = JobStore(db_path)
+    job_id = store.create("a.pdf", "/tmp/a.pdf")
+    assert store.claim_next("runner")["owner"] == "runner"
+    assert store.get(job_id)["heartbeat_at"] is not None
@@ -0,0 +1,67 @@
+"""Tests for the Prometheus metrics registry and the /metrics endpoint."""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.job_store import JobStore
+from src.api.metrics import Counter, Gauge, Histogram, Registry
+from src.api.result_cache import ResultCache
+from src.pipeline import run_pipeline_timed
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def test_registry_renders_text_format():
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "A counter.", ["kind"]))
+    histogram = registry.register(Histogram("h_seconds", "A histogram.", [0.1, 1]))
+    registry.register(Gauge("g", "A gauge.", lambda: {('a"b',): 2}, ["name"]))
+    counter.inc(kind="x")
+    counter.inc(2, kind="x")
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE c_total counter" in lines
+    assert 'c_total{kind="x"} 3' in lines
+    assert 'h_seconds_bucket{le="0.1"} 1' in lines
+    assert 'h_seconds_bucket{le="1"} 2' in lines
+    assert 'h_seconds_bucket{le="+Inf"} 3' in lines
+    assert "h_seconds_sum 5.55" in lines
+    assert "h_seconds_count 3" in lines
+    assert 'g{name="a\\"b"} 2' in lines
+
+
+def test_run_pipeline_timed_reports_every_stage():
+    tree, timings = run_pipeline_timed(SAMPLE_PDF, pages=[1], cache_dir=None)
+    assert tree["metadata"]["total_blocks"] > 0
+    assert set(timings) == {"parse_pdf", "enrich_blocks_with_features", "classify_headings", "build_hierarchy"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+@pytest.fixture
+def metrics_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    monkeypatch.setattr(server, "job_store", JobStore(str(tmp_path / "jobs.sqlite3")))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    return TestClient(server.app)
+
+
+def test_metrics_endpoint_after_extraction(metrics_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        assert metrics_client.post(
+            "/extract?pages=1", files={"file": ("a.pdf", f.read(), "application/pdf")}
+        ).status_code == 200
+
+    response = metrics_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for stage in ("parse_pdf", "enrich_blocks_with_features", "classify_headings", "build_hierarchy", "serialization"):
+        assert f'doctree_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert "doctree_document_pages_count" in text
+    assert "doctree_upload_bytes_count" in text
+    assert 'doctree_result_cache_lookups_total{result="miss"} 1' in text
+    assert "doctree_pipeline_queue_depth 0" in text
+    assert "doctree_worker_rss_bytes{pid=" in text
+    assert "process_resident_memory_bytes" in text
@@ -0,0 +1,136 @@
+"""Tests for the outline (bookmark) fast path."""
+import pytest
+
+from src.core.block_export import export_blocks, open_blocks
+from src.core.outline import is_plausible_outline, outline_blocks, read_outline
+from src.hierarchy.tree_builder import build_hierarchy
+
+PAGES = [
+    [("Introduction", 720), ("Welcome to the manual.", 690)],
+    [("Installation", 720), ("Requirements", 690), ("You need a computer.", 660)],
+    [("Usage", 720), ("Run the tool.", 690)],
+]
+
+# (title, level, page index, top-of-heading y in PDF coordinates)
+BOOKMARKS = [
+    ("Introduction", 1, 0, 735),
+    ("Installation", 1, 1, 735),
+    ("Requirements", 2, 1, 705),
+    ("Usage", 1, 2, 735),
+]
+
+
+def _write_outlined_pdf(path):
+    """Writes a small three-page PDF with a two-level bookmark outline."""
+    objects = {}
+    n_pages = len(PAGES)
+    page_ids = [4 + 2 * i for i in range(n_pages)]
+    outline_root = 4 + 2 * n_pages
+    item_ids = [outline_root + 1 + i for i in range(len(BOOKMARKS))]
+
+    objects[1] = f"<< /Type /Catalog /Pages 2 0 R /Outlines {outline_root} 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>"
+    objects[3] = "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    for pid, lines in zip(page_ids, PAGES):
+        stream = "".join(f"BT /F1 12 Tf 72 {y} Td ({text}) Tj ET\n" for text, y in lines)
+        objects[pid] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>"
+        )
+        objects[pid + 1] = f"<< /Length {len(stream)} >>\nstream\n{stream}endstream"
+
+    top_level = [i for i, b in enumerate(BOOKMARKS) if b[1] == 1]
+    objects[outline_root] = (
+        f"<< /Type /Outlines /First {item_ids[top_level[0]]} 0 R "
+        f"/Last {item_ids[top_level[-1]]} 0 R /Count {len(BOOKMARKS)} >>"
+    )
+    for i, (title, level, page_idx, y) in enumerate(BOOKMARKS):
+        siblings = [j for j, b in enumerate(BOOKMARKS) if b[1] == level and _parent(j) == _parent(i)]
+        pos = siblings.index(i)
+        parent = outline_root if level == 1 else item_ids[_parent(i)]
+        entry = f"<< /Title ({title}) /Parent {parent} 0 R /Dest [{page_ids[page_idx]} 0 R /XYZ 0 {y} 0]"
+        if pos > 0:
+            entry += f" /Prev {item_ids[siblings[pos - 1]]} 0 R"
+        if pos < len(siblings) - 1:
+            entry += f" /Next {item_ids[siblings[pos + 1]]} 0 R"
+        children = [j for j, b in enumerate(BOOKMARKS) if b[1] == level + 1 and _parent(j) == i]
+        if children:
+            entry += f" /First {item_ids[children[0]]} 0 R /Last {item_ids[children[-1]]} 0 R /Count {len(children)}"
+        objects[item_ids[i]] = entry + " >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for oid in sorted(objects):
+        offsets[oid] = len(out)
+        out += f"{oid} 0 obj\n{objects[oid]}\nendobj\n".encode("latin-1")
+    xref_pos = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for oid in range(1, size):
+        out += f"{offsets[oid]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def _parent(i):
+    """Index of the closest preceding bookmark one level up, or None."""
+    level = BOOKMARKS[i][1]
+    for j in range(i - 1, -1, -1):
+        if BOOKMARKS[j][1] == level - 1:
+            return j
+    return None
+
+
+@pytest.fixture(scope="module")
+def outlined_pdf(tmp_path_factory):
+    path = tmp_path_factory.mktemp("outline") / "manual.pdf"
+    _write_outlined_pdf(str(path))
+    return str(path)
+
+
+def test_read_outline_resolves_pages_and_levels(outlined_pdf):
+    entries = read_outline(outlined_pdf)
+    assert [(e["title"], e["level"], e["page"]) for e in entries] == [
+        ("Introduction", 1, 1),
+        ("Installation", 1, 2),
+        ("Requirements", 2, 2),
+        ("Usage", 1, 3),
+    ]
+    assert entries[2]["top"] == pytest.approx(792 - 705)
+    assert is_plausible_outline(entries)
+
+
+def test_sample_without_outline_is_not_plausible():
+    entries = read_outline("tests/sample_pdfs/simple_doc.pdf")
+    assert entries == []
+    assert not is_plausible_outline(entries)
+
+
+def test_toc_only_builds_skeleton(outlined_pdf):
+    tree = build_hierarchy(outline_blocks(outlined_pdf, toc_only=True), {})
+    assert [s["title"] for s in tree["sections"]] == ["Introduction", "Installation", "Usage"]
+    assert tree["sections"][1]["children"][0]["title"] == "Requirements"
+    assert all(not s["content"] for s in tree["sections"])
+
+
+def test_outline_with_body_text(outlined_pdf):
+    tree = build_hierarchy(outline_blocks(outlined_pdf), {})
+    intro, install, usage = tree["sections"]
+    assert intro["content"] == ["Welcometothemanual."]
+    assert install["content"] == []
+    assert install["children"][0]["content"] == ["Youneedacomputer."]
+    assert usage["content"] == ["Runthetool."]
+
+
+@pytest.mark.parametrize("toc_only", [True, False])
+def test_outline_blocks_export(outlined_pdf, tmp_path, toc_only):
+    blocks = outline_blocks(outlined_pdf, read_outline(outlined_pdf), toc_only=toc_only)
+    export = open_blocks(export_blocks(blocks, str(tmp_path / "manual.blocks"), source_file=outlined_pdf))
+    assert export.texts() == [b["text"] for b in blocks]
+    assert export.labels() == [b["classification"] for b in blocks]
+    headings = [i for i, b in enumerate(blocks) if b.get("source") == "outline"]
+    assert export.labels()[headings[0]] == "H1"
+    assert export["font_size"][headings].tolist() == [0.0] * len(headings)
+
@@ -0,0 +1,54 @@
+"""Tests for the content-hash keyed parse cache."""
+import os
+import time
+
+from src.core import cache as cache_module
+from src.core.cache import ParseCache, cached_count_pages, cached_parse_pdf, file_sha256, parse_cache_key
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def test_cache_key_depends_on_parse_settings():
+    digest = file_sha256(SAMPLE_PDF)
+    base = parse_cache_key(digest)
+    assert base == parse_cache_key(digest)
+    assert base != parse_cache_key(digest, y_tolerance=3)
+    assert base != parse_cache_key(digest, backend="pdfium")
+    assert base != parse_cache_key(digest, pages=[1, 2])
+
+
+def test_cached_parse_reuses_stored_blocks(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path))
+    first = cached_parse_pdf(SAMPLE_PDF, cache, pages=[1])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parse_pdf should not run on a cache hit")
+
+    monkeypatch.setattr(cache_module, "parse_pdf", fail)
+    assert cached_parse_pdf(SAMPLE_PDF, cache, pages=[1]) == first
+
+
+def test_cached_count_pages_skips_opening_the_pdf(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path))
+    total = cached_count_pages(SAMPLE_PDF, cache)
+    assert total > 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("count_pages should not run on a cache hit")
+
+    monkeypatch.setattr(cache_module, "count_pages", fail)
+    assert cached_count_pages(SAMPLE_PDF, cache, file_sha256(SAMPLE_PDF)) == total
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=10**9)
+    blocks = [{"text": "x" * 2000 + str(i)} for i in range(20)]
+    cache.put("old", blocks)
+    cache.put("new", blocks)
+    past = time.time() - 100
+    os.utime(tmp_path / "old.json.gz", (past, past))
+
+    cache.max_bytes = os.path.getsize(tmp_path / "new.json.gz")
+    cache.evict()
+    assert cache.get("old") is None
+    assert cache.get("new") == blocks
@@ -0,0 +1,93 @@
+"""Tests for the PDF parser against the bundled sample document."""
+import copy
+
+import pytest
+
+from src.core.backends import pdfplumber_words, words_to_columns
+from src.core.pdf_parser import (
+    count_pages,
+    iter_blocks,
+    parse_pdf,
+    _split_pages,
+    _words_to_blocks,
+    _words_to_blocks_loop,
+)
+from src.features.feature_engineer import enrich_blocks_with_features, iter_enriched_blocks
+from utils.validators import MAX_PAGE_NUMBER, parse_page_spec
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+@pytest.fixture(scope="module")
+def serial_blocks():
+    return parse_pdf(SAMPLE_PDF)
+
+
+def test_split_pages_covers_all_pages():
+    assert _split_pages(list(range(1, 11)), 3) == [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+    assert _split_pages([3, 9], 8) == [[3], [9]]
+
+
+def test_parallel_parse_matches_serial(serial_blocks):
+    parallel = parse_pdf(SAMPLE_PDF, workers=2)
+    assert parallel == serial_blocks
+
+
+def test_iter_blocks_matches_parse_pdf(serial_blocks):
+    streamed = iter_blocks(SAMPLE_PDF)
+    assert not isinstance(streamed, list)
+    assert list(streamed) == serial_blocks
+
+
+def test_iter_enriched_blocks_matches_batch(serial_blocks):
+    batch = enrich_blocks_with_features(copy.deepcopy(serial_blocks))
+    lazy = list(iter_enriched_blocks(copy.deepcopy(serial_blocks)))
+    assert lazy == batch
+
+
+def test_parse_page_spec():
+    assert parse_page_spec("1-3,7, 2") == [1, 2, 3, 7]
+    assert parse_page_spec(f"{MAX_PAGE_NUMBER}")[-1] == MAX_PAGE_NUMBER
+    for bad in ["", "0", "5-2", "a-b", "1-2000000000", f"{MAX_PAGE_NUMBER + 1}"]:
+        with pytest.raises(ValueError):
+            parse_page_spec(bad)
+
+
+def test_page_selection_keeps_absolute_page_numbers(serial_blocks):
+    selected = parse_pdf(SAMPLE_PDF, pages=[2, 5])
+    assert selected == [b for b in serial_blocks if b["page"] in (2, 5)]
+    assert parse_pdf(SAMPLE_PDF, pages=[2, 5], workers=2) == selected
+    assert count_pages(SAMPLE_PDF) == 17
+
+
+def test_pdfium_backend_produces_same_schema(serial_blocks):
+    fast = parse_pdf(SAMPLE_PDF, backend="pdfium")
+    assert len(fast) == len(serial_blocks)
+    assert set(fast[0]) == set(serial_blocks[0])
+    assert set(fast[0]["bbox"]) == {"x0", "y0", "x1", "y1"}
+    matching = sum(a["text"] == b["text"] for a, b in zip(fast, serial_blocks))
+    assert matching / len(serial_blocks) > 0.9
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        parse_pdf(SAMPLE_PDF, backend="nope")
+
+
+@pytest.mark.parametrize("y_tolerance", [0, 3, 5, 50])
+def test_vectorized_grouping_matches_loop(y_tolerance):
+    for page_num, words in pdfplumber_words(SAMPLE_PDF, pages=[1, 2, 3]):
+        expected = _words_to_blocks_loop(words, page_num, y_tolerance)
+        assert _words_to_blocks(words, page_num, y_tolerance) == expected
+        assert _words_to_blocks(words_to_columns(words), page_num, y_tolerance) == expected
+
+
+def test_vectorized_grouping_handles_padding_and_unsorted_words():
+    words = [
+        {"text": " Title ", "fontname": "Arial-Bold", "size": 14.0, "x0": 120.0, "x1": 160.0, "top": 10.0, "bottom": 24.0},
+        {"text": "Big", "fontname": "Arial-Bold", "size": 14.0, "x0": 50.0, "x1": 80.0, "top": 10.0, "bottom": 24.0},
+        {"text": "", "fontname": "Arial", "size": 10.0, "x0": 50.0, "x1": 50.0, "top": 40.0, "bottom": 50.0},
+        {"text": "(", "fontname": "Arial", "size": 10.0, "x0": 60.0, "x1": 62.0, "top": 40.0, "bottom": 50.0},
+        {"text": "body", "fontname": "Arial", "size": 10.0, "x0": 70.0, "x1": 90.0, "top": 45.0, "bottom": 55.0},
+    ]
+    assert _words_to_blocks(words, 1) == _words_to_blocks_loop(words, 1)
@@ -0,0 +1,37 @@
+"""Tests for the CLI stage profiler."""
+import json
+import tracemalloc
+
+import pytest
+
+from utils.profiling import StageProfiler, format_report
+
+
+def test_stage_profiler_measures_each_stage():
+    profiler = StageProfiler()
+    with profiler.stage("allocate"):
+        data = [bytearray(1024) for _ in range(1000)]
+    with pytest.raises(ValueError):
+        with profiler.stage("fails"):
+            raise ValueError("boom")
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    report = profiler.report(pages=10, file="doc.pdf")
+    assert report["file"] == "doc.pdf"
+    assert [s["stage"] for s in report["stages"]] == ["allocate", "fails"]
+    allocate = report["stages"][0]
+    assert allocate["peak_mem_bytes"] >= 1000 * 1024
+    assert allocate["wall_sec"] >= 0 and allocate["cpu_sec"] >= 0
+    assert report["total"]["peak_mem_bytes"] == allocate["peak_mem_bytes"]
+    json.dumps(report)  # archivable as-is
+    assert "allocate" in format_report(report)
+    del data
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage("parse_pdf"):
+        pass
+    assert profiler.stages == []
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,118 @@
+"""Tests for the shared page-cost rate limiter."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.rate_limit import PageRateLimiter, RateLimited
+from src.api.result_cache import ResultCache
+from src.api.worker_pool import PoolSaturated
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def test_buckets_are_shared_through_the_database(tmp_path):
+    db_path = str(tmp_path / "rate.sqlite3")
+    # Two instances stand in for two API processes on the same node
+    first = PageRateLimiter(db_path, capacity=20, refill_per_sec=0.001, request_cost=5)
+    second = PageRateLimiter(db_path, capacity=20, refill_per_sec=0.001, request_cost=5)
+
+    assert first.allow("1.2.3.4").remaining == 15
+    assert second.allow("1.2.3.4").remaining == 10
+    assert second.peek("1.2.3.4").remaining == 10
+    assert first.allow("5.6.7.8").remaining == 15  # other clients have their own bucket
+
+
+def test_charges_pages_and_may_overdraw(tmp_path):
+    limiter = PageRateLimiter(str(tmp_path / "rate.sqlite3"), capacity=20, refill_per_sec=1, request_cost=5)
+    limiter.allow("c")
+    quota = limiter.charge("c", 40)  # a document larger than the bucket still runs
+    assert quota.remaining == 0
+    assert quota.retry_after_sec >= 24  # 25 pages of debt plus the next request's fee, at 1 page/s
+
+    with pytest.raises(RateLimited) as excinfo:
+        limiter.allow("c")
+    assert excinfo.value.quota.retry_after_sec == quota.retry_after_sec
+
+
+def test_refill_is_capped_at_capacity(tmp_path, monkeypatch):
+    limiter = PageRateLimiter(str(tmp_path / "rate.sqlite3"), capacity=20, refill_per_sec=2, request_cost=5)
+    clock = [1000.0]
+    monkeypatch.setattr("src.api.rate_limit.time.time", lambda: clock[0])
+    limiter.charge("c", 30)
+    assert limiter.peek("c").remaining == 0
+    clock[0] += 10
+    assert limiter.peek("c").remaining == 10
+    clock[0] += 3600
+    assert limiter.peek("c").remaining == 20
+
+
+@pytest.fixture
+def limited_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    limiter = PageRateLimiter(str(tmp_path / "rate.sqlite3"), capacity=10, refill_per_sec=0.001, request_cost=5)
+    monkeypatch.setattr(server, "limiter", limiter)
+    return TestClient(server.app), limiter
+
+
+def test_extract_debits_pages_and_reports_quota(limited_client):
+    client, limiter = limited_client
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+
+    response = client.post("/extract?pages=1-3", files={"file": ("a.pdf", pdf_content, "application/pdf")})
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "10"
+    assert response.headers["X-RateLimit-Remaining"] == "2"  # 5 for the request, 3 for the pages
+    assert int(response.headers["X-RateLimit-Reset"]) > 0
+
+    response = client.post("/extract?pages=1-3", files={"file": ("a.pdf", pdf_content, "application/pdf")})
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many requests. Please try again later."
+    assert int(response.headers["Retry-After"]) > 0
+    assert response.headers["X-RateLimit-Remaining"] == "2"
+
+
+def test_unlimited_endpoints_have_no_quota_headers(limited_client):
+    client, _ = limited_client
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert "X-RateLimit-Limit" not in response.headers
+
+
+def _saturated_once(monkeypatch, times=1):
+    """Makes the next `times` pool submissions fail like a full pool."""
+    submit = server.pipeline_pool.submit
+    failures = [times]
+
+    def flaky_submit(*args, **kwargs):
+        if failures[0]:
+            failures[0] -= 1
+            raise PoolSaturated("full")
+        return submit(*args, **kwargs)
+
+    monkeypatch.setattr(server.pipeline_pool, "submit", flaky_submit)
+
+
+def test_rejected_document_costs_no_pages(limited_client, monkeypatch):
+    client, limiter = limited_client
+    _saturated_once(monkeypatch)
+    with open(SAMPLE_PDF, "rb") as f:
+        response = client.post("/extract?pages=1-3", files={"file": ("a.pdf", f.read(), "application/pdf")})
+    assert response.status_code == 503
+    assert limiter.peek("testclient").remaining == 5  # only the request fee
+
+
+def test_batch_retry_charges_the_document_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    limiter = PageRateLimiter(str(tmp_path / "rate.sqlite3"), capacity=100, refill_per_sec=0.001, request_cost=5)
+    monkeypatch.setattr(server, "limiter", limiter)
+    _saturated_once(monkeypatch, times=2)
+    with open(SAMPLE_PDF, "rb") as f:
+        response = TestClient(server.app).post(
+            "/extract/batch?pages=1-3", files=[("files", ("a.pdf", f.read(), "application/pdf"))]
+        )
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[0])["ok"]
+    assert limiter.peek("testclient").remaining == 92  # 5 for the request, 3 for the pages, once
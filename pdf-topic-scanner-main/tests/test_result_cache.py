@@ -0,0 +1,126 @@
+"""Tests for the hierarchy result cache and conditional /extract requests."""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.result_cache import ResultCache, etag_matches, result_cache_key, result_etag, with_upload_metadata
+from src.core.cache import file_sha256
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def _tree(name, n=1):
+    return {"metadata": {"source_file": name, "total_pages": 1}, "sections": [{"title": "x" * n}]}
+
+
+def test_key_and_etag_depend_on_inputs():
+    key = result_cache_key("abc")
+    assert key == result_cache_key("abc")
+    assert key != result_cache_key("abc", pages=[1])
+    assert key != result_cache_key("abd")
+    etag = result_etag(key, "a.pdf")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != result_etag(key, "b.pdf")
+    assert etag != result_etag(key, "a.pdf", "1-2")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_memory_tier_is_size_bounded_lru():
+    cache = ResultCache(cache_dir=None, memory_bytes=300)  # room for two entries
+    cache.put("a", _tree("a.pdf", 50))
+    cache.put("b", _tree("b.pdf", 50))
+    assert cache.get("a") is not None  # "a" is now the most recently used
+    cache.put("c", _tree("c.pdf", 50))
+    assert cache.get("b") is None
+    assert cache.get("a") == _tree("a.pdf", 50)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    ResultCache(cache_dir=str(tmp_path)).put("k", _tree("a.pdf"))
+    fresh = ResultCache(cache_dir=str(tmp_path))
+    assert fresh.get("k") == _tree("a.pdf")
+    assert fresh.hit_ratio == 1.0
+
+
+def test_with_upload_metadata_replaces_per_upload_fields():
+    tree = {"metadata": {"source_file": "a.pdf", "page_selection": "1-2", "total_pages": 3}, "sections": []}
+    assert with_upload_metadata(tree, "b.pdf")["metadata"] == {"source_file": "b.pdf", "total_pages": 3}
+    assert with_upload_metadata(tree, "b.pdf", "1,2")["metadata"]["page_selection"] == "1,2"
+    assert tree["metadata"]["source_file"] == "a.pdf"
+
+
+@pytest.fixture
+def cache_client(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    return TestClient(server.app)
+
+
+def test_repeat_upload_is_served_from_cache(cache_client, monkeypatch):
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+    first = cache_client.post("/extract?pages=1-2", files={"file": ("a.pdf", pdf_content, "application/pdf")})
+    assert first.status_code == 200
+    assert first.headers["x-cache"] == "MISS"
+
+    async def no_pipeline(*args, **kwargs):
+        raise AssertionError("the pipeline should not run on a cache hit")
+
+    monkeypatch.setattr(server.pipeline_pool, "run", no_pipeline)
+    second = cache_client.post("/extract?pages=1,2", files={"file": ("b.pdf", pdf_content, "application/pdf")})
+    assert second.status_code == 200
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["etag"] != first.headers["etag"]
+    hierarchy = second.json()["hierarchy"]
+    assert hierarchy["metadata"]["source_file"] == "b.pdf"
+    assert hierarchy["metadata"]["page_selection"] == "1,2"
+    assert hierarchy["sections"] == first.json()["hierarchy"]["sections"]
+
+    again = cache_client.post(
+        "/extract?pages=1,2",
+        files={"file": ("b.pdf", pdf_content, "application/pdf")},
+        headers={"If-None-Match": second.headers["etag"]},
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == second.headers["etag"]
+    assert again.content == b""
+
+
+def test_same_etag_means_same_bytes(cache_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+    first = cache_client.post("/extract?pages=1", files={"file": ("a.pdf", pdf_content, "application/pdf")})
+    second = cache_client.post("/extract?pages=1", files={"file": ("a.pdf", pdf_content, "application/pdf")})
+    content_hash = file_sha256(SAMPLE_PDF)
+    stored = cache_client.get(f"/results/{content_hash}?pages=1&filename=a.pdf")
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert first.headers["etag"] == second.headers["etag"] == stored.headers["etag"]
+    assert first.content == second.content == stored.content
+    assert first.headers["server-timing"].startswith("total;dur=")
+
+
+def test_hash_lookup_before_upload(cache_client):
+    content_hash = file_sha256(SAMPLE_PDF)
+    assert cache_client.get("/results/not-a-hash").status_code == 400
+    assert cache_client.get(f"/results/{content_hash}?pages=1").status_code == 404
+
+    with open(SAMPLE_PDF, "rb") as f:
+        uploaded = cache_client.post("/extract?pages=1", files={"file": ("a.pdf", f.read(), "application/pdf")})
+
+    found = cache_client.get(f"/results/{content_hash.upper()}?pages=1&filename=a.pdf")
+    assert found.status_code == 200
+    assert found.headers["etag"] == uploaded.headers["etag"]
+    assert found.json()["hierarchy"] == uploaded.json()["hierarchy"]
+    assert cache_client.get(f"/results/{content_hash}?pages=1").json()["hierarchy"]["metadata"]["source_file"] == "a.pdf"
+    assert cache_client.get(f"/results/{content_hash}?pages=1-2").status_code == 404
+
+    not_modified = cache_client.get(
+        f"/results/{content_hash}?pages=1&filename=a.pdf", headers={"If-None-Match": found.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
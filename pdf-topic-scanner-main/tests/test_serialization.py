@@ -0,0 +1,82 @@
+"""Tests for JSON encoding with orjson or the stdlib, whole and streamed."""
+import json
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import serialization
+from src.api import server
+from src.api.result_cache import ResultCache
+from src.serialization import dumps, iter_json, loads, write_json
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+TREE = {
+    "metadata": {"source_file": "Überblick.pdf", "total_blocks": 3, "total_pages": 2},
+    "sections": [
+        {"title": "1. Einführung", "content": ["Zeile \"eins\"\nzwei"], "children": []},
+        {"title": "2. Scope", "content": [], "children": [{"title": "2.1", "content": ["x"], "children": []}]},
+    ],
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_encoding_matches_stdlib_json(encoder, pretty):
+    if pretty:
+        expected = json.dumps(TREE, ensure_ascii=False, indent=2)
+    else:
+        expected = json.dumps(TREE, ensure_ascii=False, separators=(",", ":"))
+    assert dumps(TREE, pretty=pretty) == expected.encode("utf-8")
+    assert loads(dumps(TREE)) == TREE
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_floats_and_non_finite_values_read_back_the_same(encoder, pretty):
+    scores = {"small": 1e-05, "big": 1e16, "score": 0.1 + 0.2, "nan": math.nan, "inf": -math.inf, "nested": [math.nan]}
+    encoded = dumps(scores, pretty=pretty)
+    # Valid JSON either way (the stdlib would otherwise write the non-standard NaN/-Infinity)
+    decoded = json.loads(encoded, parse_constant=lambda name: pytest.fail(f"non-standard {name}"))
+    assert decoded == {"small": 1e-05, "big": 1e16, "score": 0.1 + 0.2, "nan": None, "inf": None, "nested": [None]}
+    assert loads(encoded) == decoded
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_iter_json_streams_the_same_bytes(encoder, pretty, monkeypatch):
+    monkeypatch.setattr(serialization, "STREAM_CHUNK_BYTES", 1)  # one piece per section
+    response = {"ok": True, "hierarchy": TREE, "empty": []}
+    pieces = list(iter_json(response, stream=("hierarchy", "sections"), pretty=pretty))
+    assert len(pieces) > len(TREE["sections"])
+    assert b"".join(pieces) == dumps(response, pretty=pretty)
+    assert b"".join(iter_json(response, stream=("missing",), pretty=pretty)) == dumps(response, pretty=pretty)
+
+
+def test_write_json(tmp_path, encoder):
+    path = tmp_path / "tree.json"
+    write_json(TREE, str(path), stream=("sections",))
+    assert path.read_text(encoding="utf-8") == json.dumps(TREE, ensure_ascii=False, indent=2)
+
+
+def test_large_hierarchies_stream_from_extract(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(cache_dir=None))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    monkeypatch.setattr(server, "STREAM_JSON_MIN_BLOCKS", 1)
+    client = TestClient(server.app)
+    with open(SAMPLE_PDF, "rb") as f:
+        response = client.post("/extract?pages=1", files={"file": ("a.pdf", f.read(), "application/pdf")})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "content-length" not in response.headers  # sent in pieces
+    assert response.headers["ETag"]
+    body = response.json()
+    assert body["ok"] is True
+    assert body["hierarchy"]["metadata"]["page_selection"] == "1"
@@ -0,0 +1,137 @@
+"""Tests for incremental classification, section streaming and the SSE endpoint."""
+import json
+import os
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.job_store import JobStore
+from src.api.jobs import JobRunner
+from src.hierarchy.heading_classifier import classify_headings, iter_classified_blocks
+from src.hierarchy.tree_builder import build_hierarchy, iter_sections
+from src.pipeline import run_pipeline, stream_pipeline
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def _parse_sse(body: str):
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _worker_dies(queue, pdf_path, **kwargs):
+    queue.put(("progress", {"page": 1, "pages_done": 1, "pages_total": 3}))
+    os._exit(1)  # like an OOM kill: no error event, no end-of-stream marker
+
+
+def _random_blocks(rng, n):
+    labels = ["H1", "H2", "H3", "BODY"]
+    return [
+        {
+            "text": f"block {i}",
+            "page": 1 + i // 5,
+            "font_size": rng.choice([10.0, 12.0, 16.0, 20.0]),
+            "is_bold": rng.random() < 0.3,
+            "classification": rng.choice(labels),
+        }
+        for i in range(n)
+    ]
+
+
+def test_iter_sections_matches_build_hierarchy():
+    rng = random.Random(7)
+    for _ in range(50):
+        blocks = _random_blocks(rng, rng.randint(0, 30))
+        assert list(iter_sections(blocks)) == build_hierarchy(blocks, {})["sections"]
+
+
+def test_iter_classified_blocks_matches_classify_headings():
+    rng = random.Random(11)
+    blocks = _random_blocks(rng, 40)
+    for block in blocks:
+        block["features"] = {
+            "relative_size": block["font_size"] / 10.0,
+            "font_rank": rng.randint(1, 4),
+            "is_bold": block["is_bold"],
+            "is_short": True,
+        }
+    expected = classify_headings([dict(b) for b in blocks])
+    assert list(iter_classified_blocks(dict(b) for b in blocks)) == expected
+
+
+def test_stream_pipeline_matches_run_pipeline(tmp_path):
+    events = []
+    metadata = stream_pipeline(SAMPLE_PDF, lambda event, data: events.append((event, data)), pages=[1, 2, 3])
+    expected = run_pipeline(SAMPLE_PDF, pages=[1, 2, 3], cache_dir=str(tmp_path))
+
+    progress = [data for event, data in events if event == "progress"]
+    assert [p["pages_done"] for p in progress] == [1, 2, 3]
+    assert all(p["pages_total"] == 3 for p in progress)
+    assert [data["section"] for event, data in events if event == "section"] == expected["sections"]
+    assert events[-1] == ("done", {"metadata": metadata})
+    assert metadata == expected["metadata"]
+
+
+@pytest.fixture
+def stream_client(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(server, "job_runner", JobRunner(store, workers=1))
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    with TestClient(server.app) as client:
+        yield client
+
+
+def test_extract_stream_endpoint(stream_client):
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_content = f.read()
+    response = stream_client.post(
+        "/extract/stream?pages=1-3", files={"file": ("simple_doc.pdf", pdf_content, "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    names = [event for event, _ in events]
+    assert names[0] == "progress"
+    assert names[-1] == "done"
+    assert "section" in names
+    done = events[-1][1]
+    assert done["metadata"]["source_file"] == "simple_doc.pdf"
+    assert done["duration_sec"] >= 0
+
+    extracted = stream_client.post(
+        "/extract?pages=1-3", files={"file": ("simple_doc.pdf", pdf_content, "application/pdf")}
+    ).json()
+    assert [data["section"] for event, data in events if event == "section"] == extracted["hierarchy"]["sections"]
+
+
+def test_extract_stream_reports_errors_as_events(stream_client):
+    response = stream_client.post(
+        "/extract/stream", files={"file": ("broken.pdf", b"%PDF-1.4 not really", "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert _parse_sse(response.text)[-1][0] == "error"
+
+
+def test_extract_stream_returns_503_when_saturated(stream_client, monkeypatch):
+    monkeypatch.setattr(server.pipeline_pool, "in_flight", server.pipeline_pool.capacity)
+    response = stream_client.post(
+        "/extract/stream", files={"file": ("test.pdf", b"%PDF-1.4", "application/pdf")}
+    )
+    assert response.status_code == 503
+
+
+def test_extract_stream_ends_when_the_worker_dies(stream_client, monkeypatch):
+    monkeypatch.setattr(server, "stream_pipeline_to_queue", _worker_dies)
+    with open(SAMPLE_PDF, "rb") as f:
+        response = stream_client.post(
+            "/extract/stream", files={"file": ("simple_doc.pdf", f.read(), "application/pdf")}
+        )
+    assert response.status_code == 200
+    assert [event for event, _ in _parse_sse(response.text)] == ["progress", "error"]
+    assert server.page_budget.in_use == 0
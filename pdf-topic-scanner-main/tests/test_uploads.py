@@ -0,0 +1,108 @@
+"""Tests for streamed upload spooling and body size enforcement."""
+import asyncio
+import io
+import json
+import os
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.uploads import MaxBodySizeMiddleware, UploadTooLarge, spool_upload
+from src.core.cache import file_sha256
+
+SAMPLE_PDF = "tests/sample_pdfs/simple_doc.pdf"
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="doc.pdf")
+
+
+def test_spool_upload_hashes_while_copying(tmp_path):
+    with open(SAMPLE_PDF, "rb") as f:
+        data = f.read()
+    path, digest, size = asyncio.run(spool_upload(_upload(data), len(data), directory=str(tmp_path), chunk_size=4096))
+    assert size == len(data)
+    assert digest == file_sha256(SAMPLE_PDF)
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+
+def test_spool_upload_enforces_limit_mid_stream(tmp_path):
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_upload(_upload(b"x" * 10_000), 5_000, directory=str(tmp_path), chunk_size=1024))
+    assert os.listdir(tmp_path) == []  # partial spool file removed
+
+
+def test_chunked_body_over_limit_is_rejected():
+    app = FastAPI()
+    app.add_middleware(MaxBodySizeMiddleware, max_bytes=1_000)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    client = TestClient(app)
+
+    def chunks():
+        # A generator body is sent with chunked transfer encoding (no Content-Length)
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.pdf"\r\n\r\n'
+        for _ in range(10):
+            yield b"x" * 500
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert client.post("/upload", files={"file": ("a.pdf", b"%PDF-1.4", "application/pdf")}).status_code == 200
+
+
+def test_extract_rejects_upload_over_limit(monkeypatch):
+    monkeypatch.setattr(server, "max_file_size", 1_000)
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    with open(SAMPLE_PDF, "rb") as f:
+        response = TestClient(server.app).post(
+            "/extract", files={"file": ("simple_doc.pdf", f.read(), "application/pdf")}
+        )
+    assert response.status_code == 413
+
+
+def test_oversized_upload_gets_cors_and_security_headers(monkeypatch):
+    # The server's own middleware stack, with a small body limit
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    app = server.app.router
+    for middleware in reversed(server.app.user_middleware):
+        kwargs = dict(middleware.kwargs)
+        if middleware.cls is MaxBodySizeMiddleware:
+            kwargs["max_bytes"] = 1_000
+        app = middleware.cls(app, *middleware.args, **kwargs)
+
+    response = TestClient(app).post(
+        "/extract",
+        files={"file": ("big.pdf", b"x" * 5_000, "application/pdf")},
+        headers={"Origin": "https://app.example"},
+    )
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] in ("*", "https://app.example")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+
+def test_batch_body_gets_its_own_limit(monkeypatch):
+    # Each document fits the single-upload limit, the whole body does not
+    monkeypatch.setattr(server.limiter, "enabled", False)
+    (middleware,) = [m for m in server.app.user_middleware if m.cls is MaxBodySizeMiddleware]
+    assert middleware.kwargs["path_limits"]["/extract/batch"] > middleware.kwargs["max_bytes"]
+    monkeypatch.setitem(middleware.kwargs, "max_bytes", 1_000)
+    monkeypatch.setitem(middleware.kwargs, "path_limits", {"/extract/batch": 3_000})
+    monkeypatch.setattr(server.app, "middleware_stack", None)  # rebuilt with the small limits
+    client = TestClient(server.app)
+
+    files = [("files", (f"note{i}.txt", b"x" * 800, "text/plain")) for i in range(2)]
+    response = client.post("/extract/batch", files=files)
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["ok"] for r in records if "index" in r] == [False, False]  # refused as non-PDF, not as too large
+
+    files = [("files", (f"note{i}.txt", b"x" * 800, "text/plain")) for i in range(5)]
+    assert client.post("/extract/batch", files=files).status_code == 413
+    assert client.post("/extract", files=[files[0], files[1]]).status_code == 413
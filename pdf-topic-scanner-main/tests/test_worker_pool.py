@@ -0,0 +1,92 @@
+"""Tests for worker warm-up, readiness and recycling in the pipeline pool."""
+import asyncio
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.warmup import warm_up_worker, warmup_pdf_bytes
+from src.api.worker_pool import PipelinePool
+from src.pipeline import run_pipeline
+
+
+def test_warmup_pdf_runs_through_the_pipeline(tmp_path):
+    path = tmp_path / "warmup.pdf"
+    path.write_bytes(warmup_pdf_bytes())
+    tree = run_pipeline(str(path), cache_dir=None)
+    assert tree["metadata"]["total_pages"] == 1
+    assert tree["metadata"]["total_blocks"] == 3
+
+
+def test_warm_up_starts_every_worker():
+    pool = PipelinePool(workers=2, max_queue=2, initializer=warm_up_worker)
+
+    async def scenario():
+        assert not pool.ready
+        await pool.warm_up()
+        return pool.ready, pool.worker_pids()
+
+    try:
+        ready, pids = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert ready
+    assert len(pids) == 2
+
+
+def _broken_initializer():
+    raise RuntimeError("model failed to load")
+
+
+def test_failed_warm_up_leaves_pool_not_ready():
+    pool = PipelinePool(workers=1, max_queue=1, initializer=_broken_initializer)
+    try:
+        asyncio.run(pool.warm_up())
+    finally:
+        pool.shutdown()
+    assert not pool.ready
+
+
+def test_workers_are_replaced_after_max_calls():
+    pool = PipelinePool(workers=1, max_queue=4, max_calls_per_worker=2)
+
+    async def scenario():
+        return [await pool.run(os.getpid) for _ in range(4)]
+
+    try:
+        pids = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[1] != pids[2]
+    assert pool.recycled["calls"] >= 1
+    assert pool.recycled["memory"] == 0
+
+
+def test_memory_recycling_keeps_in_flight_calls():
+    pool = PipelinePool(workers=2, max_queue=4, max_worker_rss_bytes=1)  # every worker is "too big"
+
+    async def scenario():
+        calls = [pool.submit(time.sleep, 0.3) for _ in range(4)]
+        return await asyncio.gather(*calls)
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert results == [None] * 4
+    assert pool.recycled["memory"] >= 1
+    assert pool.in_flight == 0
+
+
+def test_ready_endpoint_reports_warm_up(monkeypatch):
+    pool = PipelinePool(workers=1, max_queue=1)
+    monkeypatch.setattr(server, "pipeline_pool", pool)
+    client = TestClient(server.app)
+    assert client.get("/ready").status_code == 503
+    pool.ready = True
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "workers": 1}
@@ -1,5 +1,7 @@
 """Validation utilities for inputs and file types."""
-from typing import Tuple
+from typing import List, Tuple
+
+MAX_PAGE_NUMBER = 100_000  # far beyond real documents; bounds the work a page spec can ask for
 
 
 def is_pdf_filename(path: str) -> bool:
@@ -19,3 +21,30 @@ def validate_uploaded_file(file) -> Tuple[bool, str]:
     if not is_pdf_filename(name):
         return False, "File is not a PDF"
     return True, "OK"
+
+
+def parse_page_spec(spec: str) -> List[int]:
+    """Parse a page selection like "1-20,45" into a sorted list of 1-based page numbers.
+
+    Raises ValueError if the spec is empty or malformed, or names a page above
+    MAX_PAGE_NUMBER (checked before any range is expanded).
+    """
+    pages = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        try:
+            start = int(first)
+            end = int(last) if sep else start
+        except ValueError:
+            raise ValueError(f"Invalid page selection '{part}'")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range '{part}'")
+        if end > MAX_PAGE_NUMBER:
+            raise ValueError(f"Page numbers above {MAX_PAGE_NUMBER} are not supported ('{part}')")
+        pages.update(range(start, end + 1))
+    if not pages:
+        raise ValueError("Page selection is empty")
+    return sorted(pages)